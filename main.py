@@ -10,6 +10,7 @@ import sys
 import threading
 import time
 from pathlib import Path
+import numpy as np
 
 # Añadir el directorio src al path
 src_path = Path(__file__).parent / "src"
@@ -18,6 +19,8 @@ sys.path.append(str(src_path))
 from src.utils.vad_recorder import VADRecorder
 from src.utils.stt import SpeechToText
 from src.utils.tts import TextToSpeech
+from src.utils.streaming_stt import StreamingTranscriber
+from src.utils.wake_word import WakeWordDetector, strip_wake_word
 from src.routes.router import Router
 from src.routes.intent_classifier import IntentClassifier
 
@@ -26,15 +29,22 @@ class MargaritaApp:
     Aplicación principal de Margarita que unifica voz y texto
     """
     
-    def __init__(self):
+    def __init__(self, noise_suppression: bool = False, wake_word: bool = False, input_device=None,
+                 streaming_stt: bool = False, stt_profile: str = None):
         print("🔄 Inicializando Margarita...")
         
         # Inicializar componentes
-        self.vad = VADRecorder()
-        self.stt = SpeechToText(model_size="small", device="cpu")
+        self.vad = VADRecorder(noise_suppression=noise_suppression, device=input_device)
+        self.stt = SpeechToText(device="cpu", profile=stt_profile)
         self.tts = TextToSpeech()
         self.router = Router()
         self.classifier = IntentClassifier()
+        # Palabra de activación opcional: solo lo que empieza por "Margarita" llega a Whisper
+        self.wake_word = WakeWordDetector() if wake_word else None
+        # Transcripción mientras se habla: los parciales llegan antes al router
+        self.streaming = None
+        if streaming_stt:
+            self.streaming = StreamingTranscriber(self.stt, lang="es", on_partial=self._on_partial)
         
         # Estado de la aplicación
         self.running = False
@@ -70,20 +80,19 @@ class MargaritaApp:
         
         self.current_mode = "voice"
         self.running = True
+        if self.wake_word:
+            if not self.wake_word.ready:
+                self.enroll_wake_word()
+            print("🎀 Empieza cada orden con 'Margarita'")
         
         while self.running:
             try:
                 # Grabación con VAD
                 print("\n🎤 Escuchando... (habla ahora)")
-                audio_file = self.vad.record()
-                if not audio_file:
-                    print("⚠️ No se grabó audio, reintentando...")
+                text = self._listen()
+                if text is None:
                     continue
                 
-                # Transcripción
-                print("👂 Transcribiendo...")
-                text = self.stt.transcribe(audio_file, lang="es")
-                
                 if not text or text.strip() == "":
                     print("⚠️ No se detectó speech")
                     continue
@@ -92,6 +101,11 @@ class MargaritaApp:
                 
                 # Comandos especiales del modo voz - VERIFICAR ANTES DE PROCESAR
                 text_lower = text.lower()
+                profile_reply = self.switch_stt_profile(text_lower)
+                if profile_reply:
+                    print(f"🤖 Margarita: {profile_reply}")
+                    continue
+                
                 if any(cmd in text_lower for cmd in ["modo texto", "texto", "teclado"]):
                     self.text_mode()
                     return
@@ -123,6 +137,114 @@ class MargaritaApp:
                 print(f"❌ Error en modo voz: {e}")
                 continue
     
+    def _listen(self):
+        """Graba una frase y la transcribe (None si no hay nada que procesar)"""
+        audio = self.vad.record(on_audio=self._streaming_feed() if self.streaming else None)
+        if audio is None or len(audio) == 0:
+            print("⚠️ No se grabó audio, reintentando...")
+            return self._discard_turn()
+        
+        if self.wake_word:
+            gated = self.wake_word.gate(audio)
+            if gated is None:
+                return self._discard_turn()
+            if len(gated) == 0:
+                print("🎀 ¿Sí? Te escucho...")
+                return self._discard_turn()
+            audio = gated
+        
+        # Transcripción (directamente desde memoria)
+        print("👂 Transcribiendo...")
+        self.vad.mark_stt_start()
+        if self.streaming and self.streaming.active:
+            # Casi todo está ya transcrito: solo queda la pasada final de la cola
+            text = self.streaming.finish()
+            return strip_wake_word(text) if self.wake_word else text
+        return self.stt.transcribe(audio, lang="es")
+    
+    def _streaming_feed(self):
+        """
+        on_audio para el grabador. Con palabra de activación, Whisper no empieza
+        hasta que el principio de la frase (1-2 s) coincide con 'Margarita':
+        la tele o una conversación de fondo no se decodifican ni llegan al router.
+        """
+        wake_word = self.wake_word
+        if not wake_word or not wake_word.ready or wake_word.armed:
+            self.streaming.start()
+            return self.streaming.feed
+        
+        pending = []
+        state = {"decided": False, "accepted": False}
+        
+        def feed(samples):
+            if state["decided"]:
+                if state["accepted"]:
+                    self.streaming.feed(samples)
+                return
+            pending.append(samples)
+            prefix = np.concatenate(pending)
+            verdict = wake_word.check_prefix(prefix)
+            if verdict is None:
+                return
+            state["decided"], state["accepted"] = True, verdict
+            pending.clear()
+            if verdict:
+                self.streaming.start()
+                self.streaming.feed(prefix)
+        
+        return feed
+    
+    def _discard_turn(self):
+        if self.streaming:
+            self.streaming.cancel()
+        return None
+    
+    def _on_partial(self, committed: str, provisional: str):
+        """Parcial del streaming: se muestra y el router adelanta lo que pueda"""
+        partial = f"{committed} {provisional}".strip()
+        if self.wake_word:
+            partial = strip_wake_word(partial)
+        if partial:
+            print(f"💬 {partial}...")
+            self.router.prepare(partial)
+    
+    def switch_stt_profile(self, text_lower: str):
+        """
+        "perfil rápido", "perfil preciso"...: cambia el perfil de reconocimiento.
+        Devuelve la respuesta, o None si la frase no es un cambio de perfil.
+        """
+        words = [word.strip(".,¡!¿?") for word in text_lower.split()]
+        if "perfil" not in words:
+            return None
+        for word in words[words.index("perfil") + 1:]:
+            profile = self.stt.resolve_profile(word)
+            if profile:
+                try:
+                    self.stt.set_profile(profile)
+                except Exception as e:
+                    return f"❌ No pude cambiar al perfil '{profile}': {e}"
+                return f"✅ Reconocimiento de voz en perfil '{profile}' (modelo {self.stt.settings['model']})"
+        if words[0] != "perfil":
+            return None     # "abre mi perfil de..." no es para nosotros
+        return f"⚠️ Perfiles disponibles: {', '.join(self.stt.profiles)} (actual: {self.stt.profile})"
+    
+    def enroll_wake_word(self, count: int = 3):
+        """Graba la palabra de activación varias veces como plantillas"""
+        print(f"\n🎀 Vamos a grabar la palabra de activación. Di solo 'Margarita' {count} veces.")
+        recorded = 0
+        while recorded < count:
+            print(f"🎤 Grabación {recorded + 1} de {count}: di 'Margarita'")
+            audio = self.vad.record(timeout=5)
+            if audio is None or len(audio) == 0:
+                print("⚠️ No te he oído, otra vez")
+                continue
+            if len(audio) > 16000 * 2.5:
+                print("⚠️ Demasiado largo: di solo la palabra")
+                continue
+            path = self.wake_word.enroll(audio)
+            recorded += 1
+            print(f"✅ Plantilla guardada en {path}")
+    
     def text_mode(self):
         """
         Modo de entrada por teclado - CORREGIDO
@@ -152,6 +274,11 @@ class MargaritaApp:
                     self.quit_app()
                     return
                 
+                profile_reply = self.switch_stt_profile(text_lower)
+                if profile_reply:
+                    print(f"🤖 Margarita: {profile_reply}")
+                    continue
+                
                 # Procesar texto (ahora maneja conversaciones pendientes automáticamente)
                 response = self.process_text(text)
                 print(f"🤖 Margarita: {response}")
@@ -215,7 +342,7 @@ class MargaritaApp:
         try:
             # Probar si el sistema de audio funciona
             test_audio = self.vad.record(timeout=3)
-            if test_audio:
+            if test_audio is not None and len(test_audio) > 0:
                 print("✅ Sistema de voz funcionando, iniciando modo voz...")
                 self.voice_mode()
             else:
@@ -241,6 +368,7 @@ class MargaritaApp:
         """
         print("\n👋 Saliendo de Margarita...")
         self.running = False
+        self.vad.close()
         # Limpiar cualquier conversación pendiente al salir
         self.router.clear_conversation()
         print("¡Hasta pronto! 🎀")
@@ -264,11 +392,41 @@ def main():
         type=str,
         help="Ejecuta un comando rápido y sale"
     )
+    parser.add_argument(
+        "--input-device",
+        type=str,
+        help="Micrófono a usar (índice o parte del nombre; por defecto el del sistema)"
+    )
+    parser.add_argument(
+        "--wake-word",
+        action="store_true",
+        help="En modo voz solo atiende frases que empiezan por 'Margarita'"
+    )
+    parser.add_argument(
+        "--streaming-stt",
+        action="store_true",
+        help="Transcribe mientras hablas (menos espera al terminar la frase)"
+    )
+    parser.add_argument(
+        "--stt-profile",
+        type=str,
+        help="Perfil de reconocimiento de configs/stt.yaml (instant, balanced, accurate...)"
+    )
+    parser.add_argument(
+        "--suppress-noise",
+        action="store_true",
+        help="Filtra ruido de fondo antes del VAD y descarta turnos que no parecen voz"
+    )
     
     args = parser.parse_args()
     
     # Crear instancia de la app
-    app = MargaritaApp()
+    input_device = args.input_device
+    if input_device and input_device.isdigit():
+        input_device = int(input_device)
+    app = MargaritaApp(noise_suppression=args.suppress_noise, wake_word=args.wake_word,
+                       input_device=input_device, streaming_stt=args.streaming_stt,
+                       stt_profile=args.stt_profile)
     
     try:
         if args.command:
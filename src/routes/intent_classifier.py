@@ -10,14 +10,29 @@ class IntentClassifier:
 
     def __init__(self):
         self.system_keywords = [
-            "abre", "inicia", "ejecuta", "crea", "haz", "nueva", "nuevo",
-            "carpeta", "archivo", "open", "run", "make", "create", "folder", "file"
+            "abre", "inicia", "ejecuta", "cierra", "crea", "haz", "nueva", "nuevo",
+            "carpeta", "archivo", "open", "run", "close", "make", "create", "folder", "file"
         ]
         
         self.system_patterns = [
             r'(abre|inicia|ejecuta)\s+(el|la|un|una)?\s*([^\s\.]+)',
             r'(crea|haz)\s+(una?\s+)?(carpeta|archivo)\s+(llamad[ao]?\s+)?([^\s\.]+)',
-            r'(nuev[ao])\s+(carpeta|archivo)\s+([^\s\.]+)'
+            r'(nuev[ao])\s+(carpeta|archivo)\s+([^\s\.]+)',
+            r'(apps|aplicaciones)\s+(que\s+)?(uso|abro)\s+m[aá]s',
+            r'(apps|aplicaciones)\s+m[aá]s\s+usadas',
+            r'ocupa\s+(m[aá]s\s+|tanto\s+)?espacio',
+            r'(uso|espacio)\s+(libre\s+)?(del?|en(\s+el)?)\s+disco',
+            r'(archivos?|ficheros?)\s+(duplicados|repetidos)',
+            r'qu[eé]\s+(\w+\s+)?(he\s+)?(descargu[eé]|modifiqu[eé]|cre[eé]|edit[eé])',
+            r'(archivos?|ficheros?|documentos?|descargas)\s+recientes',
+            r'^(copia|mueve)\s+.+\s+(a|al|en|hacia)\s+',
+            r'^(comprime|empaqueta|descomprime|extrae)\s+',
+            # Mismos verbos que cancel_transfer en SystemCommandClassifier
+            r'^(cancela|cancelar|det[eé]n|para)(\s+(la|el)\s+(copia|transferencia|movimiento|operaci[oó]n))?$',
+            r'^cancel(\s+(the\s+)?(copy|transfer))?$',
+            r'c[oó]mo\s+va\s+(la|el)\s+(copia|transferencia|movimiento)',
+            r'^transcribe\s+',
+            r'(c[oó]mo\s+va|cu[aá]nto\s+falta\s+a)\s+la\s+transcripci[oó]n'
         ]
 
         # Cargar apps conocidas
@@ -15,6 +15,7 @@ class Router:
         self.system_classifier = SystemCommandClassifier()
         self.system_executor = SystemCommandExecutor()
         self.conversation_manager = self.system_executor.get_conversation_manager()
+        self._prepared = None
         
         print(f"[Router] Cargados núcleos: {list(self.cores.keys())}")
         print(f"[Router] Sistema de comandos y conversación listo")
@@ -79,6 +80,27 @@ class Router:
         except Exception as e:
             return f"❌ Error procesando tu solicitud: {str(e)}"
 
+    def prepare(self, partial_text: str, user_id: str = "default"):
+        """
+        Transcripción parcial mientras el usuario sigue hablando. Solo adelanta
+        trabajo sin efectos visibles (precargar la app que se va a abrir);
+        devuelve la intención prevista. La orden se ejecuta con auto_send.
+        """
+        try:
+            if not partial_text or self.conversation_manager.has_pending_action(user_id):
+                return None
+            intent = self.classifier.classify(partial_text)
+            if intent == "system_command":
+                command_info = self.system_classifier.classify(partial_text)
+                key = (command_info['type'], str(command_info['params']))
+                if command_info['type'] == 'open_app' and command_info['params'] and key != self._prepared:
+                    self._prepared = key
+                    self.system_executor.get_applications_manager().prewarm_application(command_info['params'])
+            return intent
+        except Exception as e:
+            print(f"[Router] Error preparando '{partial_text}': {e}")
+            return None
+
     def send(self, core_name: str, prompt: str) -> str:
         """
         Llamada directa, sin clasificación automática.
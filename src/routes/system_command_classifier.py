@@ -7,6 +7,9 @@ class SystemCommandClassifier:
     Clasificador de comandos del sistema MEJORADO con soporte para rutas complejas
     """
 
+    # Comandos que no llevan parámetros
+    NO_PARAM_COMMANDS = {'system_info', 'app_stats', 'cancel_transfer', 'transfer_status', 'transcription_status'}
+
     def __init__(self):
         self.command_patterns = {
             'open_app': [
@@ -18,6 +21,11 @@ class SystemCommandClassifier:
                 r'lanzar\s+(.+)',
                 r'start\s+(.+)'
             ],
+            'close_app': [
+                r'cierra\s+(?:el\s+|la\s+)?(.+)',
+                r'close\s+(.+)',
+                r'quit\s+(.+)',
+            ],
             'create_folder': [
                 # Patrones básicos (sin ubicación)
                 r'crea\s+(?:una\s+)?carpeta\s+(?:llamada\s+)?(.+)$',
@@ -38,6 +46,38 @@ class SystemCommandClassifier:
                 r'informaci[oó]n\s+del\s+sistema',
                 r'system\s+information',
                 r'system\s+info',
+            ],
+            'app_stats': [
+                r'qu[eé]\s+(?:apps|aplicaciones)\s+(?:uso|abro)\s+m[aá]s',
+                r'(?:apps|aplicaciones)\s+m[aá]s\s+usadas',
+                r'most\s+used\s+apps',
+            ],
+            'disk_usage': [
+                r'qu[eé]\s+(?:es\s+lo\s+que\s+)?ocupa\s+(?:m[aá]s\s+|tanto\s+)?espacio(?:\s+en\s+(.+))?',
+                r'(?:uso|espacio)\s+(?:libre\s+)?(?:del?|en(?:\s+el)?)\s+disco(?:\s+(?:en|de)\s+(.+))?',
+                r'disk\s+usage(?:\s+(?:of|in)\s+(.+))?',
+            ],
+            'cancel_transfer': [
+                r'^(?:cancela|cancelar|det[eé]n|para)(?:\s+(?:la|el)\s+(?:copia|transferencia|movimiento|operaci[oó]n))?$',
+                r'^cancel(?:\s+(?:the\s+)?(?:copy|transfer))?$',
+            ],
+            'transfer_status': [
+                r'c[oó]mo\s+va\s+(?:la|el)\s+(?:copia|transferencia|movimiento)',
+                r'cu[aá]nto\s+(?:le\s+)?falta\s+(?:a\s+)?(?:la|el)\s+(?:copia|transferencia|movimiento)',
+            ],
+            'transcribe_folder': [
+                r'transcribe\s+(?:todas\s+)?(?:las\s+|los\s+|mis\s+)?(?:grabaciones|audios|notas\s+de\s+voz|archivos\s+de\s+audio)\s+(?:de|en)\s+(?:la\s+carpeta\s+)?(.+)',
+                r'transcribe\s+(?:la\s+)?carpeta\s+(.+)',
+                r'transcribe\s+(?:the\s+)?(?:recordings|audio\s+files)\s+in\s+(.+)',
+            ],
+            'transcription_status': [
+                r'c[oó]mo\s+va\s+la\s+transcripci[oó]n',
+                r'cu[aá]nto\s+(?:le\s+)?falta\s+(?:a\s+)?la\s+transcripci[oó]n',
+            ],
+            'find_duplicates': [
+                r'(?:busca|encuentra)\s+(?:los\s+)?(?:archivos?|ficheros?)\s+(?:duplicados|repetidos)(?:\s+en\s+(?:la\s+carpeta\s+)?(.+))?',
+                r'(?:archivos?|ficheros?)\s+(?:duplicados|repetidos)(?:\s+en\s+(?:la\s+carpeta\s+)?(.+))?',
+                r'find\s+duplicate\s+files(?:\s+in\s+(.+))?',
             ]
         }
 
@@ -51,6 +91,212 @@ class SystemCommandClassifier:
         safe = re.sub(r'\s+', ' ', safe)
         return safe if safe else None
 
+    def parse_bulk_command(self, text: str) -> dict:
+        """
+        Análisis para creación en lote: "crea carpetas A, B y C en Proyectos"
+        y plantillas: "crea un proyecto python llamado Margarita en Documentos"
+        """
+        text_lower = text.lower().strip()
+        text = text.strip()
+        
+        # Patrón 1: varias carpetas a la vez
+        pattern1 = r'crea\s+(?:las\s+)?carpetas\s+(?:llamadas\s+)?(.+?)(?:\s+en\s+(.+))?$'
+        match1 = re.search(pattern1, text_lower)
+        if match1:
+            start1, end1 = match1.span(1)
+            names = re.split(r'\s*,\s*|\s+y\s+|\s+e\s+', text[start1:end1])
+            folder_names = [name for name in (self.sanitize_param(n) for n in names) if name]
+            location = None
+            if match1.group(2):
+                start2, end2 = match1.span(2)
+                location = self.sanitize_param(text[start2:end2])
+            print(f"[Classifier] Lote de carpetas: nombres={folder_names}, ubicación='{location}'")
+            return {
+                'type': 'create_folders',
+                'params': {'folder_names': folder_names, 'location': location},
+                'matched_text': text,
+                'confidence': 'high' if folder_names else 'medium'
+            }
+        
+        # Patrón 2: proyecto a partir de una plantilla de skills.yaml
+        pattern2 = r'crea\s+(?:un\s+)?proyecto\s+(?:de\s+)?(\S+)\s+(?:llamado\s+)?(.+?)(?:\s+en\s+(.+))?$'
+        match2 = re.search(pattern2, text_lower)
+        if match2:
+            start2, end2 = match2.span(2)
+            location = None
+            if match2.group(3):
+                start3, end3 = match2.span(3)
+                location = self.sanitize_param(text[start3:end3])
+            params = {
+                'scaffold': match2.group(1),
+                'project_name': self.sanitize_param(text[start2:end2]),
+                'location': location
+            }
+            print(f"[Classifier] Plantilla de proyecto: {params}")
+            return {
+                'type': 'create_scaffold',
+                'params': params,
+                'matched_text': text,
+                'confidence': 'high'
+            }
+        
+        return None
+
+    def parse_search_content_command(self, text: str) -> dict:
+        """Análisis para búsqueda dentro de archivos: "busca el archivo que contiene 'factura 2024' en Documentos\""""
+        text_lower = text.lower().strip()
+        text = text.strip()
+        
+        pattern = (r'(?:busca|encuentra)\s+(?:el\s+|los\s+|un\s+)?(?:archivos?|ficheros?|documentos?)\s+'
+                   r'(?:que\s+(?:contiene|contienen|contenga|contengan)|con\s+el\s+texto|con)\s+(.+?)(?:\s+en\s+(?:la\s+carpeta\s+)?([^\'"‘’«»]+))?$')
+        match = re.search(pattern, text_lower)
+        if not match:
+            return None
+        
+        start1, end1 = match.span(1)
+        query = text[start1:end1].strip().strip('\'"‘’«»“” ')
+        location = None
+        if match.group(2):
+            start2, end2 = match.span(2)
+            location = self.sanitize_param(text[start2:end2])
+        print(f"[Classifier] Búsqueda de contenido: texto='{query}', ubicación='{location}'")
+        return {
+            'type': 'search_content',
+            'params': {'query': query, 'location': location},
+            'matched_text': text,
+            'confidence': 'high' if query else 'medium'
+        }
+
+    # Verbos dictados -> acción del diario de actividad
+    RECENT_ACTIONS = {
+        'descargu': 'descargar', 'descargad': 'descargar', 'baj': 'descargar',
+        'cre': 'crear', 'cread': 'crear',
+        'modifiqu': 'modificar', 'modificad': 'modificar', 'edit': 'modificar',
+        'guard': 'modificar', 'cambi': 'modificar',
+    }
+
+    def _recent_action(self, verb: str) -> str:
+        if not verb:
+            return None
+        for prefix, action in self.RECENT_ACTIONS.items():
+            if verb.startswith(prefix):
+                return action
+        return None
+
+    def parse_recent_command(self, text: str) -> dict:
+        """
+        Análisis para el diario de actividad: "abre el último PDF que descargué"
+        y "qué archivos modifiqué hoy"
+        """
+        text_lower = text.lower().strip().rstrip('?¿!. ')
+        verbs = r'(descargu[eé]|descargad[oa]s?|baj[eé]|cre[eé]|cread[oa]s?|modifiqu[eé]|modificad[oa]s?|edit[eé]|editad[oa]s?|guard[eé]|guardad[oa]s?|cambi[eé])'
+        
+        # Patrón 1: abrir el más reciente de un tipo
+        pattern1 = (r'abre\s+(?:el|la|mi)\s+(?:[uú]ltim[oa]|m[aá]s\s+reciente)\s+(\w+)'
+                    r'(?:\s+que\s+(?:he\s+)?' + verbs + r')?(?:\s+(?:en|de)\s+(?:la\s+carpeta\s+)?(.+))?$')
+        match1 = re.search(pattern1, text_lower)
+        if match1:
+            location = None
+            if match1.group(3):
+                start, end = match1.span(3)
+                location = self.sanitize_param(text.strip()[start:end])
+            params = {'category': match1.group(1), 'action': self._recent_action(match1.group(2)), 'location': location}
+            print(f"[Classifier] Abrir reciente: {params}")
+            return {'type': 'open_recent', 'params': params, 'matched_text': text, 'confidence': 'high'}
+        
+        # Patrón 2: listar lo creado/modificado en un periodo
+        periods = r'(hoy|ayer|esta\s+semana|este\s+mes)'
+        pattern2 = (r'qu[eé]\s+(?:(\w+)\s+)?(?:he\s+)?' + verbs + r'(?:\s+(?:en|de)\s+(?:la\s+carpeta\s+)?(.+?))?(?:\s+' + periods + r')?$')
+        pattern3 = r'(\w+)\s+recientes(?:\s+(?:en|de)\s+(?:la\s+carpeta\s+)?(.+?))?(?:\s+' + periods + r')?$'
+        match2 = re.search(pattern2, text_lower)
+        match3 = None if match2 else re.search(pattern3, text_lower)
+        if match2 or match3:
+            if match2:
+                category, action, location_group, period = match2.group(1), self._recent_action(match2.group(2)), 3, match2.group(4)
+                match = match2
+            else:
+                category, action, location_group, period = match3.group(1), None, 2, match3.group(3)
+                match = match3
+            location = None
+            if match.group(location_group):
+                start, end = match.span(location_group)
+                location = self.sanitize_param(text.strip()[start:end])
+            params = {'category': category, 'action': action, 'location': location,
+                      'period': re.sub(r'\s+', ' ', period) if period else None}
+            print(f"[Classifier] Actividad reciente: {params}")
+            return {'type': 'recent_files', 'params': params, 'matched_text': text, 'confidence': 'high'}
+        
+        return None
+
+    def parse_transfer_command(self, text: str) -> dict:
+        """Análisis para copiar/mover: "copia informe.pdf de Descargas a Documentos\""""
+        text = text.strip()
+        text_lower = text.lower()
+        
+        pattern = (r'^(copia|copy|mueve|move)\s+(?:el\s+archivo\s+|la\s+carpeta\s+|el\s+|la\s+)?(.+?)'
+                   r'(?:\s+(?:de|desde|from)\s+(?:la\s+carpeta\s+)?(.+?))?\s+(?:a|al|en|hacia|to|into)\s+(?:la\s+carpeta\s+)?(.+)$')
+        match = re.search(pattern, text_lower)
+        if not match:
+            return None
+        
+        def original(group):
+            if not match.group(group):
+                return None
+            start, end = match.span(group)
+            return self.sanitize_param(text[start:end])
+        
+        params = {'source': original(2), 'source_location': original(3), 'destination': original(4)}
+        command_type = 'copy' if match.group(1) in ('copia', 'copy') else 'move'
+        print(f"[Classifier] {command_type}: {params}")
+        return {
+            'type': command_type,
+            'params': params,
+            'matched_text': text,
+            'confidence': 'high' if params['source'] and params['destination'] else 'medium'
+        }
+
+    # Formatos dictados -> formato del Archiver
+    ARCHIVE_FORMATS = {'zip': 'zip', 'zstd': 'zst', 'zst': 'zst', 'gzip': 'gz', 'gz': 'gz',
+                       'tar.gz': 'gz', 'tgz': 'gz', 'xz': 'xz'}
+
+    def parse_archive_command(self, text: str) -> dict:
+        """Análisis para comprimir/extraer: "comprime la carpeta Proyectos en zip", "descomprime fotos.zip de Descargas\""""
+        text = text.strip()
+        text_lower = text.lower()
+        
+        def original(match, group):
+            if not match.group(group):
+                return None
+            start, end = match.span(group)
+            return self.sanitize_param(text[start:end])
+        
+        # El formato va al final: "... en zip", "... como tar.gz"
+        archive_format = None
+        format_match = re.search(r'\s+(?:en|como|a|con)\s+(?:formato\s+)?(zip|zstd|zst|gzip|gz|tar\.gz|tgz|xz)$', text_lower)
+        if format_match:
+            archive_format = self.ARCHIVE_FORMATS[format_match.group(1)]
+            text_lower = text_lower[:format_match.start()]
+        
+        pattern1 = (r'^(?:comprime|compress|empaqueta)\s+(?:la\s+carpeta\s+|el\s+archivo\s+|el\s+|la\s+)?(.+?)'
+                    r'(?:\s+(?:de|en|desde)\s+(?:la\s+carpeta\s+)?(.+))?$')
+        match1 = re.search(pattern1, text_lower)
+        if match1:
+            params = {'source': original(match1, 1), 'location': original(match1, 2), 'format': archive_format}
+            print(f"[Classifier] Comprimir: {params}")
+            return {'type': 'compress', 'params': params, 'matched_text': text,
+                    'confidence': 'high' if params['source'] else 'medium'}
+        
+        pattern2 = (r'^(?:descomprime|extrae|extract|unzip)\s+(?:el\s+archivo\s+|el\s+|la\s+)?(.+?)'
+                    r'(?:\s+(?:de|desde)\s+(?:la\s+carpeta\s+)?(.+?))?(?:\s+(?:en|a|into)\s+(?:la\s+carpeta\s+)?(.+))?$')
+        match2 = re.search(pattern2, text_lower)
+        if match2:
+            params = {'source': original(match2, 1), 'location': original(match2, 2), 'destination': original(match2, 3)}
+            print(f"[Classifier] Extraer: {params}")
+            return {'type': 'extract', 'params': params, 'matched_text': text,
+                    'confidence': 'high' if params['source'] else 'medium'}
+        
+        return None
+
     def parse_complex_folder_command(self, text: str) -> dict:
         """
         Análisis especializado para comandos complejos de carpeta con rutas
@@ -182,6 +428,31 @@ class SystemCommandClassifier:
         print(f"[Classifier] Clasificando: '{text}'")
         
         # PRIMERO: Análisis complejo para comandos con ubicación
+        if re.match(r'(?:comprime|compress|empaqueta|descomprime|extrae|extract|unzip)\s', text_lower):
+            archive_result = self.parse_archive_command(text)
+            if archive_result:
+                return archive_result
+        
+        if re.match(r'(?:copia|copy|mueve|move)\s', text_lower):
+            transfer_result = self.parse_transfer_command(text)
+            if transfer_result:
+                return transfer_result
+        
+        if re.search(r'[uú]ltim|reciente|descarg|modific|\b(?:hoy|ayer)\b', text_lower):
+            recent_result = self.parse_recent_command(text)
+            if recent_result:
+                return recent_result
+        
+        if any(word in text_lower for word in ['busca', 'encuentra']):
+            content_result = self.parse_search_content_command(text)
+            if content_result:
+                return content_result
+        
+        if 'crea' in text_lower and any(word in text_lower for word in ['carpetas', 'proyecto']):
+            bulk_result = self.parse_bulk_command(text)
+            if bulk_result:
+                return bulk_result
+        
         if any(word in text_lower for word in ['crea', 'carpeta']):
             folder_result = self.parse_complex_folder_command(text)
             if folder_result:
@@ -198,7 +469,7 @@ class SystemCommandClassifier:
                 match = re.search(pattern, text_lower)
                 if match:
                     # Comandos sin parámetros
-                    if command_type == 'system_info':
+                    if command_type in self.NO_PARAM_COMMANDS:
                         return {
                             'type': command_type,
                             'params': '',
@@ -0,0 +1,307 @@
+# [file name]: src/system/activity_journal.py
+import os
+import struct
+import hashlib
+import threading
+import time
+from collections import deque
+from pathlib import Path
+import yaml
+from .ignore_rules import IgnoreRules, DEFAULT_CONFIG
+from .directory_index import normalize_name
+from .storage_paths import get_cache_dir
+from . import inotify_watcher as inotify
+
+
+CREATED = 1
+MODIFIED = 2
+
+# Palabras dictadas -> extensiones (None = cualquier archivo)
+FILE_CATEGORIES = {
+    "archivo": None, "fichero": None, "cosa": None,
+    "documento": {".pdf", ".doc", ".docx", ".odt", ".txt", ".md", ".rtf", ".xls", ".xlsx", ".ods",
+                  ".ppt", ".pptx", ".odp", ".csv"},
+    "foto": {".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".bmp", ".svg"},
+    "imagen": {".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".bmp", ".svg"},
+    "captura": {".png", ".jpg", ".jpeg"},
+    "video": {".mp4", ".mkv", ".avi", ".mov", ".webm", ".wmv"},
+    "cancion": {".mp3", ".flac", ".ogg", ".wav", ".m4a", ".aac", ".opus"},
+    "audio": {".mp3", ".flac", ".ogg", ".wav", ".m4a", ".aac", ".opus"},
+    "grabacion": {".mp3", ".flac", ".ogg", ".wav", ".m4a", ".aac", ".opus"},
+    "hoja": {".xls", ".xlsx", ".ods", ".csv"},
+    "presentacion": {".ppt", ".pptx", ".odp"},
+    "comprimido": {".zip", ".tar", ".gz", ".tgz", ".xz", ".zst", ".7z", ".rar"},
+}
+
+# Archivos temporales de navegadores y editores: su versión final llega con un rename
+TEMP_SUFFIXES = (".part", ".crdownload", ".tmp", ".download", ".swp", "~")
+
+
+def extensions_for(word: str):
+    """
+    Extensiones que corresponden a una palabra dictada ("pdf", "fotos", "documento").
+    Devuelve None si vale cualquier archivo.
+    """
+    if not word:
+        return None
+    word = normalize_name(word.strip())
+    for candidate in (word, word[:-1] if word.endswith("s") else None, word[:-2] if word.endswith("es") else None):
+        if candidate and candidate in FILE_CATEGORIES:
+            return FILE_CATEGORIES[candidate]
+    # "pdf", "pdfs", "docx": la palabra es la propia extensión
+    ext = word[:-1] if word.endswith("s") and len(word) > 3 else word
+    return {f".{ext}"} if ext.isalnum() and len(ext) <= 5 else None
+
+
+def load_journal_config(config_file: str = DEFAULT_CONFIG) -> dict:
+    """Sección activity_journal de configs/file_search.yaml"""
+    config_path = Path(__file__).resolve().parent.parent.parent / config_file
+    try:
+        config = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+    except Exception as e:
+        print(f"[ActivityJournal] No se pudo cargar {config_path}: {e}")
+        config = {}
+    return config.get("activity_journal", {})
+
+
+class ActivityJournal:
+    """
+    Diario de actividad reciente: un watcher de inotify sobre las carpetas
+    configuradas anota cada archivo creado o modificado en un buffer circular
+    en disco de registros de tamaño fijo (las entradas más antiguas se
+    sobrescriben). En memoria se mantiene el orden temporal y un índice por
+    extensión, así las consultas no tocan el sistema de archivos.
+    """
+
+    MAGIC = b"MRGJRNL1"
+    HEADER = struct.Struct("<8sIQ")           # magia, capacidad, siguiente secuencia
+    HEADER_SIZE = 64
+    MAX_PATH_BYTES = 485                      # registros de 512 bytes
+    RECORD = struct.Struct(f"<QdB8sH{MAX_PATH_BYTES}s")   # secuencia, fecha, tipo, extensión, longitud, ruta
+    COALESCE_SECONDS = 2.0
+    WATCH_MASK = inotify.IN_CREATE | inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO | inotify.IN_ONLYDIR
+    MAX_WATCH_DEPTH = 4
+
+    def __init__(self, base_path, folders: list = None, capacity: int = None, journal_file=None,
+                 rules: IgnoreRules = None):
+        config = load_journal_config()
+        self.base_path = Path(base_path)
+        self.folders = [self.base_path / folder for folder in (folders or config.get("folders", []))]
+        self.capacity = capacity or config.get("capacity", 4096)
+        self.rules = rules or IgnoreRules.from_config()
+        digest = hashlib.sha1(str(self.base_path).encode("utf-8")).hexdigest()[:12]
+        self.journal_file = journal_file or get_cache_dir() / f"activity_{digest}.journal"
+
+        self._lock = threading.Lock()
+        self._records = {}            # secuencia -> (fecha, tipo, extensión, ruta)
+        self._order = deque()         # secuencias por orden de llegada (= temporal)
+        self._by_ext = {}             # extensión -> deque de secuencias
+        self._last_by_path = {}       # ruta -> secuencia de su último registro
+        self._created = {}            # rutas con IN_CREATE pendientes de su primer cierre
+        self._next_seq = 0
+        self._watcher = None
+        self._fd = self._open_journal()
+
+    # ---------------------------------------------------------------- disco
+    def _open_journal(self) -> int:
+        fd = os.open(self.journal_file, os.O_RDWR | os.O_CREAT, 0o600)
+        header = os.pread(fd, self.HEADER.size, 0)
+        if len(header) == self.HEADER.size:
+            magic, capacity, next_seq = self.HEADER.unpack(header)
+            if magic == self.MAGIC and capacity == self.capacity:
+                self._next_seq = next_seq
+                self._load_records(fd)
+                return fd
+            print(f"[ActivityJournal] Diario incompatible, se empieza uno nuevo: {self.journal_file}")
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, self.HEADER.pack(self.MAGIC, self.capacity, 0).ljust(self.HEADER_SIZE, b"\0"), 0)
+        return fd
+
+    def _load_records(self, fd: int):
+        data = os.pread(fd, self.capacity * self.RECORD.size, self.HEADER_SIZE)
+        first_seq = max(0, self._next_seq - self.capacity)
+        loaded = []
+        for offset in range(0, len(data) - self.RECORD.size + 1, self.RECORD.size):
+            seq, timestamp, kind, ext, length, raw_path = self.RECORD.unpack_from(data, offset)
+            if kind and first_seq <= seq < self._next_seq:
+                loaded.append((seq, timestamp, kind, ext.rstrip(b"\0").decode("utf-8", "replace"),
+                               raw_path[:length].decode("utf-8", "replace")))
+        for seq, timestamp, kind, ext, path in sorted(loaded):
+            self._index(seq, timestamp, kind, ext, path)
+        print(f"[ActivityJournal] {len(loaded)} eventos recuperados de {self.journal_file}")
+
+    def _index(self, seq: int, timestamp: float, kind: int, ext: str, path: str):
+        self._records[seq] = (timestamp, kind, ext, path)
+        self._order.append(seq)
+        self._by_ext.setdefault(ext, deque()).append(seq)
+        self._last_by_path[path] = seq
+
+    def _evict_oldest(self):
+        seq = self._order.popleft()
+        timestamp, kind, ext, path = self._records.pop(seq)
+        ext_seqs = self._by_ext[ext]
+        ext_seqs.popleft()
+        if not ext_seqs:
+            del self._by_ext[ext]
+        if self._last_by_path.get(path) == seq:
+            del self._last_by_path[path]
+
+    def record(self, path: str, kind: int, timestamp: float = None):
+        """Añade un evento al diario (sobrescribiendo el más antiguo si está lleno)"""
+        timestamp = timestamp or time.time()
+        raw_path = os.fsencode(path)
+        if len(raw_path) > self.MAX_PATH_BYTES:
+            return
+        raw_ext = os.path.splitext(path)[1].lower().encode("utf-8")[:8]
+        ext = raw_ext.decode("utf-8", "ignore")
+
+        with self._lock:
+            last = self._last_by_path.get(path)
+            if last is not None:
+                last_time, last_kind, _, _ = self._records[last]
+                # Varios cierres seguidos del mismo archivo cuentan como uno
+                if timestamp - last_time < self.COALESCE_SECONDS and (kind == last_kind or last_kind == CREATED):
+                    return
+
+            seq = self._next_seq
+            self._next_seq += 1
+            offset = self.HEADER_SIZE + (seq % self.capacity) * self.RECORD.size
+            os.pwrite(self._fd, self.RECORD.pack(seq, timestamp, kind, raw_ext, len(raw_path), raw_path), offset)
+            os.pwrite(self._fd, self.HEADER.pack(self.MAGIC, self.capacity, self._next_seq), 0)
+
+            if len(self._order) >= self.capacity:
+                self._evict_oldest()
+            self._index(seq, timestamp, kind, ext, path)
+
+    # -------------------------------------------------------------- inotify
+    def start(self) -> bool:
+        """Empieza a vigilar las carpetas configuradas que existan"""
+        if self._watcher is not None:
+            return True
+        if not inotify.inotify_available():
+            print("[ActivityJournal] inotify no disponible: no se registrará actividad reciente")
+            return False
+        try:
+            self._watcher = inotify.InotifyWatcher(self._on_event, name="activity-journal")
+        except OSError as e:
+            print(f"[ActivityJournal] No se pudo iniciar inotify: {e}")
+            return False
+        self._watcher.start()
+        for folder in self.folders:
+            if folder.is_dir():
+                self._watch_tree(str(folder), 0)
+        print(f"[ActivityJournal] Vigilando {self._watcher.watch_count} carpetas")
+        return True
+
+    def _watch_tree(self, path: str, depth: int):
+        if self._watcher.add_watch(path, self.WATCH_MASK) < 0 or depth >= self.MAX_WATCH_DEPTH:
+            return
+        try:
+            with os.scandir(path) as it:
+                subdirs = [entry.path for entry in it
+                           if entry.is_dir(follow_symlinks=False) and not self.rules.should_skip(entry.name)]
+        except OSError:
+            return
+        for subdir in subdirs:
+            self._watch_tree(subdir, depth + 1)
+
+    def _depth_of(self, path: str) -> int:
+        for folder in self.folders:
+            try:
+                return len(Path(path).relative_to(folder).parts)
+            except ValueError:
+                continue
+        return self.MAX_WATCH_DEPTH
+
+    def _on_event(self, event: dict):
+        mask = event["mask"]
+        name = event["name"]
+        if mask & inotify.IN_Q_OVERFLOW or not name:
+            return
+        path = event["path"]
+
+        if event["is_dir"]:
+            if mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO) and not self.rules.should_skip(name):
+                depth = self._depth_of(path)
+                if depth <= self.MAX_WATCH_DEPTH:
+                    self._watch_tree(path, depth)
+            return
+        if name.startswith(".") or name.endswith(TEMP_SUFFIXES):
+            return
+
+        if mask & inotify.IN_CREATE:
+            # Se anota al cerrarse, cuando ya tiene contenido
+            self._created[path] = time.time()
+            if len(self._created) > 1024:
+                self._created.pop(next(iter(self._created)))
+        elif mask & inotify.IN_MOVED_TO:
+            # Descargas de navegador: .part -> nombre final
+            self.record(path, CREATED)
+        elif mask & inotify.IN_CLOSE_WRITE:
+            self.record(path, CREATED if self._created.pop(path, None) else MODIFIED)
+
+    # -------------------------------------------------------------- consultas
+    def query(self, extensions=None, since: float = None, until: float = None, folder=None,
+              kind: int = None, limit: int = 20) -> list:
+        """
+        Eventos más recientes primero, un resultado por archivo.
+        Con extensions solo se recorren los índices de esas extensiones.
+        """
+        folder_prefix = str(folder).rstrip(os.sep) + os.sep if folder else None
+        with self._lock:
+            if extensions:
+                sources = [reversed(self._by_ext.get(ext, ())) for ext in extensions]
+            else:
+                sources = [reversed(self._order)]
+            results = []
+            for seqs in sources:
+                seen_paths = set()
+                found = 0
+                for seq in seqs:
+                    timestamp, record_kind, ext, path = self._records[seq]
+                    if since is not None and timestamp < since:
+                        break
+                    if until is not None and timestamp >= until:
+                        continue
+                    if kind is not None and record_kind != kind:
+                        continue
+                    if folder_prefix and not path.startswith(folder_prefix):
+                        continue
+                    if path in seen_paths:
+                        continue
+                    seen_paths.add(path)
+                    results.append({"seq": seq, "time": timestamp, "kind": record_kind, "ext": ext, "path": path})
+                    found += 1
+                    if found >= limit:
+                        break
+
+        results.sort(key=lambda r: r["seq"], reverse=True)
+        unique, seen_paths = [], set()
+        for result in results:
+            if result["path"] not in seen_paths:
+                seen_paths.add(result["path"])
+                unique.append(result)
+        return unique[:limit]
+
+    def latest(self, extensions=None, folder=None, kind: int = None):
+        results = self.query(extensions=extensions, folder=folder, kind=kind, limit=1)
+        return results[0] if results else None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+_shared_journals = {}
+_shared_lock = threading.Lock()
+
+
+def get_activity_journal(base_path) -> ActivityJournal:
+    """Diario compartido por carpeta base; empieza a vigilar la primera vez que se pide"""
+    key = str(Path(base_path))
+    with _shared_lock:
+        journal = _shared_journals.get(key)
+        if journal is None:
+            journal = ActivityJournal(key)
+            _shared_journals[key] = journal
+            journal.start()
+        return journal
@@ -0,0 +1,285 @@
+# [file name]: src/system/archiver.py
+import os
+import shutil
+import subprocess
+import tarfile
+import zipfile
+from pathlib import Path
+from .disk_usage import format_size
+from .file_transfer import FileTransferManager, Transfer, TransferCancelled
+from .path_index import get_path_index
+
+
+# Formato -> (extensión, compresor externo multinúcleo, modo de tarfile sin compresor externo)
+FORMATS = {
+    "zst": (".tar.zst", ["zstd", "-T0", "-q", "-c"], None),
+    "gz": (".tar.gz", ["pigz", "-c"], "w|gz"),
+    "xz": (".tar.xz", ["xz", "-T0", "-c"], "w|xz"),
+    "zip": (".zip", None, None),
+}
+
+# Extensión del archivo -> (descompresor externo, modo de tarfile sin descompresor externo)
+TAR_READERS = {
+    (".tar.zst", ".tzst"): (["zstd", "-d", "-q", "-c"], None),
+    (".tar.gz", ".tgz"): (["pigz", "-d", "-c"], "r|gz"),
+    (".tar.xz", ".txz"): (["xz", "-T0", "-d", "-c"], "r|xz"),
+    (".tar.bz2", ".tbz2"): (None, "r|bz2"),
+    (".tar",): (None, "r|"),
+}
+
+
+class ProgressReader:
+    """Envuelve un archivo: cuenta los bytes leídos y corta si se cancela la operación"""
+
+    def __init__(self, fileobj, transfer: Transfer):
+        self.fileobj = fileobj
+        self.transfer = transfer
+
+    def read(self, size: int = -1) -> bytes:
+        if self.transfer.cancelled:
+            raise TransferCancelled()
+        data = self.fileobj.read(size)
+        self.transfer.add_bytes(len(data))
+        return data
+
+
+class Archiver:
+    """
+    Comprime y extrae en streaming, sin copias intermedias en memoria ni en disco.
+    Los tar se escriben en modo flujo hacia un compresor multinúcleo
+    (zstd -T0, pigz, xz -T0) cuando está en el PATH, y si no con el
+    compresor de Python. Extraer aplica el filtro 'data' de tarfile para
+    rechazar rutas absolutas, enlaces fuera del destino y dispositivos.
+    Las operaciones corren en segundo plano con el FileTransferManager.
+    """
+
+    def __init__(self, transfer_manager: FileTransferManager = None):
+        self.transfer_manager = transfer_manager or FileTransferManager()
+        self.path_index = get_path_index()
+
+    # ------------------------------------------------------------ utilidades
+    def default_format(self) -> str:
+        """zstd si está instalado, si no gzip (con pigz si está)"""
+        return "zst" if self.path_index.exists("zstd") else "gz"
+
+    def _unique_path(self, path: Path) -> Path:
+        if not os.path.lexists(path):
+            return path
+        name, suffix = path.name, ""
+        for ext in [ext for ext, _, _ in FORMATS.values()]:
+            if name.endswith(ext):
+                name, suffix = name[:-len(ext)], ext
+                break
+        counter = 2
+        while True:
+            candidate = path.with_name(f"{name} ({counter}){suffix}")
+            if not os.path.lexists(candidate):
+                return candidate
+            counter += 1
+
+    def _external(self, command: list):
+        """El comando si su ejecutable está disponible (None si no)"""
+        if command and self.path_index.exists(command[0]):
+            return [self.path_index.which(command[0])] + command[1:]
+        return None
+
+    def _plan(self, source: Path, transfer: Transfer) -> list:
+        """Entradas a archivar (ruta, nombre dentro del archivo) y total de bytes"""
+        entries = [(source, source.name)]
+        if source.is_dir() and not source.is_symlink():
+            for root, dirnames, filenames in os.walk(source):
+                dirnames.sort()
+                for name in dirnames + sorted(filenames):
+                    path = Path(root) / name
+                    entries.append((path, str(path.relative_to(source.parent))))
+        for path, _ in entries:
+            if path.is_file() and not path.is_symlink():
+                transfer.total_bytes += path.stat().st_size
+                transfer.files_total += 1
+        return entries
+
+    # ------------------------------------------------------------- comprimir
+    def compress(self, source, archive_format: str = None) -> Transfer:
+        """Comprime un archivo o carpeta junto a él; devuelve la transferencia en curso"""
+        source = Path(source)
+        archive_format = archive_format or self.default_format()
+        if archive_format not in FORMATS:
+            raise ValueError(f"Formato no soportado: {archive_format}")
+        extension = FORMATS[archive_format][0]
+        output = self._unique_path(source.with_name(source.name + extension))
+
+        def work(transfer: Transfer):
+            entries = self._plan(source, transfer)
+            transfer.status = "running"
+            try:
+                if archive_format == "zip":
+                    self._write_zip(entries, output, transfer)
+                else:
+                    self._write_tar(entries, output, archive_format, transfer)
+            except BaseException:
+                if output.exists():
+                    output.unlink()
+                raise
+            compressed = output.stat().st_size
+            ratio = compressed / transfer.done_bytes if transfer.done_bytes else 1.0
+            transfer.note = f"{output.name} ocupa {format_size(compressed)} ({ratio:.0%} del original)"
+
+        return self.transfer_manager.launch("compress", [source], output, work)
+
+    def _write_tar(self, entries: list, output: Path, archive_format: str, transfer: Transfer):
+        _, compressor, fallback_mode = FORMATS[archive_format]
+        command = self._external(compressor)
+        with open(output, "wb") as out:
+            process = None
+            if command:
+                # tar en flujo -> stdin del compresor -> archivo
+                process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=out)
+                transfer.methods[os.path.basename(command[0])] = 1
+                tar = tarfile.open(fileobj=process.stdin, mode="w|")
+            else:
+                transfer.methods["python"] = 1
+                tar = tarfile.open(fileobj=out, mode=fallback_mode)
+            try:
+                with tar:
+                    self._add_entries(tar, entries, transfer)
+            except BaseException:
+                if process:
+                    process.kill()
+                    process.wait()
+                raise
+            if process:
+                process.stdin.close()
+                if process.wait() != 0:
+                    raise OSError(f"{os.path.basename(command[0])} terminó con código {process.returncode}")
+
+    def _add_entries(self, tar: tarfile.TarFile, entries: list, transfer: Transfer):
+        for path, arcname in entries:
+            if transfer.cancelled:
+                raise TransferCancelled()
+            info = tar.gettarinfo(str(path), arcname)
+            if info.isreg():
+                with open(path, "rb") as f:
+                    tar.addfile(info, ProgressReader(f, transfer))
+                transfer.file_done("tar")
+            else:
+                tar.addfile(info)
+
+    def _write_zip(self, entries: list, output: Path, transfer: Transfer):
+        transfer.methods["zip"] = 1
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            for path, arcname in entries:
+                if transfer.cancelled:
+                    raise TransferCancelled()
+                if path.is_dir() and not path.is_symlink():
+                    archive.write(path, arcname)
+                    continue
+                if not path.is_file():
+                    continue
+                # Escritura por bloques: el archivo nunca se carga entero en memoria
+                info = zipfile.ZipInfo.from_file(path, arcname)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with open(path, "rb") as src, archive.open(info, "w", force_zip64=True) as dst:
+                    reader = ProgressReader(src, transfer)
+                    while True:
+                        chunk = reader.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        dst.write(chunk)
+                transfer.file_done("zip")
+
+    # --------------------------------------------------------------- extraer
+    def extract(self, archive, destination=None) -> Transfer:
+        """Extrae en una carpeta nueva junto al archivo (o dentro de destination)"""
+        archive = Path(archive)
+        name = archive.name
+        lower = name.lower()
+        stem = name
+        for extension in [".zip"] + [ext for exts in TAR_READERS for ext in exts]:
+            if lower.endswith(extension):
+                stem = name[:-len(extension)]
+                break
+        else:
+            raise ValueError(f"No sé extraer '{name}'")
+
+        parent = Path(destination) if destination else archive.parent
+        target = self._unique_path(parent / stem)
+        staging = parent / f".{stem}.extrayendo-{os.getpid()}"
+
+        def work(transfer: Transfer):
+            transfer.total_bytes = archive.stat().st_size
+            transfer.status = "running"
+            staging.mkdir(parents=True)
+            try:
+                if lower.endswith(".zip"):
+                    self._read_zip(archive, staging, transfer)
+                else:
+                    self._read_tar(archive, lower, staging, transfer)
+                # Si todo cuelga de una sola carpeta no se anida otra más
+                contents = list(staging.iterdir())
+                if len(contents) == 1 and contents[0].is_dir() and not contents[0].is_symlink():
+                    final = self._unique_path(parent / contents[0].name)
+                    contents[0].rename(final)
+                    staging.rmdir()
+                else:
+                    final = self._unique_path(target)
+                    staging.rename(final)
+            except BaseException:
+                # Lo extraído a medias no se deja a la vista
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            transfer.destination = str(final)
+
+        return self.transfer_manager.launch("extract", [archive], target, work)
+
+    def _read_tar(self, archive: Path, lower: str, target: Path, transfer: Transfer):
+        decompressor, fallback_mode = next(reader for exts, reader in TAR_READERS.items() if lower.endswith(exts))
+        command = self._external(decompressor)
+        with open(archive, "rb") as f:
+            process = None
+            if command:
+                # El descompresor lee del mismo descriptor: su posición es el progreso
+                process = subprocess.Popen(command, stdin=f, stdout=subprocess.PIPE)
+                transfer.methods[os.path.basename(command[0])] = 1
+                stream = process.stdout
+                mode = "r|"
+            else:
+                if fallback_mode is None:
+                    raise OSError(f"Necesito '{decompressor[0]}' para extraer {archive.name}")
+                transfer.methods["python"] = 1
+                stream = ProgressReader(f, transfer)
+                mode = fallback_mode
+            try:
+                with tarfile.open(fileobj=stream, mode=mode) as tar:
+                    for member in tar:
+                        if transfer.cancelled:
+                            raise TransferCancelled()
+                        tar.extract(member, target, filter="data")
+                        if member.isreg():
+                            transfer.files_done += 1
+                        if process:
+                            transfer.done_bytes = os.lseek(f.fileno(), 0, os.SEEK_CUR)
+            except BaseException:
+                if process:
+                    process.kill()
+                raise
+            finally:
+                if process:
+                    process.stdout.close()
+                    process.wait()
+            if process and process.returncode != 0:
+                raise OSError(f"{os.path.basename(command[0])} terminó con código {process.returncode}")
+            transfer.done_bytes = transfer.total_bytes
+
+    def _read_zip(self, archive: Path, target: Path, transfer: Transfer):
+        transfer.methods["zip"] = 1
+        with zipfile.ZipFile(archive) as zf:
+            transfer.files_total = sum(1 for info in zf.infolist() if not info.is_dir())
+            for info in zf.infolist():
+                if transfer.cancelled:
+                    raise TransferCancelled()
+                # ZipFile.extract ya neutraliza rutas absolutas y '..'
+                zf.extract(info, target)
+                transfer.add_bytes(info.compress_size)
+                if not info.is_dir():
+                    transfer.files_done += 1
+        transfer.done_bytes = transfer.total_bytes
@@ -0,0 +1,265 @@
+# [file name]: src/system/batch_transcriber.py
+import os
+import json
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from .dir_walker import DirectoryWalker
+from .duplicate_finder import full_hash
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".ogg", ".opus", ".flac", ".aac", ".webm", ".wma"}
+# Por carpeta: qué audios ya tienen transcripción y con qué hash estaban cuando se hizo
+MANIFEST_NAME = ".margarita_transcripciones.json"
+# Whisper trabaja en ventanas de 30 s: las notas que caben en una se agrupan entre archivos
+CLIP_SAMPLES = 30 * 16000
+
+
+def _format_hours(seconds: float) -> str:
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 60:.1f} min" if seconds >= 60 else f"{seconds:.0f} s"
+
+
+class BatchTranscriber:
+    """
+    Transcribe todas las grabaciones de una carpeta (y subcarpetas) dejando
+    un .txt junto a cada audio. Un manifiesto por carpeta guarda el hash de
+    cada audio transcrito: al repetir la orden solo se procesan los nuevos o
+    los que cambiaron. Mientras Whisper trabaja, prefetch hilos ya calculan
+    el hash y decodifican los archivos siguientes.
+    Lotes: las notas de menos de 30 s (un solo trozo de Whisper cada una) se
+    juntan de batch_size en batch_size, de archivos distintos, en una única
+    pasada por lotes; una grabación larga se trocea por silencios y son sus
+    propios trozos los que forman los lotes.
+    El modelo se crea con stt_factory la primera vez que hace falta.
+    """
+
+    def __init__(self, stt_factory, walker: DirectoryWalker = None, batch_size: int = 8, prefetch: int = 2):
+        self.stt_factory = stt_factory
+        self.walker = walker or DirectoryWalker()
+        self.batch_size = batch_size
+        self.prefetch = prefetch
+        self._stt = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._cancel = threading.Event()
+        self.progress = {"running": False, "root": None, "files_total": 0, "files_done": 0,
+                         "audio_seconds": 0.0, "current": None, "started_at": None}
+        self.last_report = None
+
+    @property
+    def stt(self):
+        if self._stt is None:
+            self._stt = self.stt_factory()
+        return self._stt
+
+    # ------------------------------------------------------------ manifiestos
+    def _load_manifest(self, folder: Path) -> dict:
+        try:
+            with open(folder / MANIFEST_NAME, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, folder: Path, manifest: dict):
+        manifest_file = folder / MANIFEST_NAME
+        tmp_file = f"{manifest_file}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_file, manifest_file)
+        except OSError as e:
+            print(f"[BatchTranscriber] No se pudo guardar {manifest_file}: {e}")
+
+    def _transcript_path(self, audio: Path, manifest: dict) -> Path:
+        """nota.mp3 -> nota.txt, salvo que ya exista un nota.txt que no es nuestro"""
+        recorded = manifest.get(audio.name, {}).get("transcript")
+        if recorded:
+            return audio.parent / recorded
+        candidate = audio.with_suffix(".txt")
+        if candidate.exists():
+            return audio.parent / f"{audio.name}.txt"
+        return candidate
+
+    # --------------------------------------------------------------- trabajo
+    def find_audio(self, root) -> list:
+        files = self.walker.find(root, lambda entry: os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS,
+                                 include_files=True)
+        return sorted(Path(info["path"]) for info in files if not info["is_dir"])
+
+    def _prepare(self, audio: Path):
+        """(hash, audio decodificado o None si ya está transcrito, error) de un archivo"""
+        _, checksum = full_hash(str(audio))
+        if checksum is None:
+            return None, None, "no se pudo leer"
+        entry = self._load_manifest(audio.parent).get(audio.name)
+        if entry and entry.get("checksum") == checksum and (audio.parent / entry["transcript"]).exists():
+            return checksum, None, None
+        try:
+            return checksum, self.stt.load_audio(audio), None
+        except Exception as e:
+            return checksum, None, str(e)
+
+    def transcribe_folder(self, root, lang: str = "es") -> dict:
+        """Transcribe root (bloqueante) y devuelve el informe"""
+        root = Path(os.path.abspath(str(root)))
+        started = time.monotonic()
+        self._cancel.clear()
+        with self._lock:
+            self.progress = {"running": True, "root": str(root), "files_total": 0, "files_done": 0,
+                             "audio_seconds": 0.0, "current": None, "started_at": time.time()}
+        files = self.find_audio(root)
+        with self._lock:
+            self.progress["files_total"] = len(files)
+
+        report = {"root": str(root), "files": len(files), "transcribed": 0, "skipped": 0, "failed": [],
+                  "audio_seconds": 0.0, "elapsed": 0.0, "cancelled": False}
+        stt = self.stt if files else None
+        manifests = {}
+        batch = []      # [(audio, hash, muestras)] de notas cortas esperando a llenar un lote
+
+        def flush():
+            if batch:
+                clips = [samples for _, _, samples in batch]
+                try:
+                    texts = stt.transcribe_clips(clips, lang=lang, batch_size=self.batch_size)
+                except Exception as e:
+                    texts = [e] * len(batch)
+                for (audio, checksum, samples), text in zip(batch, texts):
+                    self._store(audio, checksum, samples, text, stt, manifests, report)
+                batch.clear()
+
+        # El hash y la decodificación van por delante de Whisper: un lote entero más prefetch archivos
+        lookahead = self.batch_size + self.prefetch
+        with ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix="transcribe-prefetch") as executor:
+            pending = [executor.submit(self._prepare, audio) for audio in files[:lookahead]]
+            for index, audio in enumerate(files):
+                if self._cancel.is_set():
+                    report["cancelled"] = True
+                    break
+                if index + lookahead < len(files):
+                    pending.append(executor.submit(self._prepare, files[index + lookahead]))
+                checksum, samples, error = pending[index].result()
+                pending[index] = None
+                with self._lock:
+                    self.progress["current"] = str(audio.relative_to(root))
+
+                if error:
+                    report["failed"].append((str(audio), error))
+                elif samples is None:
+                    report["skipped"] += 1
+                elif len(samples) <= CLIP_SAMPLES:
+                    batch.append((audio, checksum, samples))
+                    if len(batch) >= self.batch_size:
+                        flush()
+                else:
+                    # Grabación larga: sus propios trozos llenan los lotes
+                    try:
+                        text = stt.transcribe_batched(samples, lang=lang, batch_size=self.batch_size)
+                    except Exception as e:
+                        text = e
+                    self._store(audio, checksum, samples, text, stt, manifests, report)
+                with self._lock:
+                    self.progress["files_done"] = index + 1 - len(batch)
+                    self.progress["audio_seconds"] = report["audio_seconds"]
+            if not report["cancelled"]:
+                flush()
+            for future in pending:
+                if future is not None:
+                    future.cancel()
+
+        report["elapsed"] = time.monotonic() - started
+        report["finished_at"] = time.time()
+        with self._lock:
+            self.progress["running"] = False
+            self.progress["current"] = None
+        self.last_report = report
+        return report
+
+    def _store(self, audio: Path, checksum: str, samples, text, stt, manifests: dict, report: dict):
+        """Escribe el .txt y anota el audio en el manifiesto de su carpeta (text puede ser la excepción)"""
+        manifest = manifests.setdefault(audio.parent, self._load_manifest(audio.parent))
+        transcript = self._transcript_path(audio, manifest)
+        try:
+            if isinstance(text, Exception):
+                raise text
+            transcript.write_text(text + "\n", encoding="utf-8")
+        except Exception as e:
+            report["failed"].append((str(audio), str(e)))
+            return
+        duration = len(samples) / 16000
+        manifest[audio.name] = {"checksum": checksum, "transcript": transcript.name,
+                                "profile": stt.profile, "seconds": round(duration, 1)}
+        self._save_manifest(audio.parent, manifest)
+        report["transcribed"] += 1
+        report["audio_seconds"] += duration
+        print(f"[BatchTranscriber] {audio.name}: {duration:.0f}s -> {transcript.name}")
+
+    # ---------------------------------------------------------- segundo plano
+    def start(self, root, lang: str = "es"):
+        """Lanza la transcripción en un hilo; el informe queda en last_report"""
+        if self.is_running():
+            raise RuntimeError("Ya hay una transcripción en curso")
+        self.last_report = None
+        with self._lock:
+            self.progress = {**self.progress, "running": True, "root": str(root), "files_done": 0,
+                             "files_total": 0, "audio_seconds": 0.0}
+
+        def run():
+            try:
+                self.transcribe_folder(root, lang)
+            except Exception as e:
+                print(f"[BatchTranscriber] Error transcribiendo {root}: {e}")
+                with self._lock:
+                    self.progress["running"] = False
+
+        self._thread = threading.Thread(target=run, name="batch-transcriber", daemon=True)
+        self._thread.start()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, timeout: float = None) -> bool:
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def cancel(self) -> bool:
+        """Para tras el archivo en curso; lo ya transcrito queda guardado"""
+        if not self.is_running():
+            return False
+        self._cancel.set()
+        return True
+
+    # ------------------------------------------------------------- informes
+    def describe_progress(self) -> str:
+        with self._lock:
+            progress = dict(self.progress)
+        if not progress["running"]:
+            return "No hay ninguna transcripción en curso"
+        elapsed = max(time.time() - (progress["started_at"] or time.time()), 1e-6)
+        text = (f"📝 Transcribiendo {progress['root']}: {progress['files_done']} de "
+                f"{progress['files_total'] or '?'} archivos, {_format_hours(progress['audio_seconds'])} de audio")
+        if progress["audio_seconds"]:
+            text += f" ({progress['audio_seconds'] / elapsed:.1f} h de audio por hora)"
+        if progress["current"]:
+            text += f"\n   Ahora: {progress['current']}"
+        return text
+
+    def describe_report(self, report: dict) -> str:
+        elapsed = max(report["elapsed"], 1e-6)
+        if not report["files"]:
+            return f"❌ No hay grabaciones en {report['root']}"
+        status = "⏹️ Transcripción cancelada" if report["cancelled"] else "✅ Transcripción terminada"
+        lines = [f"{status} en {report['root']}: {report['transcribed']} transcritos, "
+                 f"{report['skipped']} ya estaban al día de {report['files']} archivos"]
+        if report["audio_seconds"]:
+            lines.append(f"   {_format_hours(report['audio_seconds'])} de audio en {_format_hours(elapsed)} "
+                         f"= {report['audio_seconds'] / elapsed:.1f} horas de audio por hora")
+        for path, error in report["failed"][:5]:
+            lines.append(f"   ⚠️ {os.path.relpath(path, report['root'])}: {error}")
+        if len(report["failed"]) > 5:
+            lines.append(f"   ⚠️ ... y {len(report['failed']) - 5} errores más")
+        return "\n".join(lines)
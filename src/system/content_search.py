@@ -0,0 +1,153 @@
+# [file name]: src/system/content_search.py
+import os
+import re
+import mmap
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .dir_walker import DirectoryWalker
+
+
+# Extensiones que nunca son texto: se descartan sin abrirlas
+BINARY_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp", ".ico", ".svgz", ".mp3", ".wav", ".flac",
+    ".ogg", ".aac", ".m4a", ".mp4", ".mkv", ".avi", ".mov", ".webm", ".zip", ".gz", ".bz2", ".xz",
+    ".zst", ".7z", ".rar", ".tar", ".iso", ".img", ".exe", ".dll", ".so", ".o", ".a", ".class",
+    ".jar", ".pyc", ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".odt", ".ods",
+    ".sqlite", ".sqlite3", ".db", ".bin", ".dat", ".woff", ".woff2", ".ttf", ".otf"
+}
+
+
+def build_pattern(query: str) -> re.Pattern:
+    """
+    Patrón de bytes UTF-8 que ignora mayúsculas también en letras acentuadas
+    (re.IGNORECASE sobre bytes solo pliega ASCII).
+    """
+    parts = []
+    for char in query:
+        variants = sorted({char, char.lower(), char.upper()})
+        encoded = [re.escape(v.encode("utf-8")) for v in variants if len(v) == 1]
+        parts.append(encoded[0] if len(encoded) == 1 else b"(?:" + b"|".join(encoded) + b")")
+    return re.compile(b"".join(parts))
+
+
+class ContentSearcher:
+    """
+    Búsqueda de texto dentro de archivos: recorre con DirectoryWalker (mismas
+    reglas de poda que la búsqueda de carpetas), descarta binarios mirando la
+    cabecera y escanea cada archivo con mmap en un pool de hilos.
+    """
+
+    HEADER_SIZE = 1024
+    MAX_PREVIEW = 160
+    HITS_PER_FILE = 3
+
+    def __init__(self, walker: DirectoryWalker = None, max_workers: int = None, max_file_size: int = 20 * 1024**2):
+        self.walker = walker or DirectoryWalker()
+        self.max_workers = max_workers or min(8, os.cpu_count() or 2)
+        self.max_file_size = max_file_size
+        self.last_stats = {}
+
+    def _is_candidate(self, entry) -> bool:
+        try:
+            if not entry.is_file(follow_symlinks=False):
+                return False
+        except OSError:
+            return False
+        return os.path.splitext(entry.name)[1].lower() not in BINARY_EXTENSIONS
+
+    def _scan_file(self, info: dict, pattern: re.Pattern):
+        """Busca el patrón en un archivo; devuelve el resultado o None"""
+        size = info.get("size", 0)
+        if size == 0 or size > self.max_file_size:
+            return None
+        try:
+            with open(info["path"], "rb") as f:
+                # Detección barata de binarios: un NUL en la cabecera
+                if b"\0" in f.read(self.HEADER_SIZE):
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._collect_hits(info, mm, pattern)
+        except (OSError, ValueError):
+            return None
+
+    def _collect_hits(self, info: dict, mm, pattern: re.Pattern):
+        hits = []
+        count = 0
+        line_number, line_pos = 1, 0
+        for match in pattern.finditer(mm):
+            count += 1
+            if len(hits) >= self.HITS_PER_FILE:
+                continue
+            start = mm.rfind(b"\n", 0, match.start()) + 1
+            end = mm.find(b"\n", match.end())
+            end = len(mm) if end == -1 else end
+            # Contar saltos de línea solo desde el último acierto
+            line_number += mm[line_pos:start].count(b"\n")
+            line_pos = start
+            preview = mm[start:min(end, start + self.MAX_PREVIEW)].decode("utf-8", "replace").strip()
+            hits.append({"line": line_number, "preview": preview})
+
+        if not count:
+            return None
+        return dict(info, hits=hits, count=count)
+
+    def search(self, query: str, root, max_results: int = 20, time_budget: float = 4.0):
+        """
+        Generador de archivos que contienen el texto, en el orden en que se encuentran.
+        Se detiene al llegar a max_results archivos o al agotar time_budget segundos.
+        """
+        pattern = build_pattern(query)
+        start = time.monotonic()
+        deadline = start + time_budget
+        stats = {"files_scanned": 0, "files_matched": 0, "elapsed": 0.0, "reason": "completed"}
+        self.last_stats = stats
+
+        files = self.walker.walk(root, self._is_candidate, include_files=True, time_budget=time_budget)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="content-search")
+        pending = set()
+        walk_done = False
+        try:
+            while not walk_done or pending:
+                if time.monotonic() >= deadline:
+                    stats["reason"] = "time_budget"
+                    return
+
+                # Mantener el pool alimentado sin adelantarse demasiado al escaneo
+                while not walk_done and len(pending) < self.max_workers * 4:
+                    info = next(files, None)
+                    if info is None:
+                        walk_done = True
+                        break
+                    pending.add(executor.submit(self._scan_file, info, pattern))
+
+                if not pending:
+                    continue
+                done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0),
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats["files_scanned"] += 1
+                    result = future.result()
+                    if result:
+                        stats["files_matched"] += 1
+                        yield result
+                        if stats["files_matched"] >= max_results:
+                            stats["reason"] = "max_results"
+                            return
+        finally:
+            files.close()
+            executor.shutdown(wait=False, cancel_futures=True)
+            stats["elapsed"] = time.monotonic() - start
+
+    def search_ranked(self, query: str, root, max_results: int = 20, time_budget: float = 4.0) -> list:
+        """Igual que search() pero ordenado: coincidencia en el nombre, nº de aciertos y recencia"""
+        query_lower = query.lower()
+        results = list(self.search(query, root, max_results=max_results, time_budget=time_budget))
+        now = time.time()
+        for result in results:
+            age_days = (now - result.get("mtime", now)) / 86400
+            result["score"] = round(
+                (2.0 if query_lower in result["name"].lower() else 0.0)
+                + min(result["count"], 10) * 0.2
+                + 1.0 / (1.0 + age_days / 30), 3
+            )
+        return sorted(results, key=lambda r: r["score"], reverse=True)
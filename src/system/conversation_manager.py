@@ -1,13 +1,32 @@
 # [file name]: src/system/conversation_manager.py
+import re
+from .fs_cache import get_fs_cache
+from .directory_index import normalize_name
+
+# Respuestas que cuentan como "sí" a una pregunta de confirmación; cualquier otra cosa es "no"
+YES_PATTERN = re.compile(r"^(s[ií]|vale|ok|claro|adelante|hazlo|dale|de acuerdo|confirmo|yes)\b", re.IGNORECASE)
+# Respuestas a "¿cuál cancelo?"
+ORDINALS = {"uno": 1, "una": 1, "primera": 1, "primero": 1, "dos": 2, "segunda": 2, "segundo": 2,
+            "tres": 3, "tercera": 3, "tercero": 3, "cuatro": 4, "cuarta": 4, "cuarto": 4}
+
+
 class ConversationManager:
     """Maneja el flujo de conversación con el usuario"""
     
     def __init__(self, executor):
         self.executor = executor
         self.pending_actions = {}
+        self.fs_cache = get_fs_cache()
     
     def handle_system_command(self, command_data: dict, user_id: str = "default") -> str:
         """Maneja comandos del sistema con flujo conversacional"""
+        self.fs_cache.begin_request()
+        try:
+            return self._handle_system_command(command_data, user_id)
+        finally:
+            print(f"[ConversationManager] Caché de metadatos: {self.fs_cache.request_summary()}")
+    
+    def _handle_system_command(self, command_data: dict, user_id: str = "default") -> str:
         command_type = command_data['type']
         params = command_data['params']
         
@@ -114,11 +133,66 @@ class ConversationManager:
                     result = self.executor.intelligent_manager.smart_create_file(params)
                     return result["message"]
         
+        # Varias carpetas a la vez sin ubicación: preguntar dónde
+        elif command_type == 'create_folders':
+            if params.get('folder_names') and not params.get('location'):
+                self.pending_actions[user_id] = {
+                    'action': 'create_folders_with_names',
+                    'folder_names': params['folder_names']
+                }
+                print(f"[ConversationManager] ✅ Guardada acción pendiente: {self.pending_actions[user_id]}")
+                suggested = self.executor.intelligent_manager.files_manager.get_suggested_folders()
+                return f"¿Dónde quieres crear las carpetas {', '.join(params['folder_names'])}? Sugerencias: {', '.join(suggested[:3])}"
+        
+        # Un prefijo que solo coincide con un ejecutable desconocido del PATH: preguntar antes de lanzarlo
+        elif command_type == 'open_app' and params:
+            suggestion = self.executor.apps_manager.unconfirmed_match(params)
+            if suggestion:
+                self.pending_actions[user_id] = {
+                    'action': 'confirm_open_app',
+                    'executable': suggestion
+                }
+                print(f"[ConversationManager] ✅ Guardada acción pendiente: {self.pending_actions[user_id]}")
+                return f"No conozco la aplicación '{params}'. ¿Abro '{suggestion}'? (sí/no)"
+        
+        # "cancela" con varias tareas en curso: preguntar cuál, no pararlas todas
+        elif command_type == 'cancel_transfer':
+            jobs = self.executor.running_jobs()
+            if len(jobs) > 1:
+                self.pending_actions[user_id] = {
+                    'action': 'choose_cancel',
+                    'jobs': jobs
+                }
+                print(f"[ConversationManager] ✅ Guardada acción pendiente: {self.pending_actions[user_id]}")
+                options = "; ".join(f"{number}) {label}" for number, (_, label) in enumerate(jobs, 1))
+                return f"Hay {len(jobs)} tareas en curso: {options}. ¿Cuál cancelo? (número, 'todas' o 'ninguna')"
+            return self.executor.cancel_transfer()
+        
+        # Transcribir escribe un .txt junto a cada audio: confirmar antes la carpeta resuelta
+        elif command_type == 'transcribe_folder':
+            root, error = self.executor.transcription_root(params)
+            if error:
+                return error
+            self.pending_actions[user_id] = {
+                'action': 'confirm_transcribe_folder',
+                'root': str(root)
+            }
+            print(f"[ConversationManager] ✅ Guardada acción pendiente: {self.pending_actions[user_id]}")
+            return (f"¿Transcribo las grabaciones de {root} y sus subcarpetas? "
+                    f"Dejaré un .txt junto a cada audio (sí/no)")
+        
         # Otros comandos (ejecutar directamente)
         return self.executor.execute_command(command_type, params)
     
     def handle_user_response(self, response: str, user_id: str = "default") -> str:
         """Maneja respuestas del usuario a preguntas pendientes"""
+        self.fs_cache.begin_request()
+        try:
+            return self._handle_user_response(response, user_id)
+        finally:
+            print(f"[ConversationManager] Caché de metadatos: {self.fs_cache.request_summary()}")
+    
+    def _handle_user_response(self, response: str, user_id: str = "default") -> str:
         if user_id not in self.pending_actions:
             return "No tengo acciones pendientes para procesar."
         
@@ -168,6 +242,39 @@ class ConversationManager:
                 # Crear archivo en la carpeta elegida
                 result = self.executor.intelligent_manager.smart_create_file(file_name, folder_choice)
                 return result["message"]
+            
+            elif action['action'] == 'create_folders_with_names':
+                location = response_clean  # Preservar mayúsculas de la respuesta
+                folder_names = action['folder_names']
+                del self.pending_actions[user_id]
+                
+                result = self.executor.intelligent_manager.bulk_create_folders(folder_names, location)
+                return result["message"]
+            
+            elif action['action'] == 'confirm_open_app':
+                executable = action['executable']
+                del self.pending_actions[user_id]
+                
+                if not self.is_confirmation(response_clean):
+                    return f"De acuerdo, no abro '{executable}'"
+                return self.executor.apps_manager.open_application(executable)
+            
+            elif action['action'] == 'choose_cancel':
+                jobs = action['jobs']
+                del self.pending_actions[user_id]
+                
+                chosen = self._choose_jobs(response_clean, jobs)
+                if not chosen:
+                    return "De acuerdo, no cancelo nada"
+                return "\n".join(self.executor.cancel_job(key) for key, _ in chosen)
+            
+            elif action['action'] == 'confirm_transcribe_folder':
+                root = action['root']
+                del self.pending_actions[user_id]
+                
+                if not self.is_confirmation(response_clean):
+                    return f"De acuerdo, no transcribo {root}"
+                return self.executor.transcribe_folder(root)
         
         except Exception as e:
             del self.pending_actions[user_id]
@@ -175,6 +282,25 @@ class ConversationManager:
         
         return "No pude entender tu respuesta para la acción pendiente."
     
+    def _choose_jobs(self, response: str, jobs: list) -> list:
+        """Tareas elegidas en la respuesta: "2", "la segunda", "la copia", "todas" (vacío = ninguna)"""
+        words = re.findall(r"\w+", response.lower())
+        if any(word in ("todas", "todo", "todos") for word in words):
+            return list(jobs)
+        for word in words:
+            number = int(word) if word.isdigit() else ORDINALS.get(word)
+            if number and 1 <= number <= len(jobs):
+                return [jobs[number - 1]]
+        # Por el tipo o el nombre: "la transcripción", "la copia de fotos"
+        words = [normalize_name(word) for word in words if len(word) > 3]
+        scores = [sum(word in normalize_name(label) for word in words) for _, label in jobs]
+        best = max(scores)
+        return [jobs[scores.index(best)]] if best and scores.count(best) == 1 else []
+    
+    def is_confirmation(self, response: str) -> bool:
+        """Si la respuesta a una pregunta de sí/no es afirmativa"""
+        return bool(YES_PATTERN.match(response.strip()))
+    
     def has_pending_action(self, user_id: str = "default") -> bool:
         """Verifica si hay acciones pendientes para el usuario"""
         has_action = user_id in self.pending_actions
@@ -0,0 +1,116 @@
+# [file name]: src/system/dir_walker.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .ignore_rules import IgnoreRules
+
+
+class DirectoryWalker:
+    """
+    Recorrido paralelo de directorios basado en os.scandir.
+    Poda carpetas según IgnoreRules, respeta una profundidad máxima y
+    entrega las coincidencias en cuanto aparecen (generador), con parada
+    temprana por número de resultados o presupuesto de tiempo.
+    """
+
+    def __init__(self, rules: IgnoreRules = None, max_workers: int = None):
+        self.rules = rules or IgnoreRules.from_config()
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 2) * 2)
+        self.last_stats = {}
+
+    def _scan(self, path: str, depth: int, match, include_files: bool, max_depth: int):
+        """Escanea un directorio; devuelve (coincidencias, subdirectorios, entradas vistas)"""
+        matches = []
+        subdirs = []
+        seen = 0
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    seen += 1
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if not is_dir and not (include_files and entry.is_file(follow_symlinks=False)):
+                            continue
+                    except OSError:
+                        continue
+
+                    if is_dir and self.rules.should_skip(entry.name):
+                        continue
+                    if is_dir and depth + 1 < max_depth:
+                        subdirs.append(entry.path)
+
+                    if match(entry):
+                        info = {"path": entry.path, "name": entry.name, "parent": path, "is_dir": is_dir}
+                        if not is_dir:
+                            try:
+                                stat = entry.stat(follow_symlinks=False)
+                                info["size"] = stat.st_size
+                                info["mtime"] = stat.st_mtime
+                            except OSError:
+                                continue
+                        matches.append(info)
+        except OSError:
+            pass
+        return matches, subdirs, seen
+
+    def walk(self, root, match, max_results: int = None, time_budget: float = None,
+             include_files: bool = False, max_depth: int = None):
+        """
+        Generador de coincidencias bajo root.
+        match(entry) recibe un os.DirEntry y decide si se entrega.
+        Al terminar (o al cerrar el generador) las estadísticas quedan en last_stats.
+        """
+        max_depth = self.rules.max_depth if max_depth is None else max_depth
+        start = time.monotonic()
+        deadline = start + time_budget if time_budget else None
+        stats = {"dirs_scanned": 0, "entries_seen": 0, "matches": 0, "elapsed": 0.0,
+                 "first_match_after": None, "stopped_early": False, "reason": "completed"}
+        self.last_stats = stats
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dir-walker")
+        pending = {executor.submit(self._scan, str(root), 0, match, include_files, max_depth): 0}
+        try:
+            while pending:
+                timeout = None
+                if deadline:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        stats["stopped_early"], stats["reason"] = True, "time_budget"
+                        return
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    depth = pending.pop(future)
+                    matches, subdirs, seen = future.result()
+                    stats["dirs_scanned"] += 1
+                    stats["entries_seen"] += seen
+                    for subdir in subdirs:
+                        scan = executor.submit(self._scan, subdir, depth + 1, match, include_files, max_depth)
+                        pending[scan] = depth + 1
+
+                    for info in matches:
+                        stats["matches"] += 1
+                        if stats["first_match_after"] is None:
+                            stats["first_match_after"] = time.monotonic() - start
+                        yield info
+                        if max_results and stats["matches"] >= max_results:
+                            stats["stopped_early"], stats["reason"] = True, "max_results"
+                            return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            stats["elapsed"] = time.monotonic() - start
+
+    def find(self, root, match, **kwargs) -> list:
+        """Versión no perezosa de walk(): devuelve todas las coincidencias"""
+        return list(self.walk(root, match, **kwargs))
+
+    def describe_stats(self) -> str:
+        stats = self.last_stats
+        if not stats:
+            return ""
+        text = f"{stats['dirs_scanned']} carpetas revisadas en {stats['elapsed']:.2f}s"
+        if stats["reason"] == "time_budget":
+            text += ", búsqueda cortada por tiempo"
+        elif stats["reason"] == "max_results":
+            text += ", límite de resultados alcanzado"
+        return text
@@ -0,0 +1,312 @@
+# [file name]: src/system/directory_index.py
+import os
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from .ignore_rules import IgnoreRules
+from .storage_paths import get_cache_dir
+from . import inotify_watcher as inotify
+
+
+def normalize_name(name: str) -> str:
+    """Normaliza un nombre para comparar sin tildes ni mayúsculas"""
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class DirectoryIndex:
+    """
+    Índice persistente (SQLite) de las carpetas bajo base_path.
+    Se construye en segundo plano y se mantiene al día con inotify;
+    responde búsquedas por subcadena o prefijo en milisegundos.
+    """
+
+    SCHEMA_VERSION = "1"
+    BATCH_SIZE = 2000
+
+    def __init__(self, base_path, db_file=None, rules: IgnoreRules = None):
+        self.base_path = str(Path(base_path))
+        self.rules = rules or IgnoreRules.from_config()
+        if db_file is None:
+            digest = hashlib.sha1(self.base_path.encode("utf-8")).hexdigest()[:12]
+            db_file = get_cache_dir() / f"dir_index_{digest}.sqlite3"
+        self.db_file = db_file
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._init_db()
+
+        self._generation = int(self._get_meta("generation") or 0)
+        self._building = False
+        self._build_thread = None
+        self._watcher = None
+        self._watch_limit_reached = False
+        self._events_applied = 0
+        self._last_event_at = None
+
+    # ------------------------------------------------------------------ DB
+    def _init_db(self):
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS dirs (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT,
+                    name TEXT,
+                    name_norm TEXT,
+                    depth INTEGER,
+                    generation INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS dirs_name_norm ON dirs(name_norm);
+            """)
+            if (self._get_meta("schema") != self.SCHEMA_VERSION
+                    or self._get_meta("rules") != self.rules.key()
+                    or self._get_meta("base_path") != self.base_path):
+                # Índice construido con otro esquema/reglas: descartarlo
+                self._conn.execute("DELETE FROM dirs")
+                self._conn.execute("DELETE FROM meta")
+                self._set_meta("schema", self.SCHEMA_VERSION)
+                self._set_meta("rules", self.rules.key())
+                self._set_meta("base_path", self.base_path)
+            self._conn.commit()
+
+    def _get_meta(self, key: str):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _insert_rows(self, rows: list):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO dirs(path, parent, name, name_norm, depth, generation) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def _delete_tree(self, path: str):
+        # Rango [path/, path0): todos los descendientes sin usar LIKE ('0' sigue a '/')
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                (path, path + os.sep, path + chr(ord(os.sep) + 1))
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------- recorrido
+    def _depth_of(self, path: str) -> int:
+        relative = os.path.relpath(path, self.base_path)
+        return 0 if relative == "." else relative.count(os.sep) + 1
+
+    def _walk(self, root: str, root_depth: int):
+        """Recorre el árbol desde root insertando carpetas y añadiendo watches"""
+        rows = []
+        stack = [(root, root_depth)]
+        while stack:
+            current, depth = stack.pop()
+            self._watch(current)
+            if depth >= self.rules.max_depth:
+                continue
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if not entry.is_dir(follow_symlinks=False):
+                                continue
+                        except OSError:
+                            continue
+                        if self.rules.should_skip(entry.name):
+                            continue
+                        rows.append((entry.path, current, entry.name, normalize_name(entry.name),
+                                     depth + 1, self._generation))
+                        stack.append((entry.path, depth + 1))
+            except OSError:
+                continue
+
+            if len(rows) >= self.BATCH_SIZE:
+                self._insert_rows(rows)
+                rows = []
+
+        if rows:
+            self._insert_rows(rows)
+
+    def _build(self):
+        start = time.monotonic()
+        try:
+            with self._lock:
+                self._generation += 1
+                self._set_meta("generation", self._generation)
+                self._conn.commit()
+
+            self._walk(self.base_path, 0)
+
+            with self._lock:
+                # Lo que no se vio en este recorrido ya no existe
+                self._conn.execute("DELETE FROM dirs WHERE generation < ?", (self._generation,))
+                self._set_meta("built_at", time.time())
+                self._conn.commit()
+            print(f"[DirectoryIndex] Índice de {self.base_path} construido: "
+                  f"{self.count()} carpetas en {time.monotonic() - start:.1f}s")
+        except Exception as e:
+            print(f"[DirectoryIndex] Error construyendo el índice: {e}")
+        finally:
+            self._building = False
+
+    # --------------------------------------------------------------- inotify
+    def _watch(self, path: str):
+        if self._watcher is None or self._watch_limit_reached:
+            return
+        if self._watcher.add_watch(path, inotify.DIR_CHANGES | inotify.IN_ONLYDIR) < 0:
+            self._watch_limit_reached = True
+            print("[DirectoryIndex] Límite de watches de inotify alcanzado; "
+                  "parte del índice solo se actualizará al reconstruirlo")
+
+    def _on_event(self, event: dict):
+        mask = event["mask"]
+        self._last_event_at = time.time()
+
+        if mask & inotify.IN_Q_OVERFLOW:
+            print("[DirectoryIndex] Se perdieron eventos de inotify; reconstruyendo el índice")
+            self.rebuild()
+            return
+        if not event["is_dir"] or not event["name"]:
+            return
+
+        path = event["path"]
+        if mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO):
+            depth = self._depth_of(path)
+            if self.rules.should_skip(event["name"]) or depth > self.rules.max_depth:
+                return
+            self._insert_rows([(path, os.path.dirname(path), event["name"], normalize_name(event["name"]),
+                                depth, self._generation)])
+            # Una carpeta movida aquí puede traer subcarpetas
+            self._walk(path, depth)
+            self._events_applied += 1
+        elif mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+            self._delete_tree(path)
+            self._watcher.remove_tree(path)
+            self._events_applied += 1
+
+    # ---------------------------------------------------------------- API
+    def start(self):
+        """Arranca el watcher y la (re)construcción en segundo plano"""
+        if self._watcher is None and inotify.inotify_available():
+            try:
+                self._watcher = inotify.InotifyWatcher(self._on_event, name="dir-index-watcher")
+                self._watcher.start()
+            except OSError as e:
+                print(f"[DirectoryIndex] inotify no disponible: {e}")
+        self.rebuild()
+
+    def rebuild(self):
+        """Lanza una reconstrucción en segundo plano (si no hay otra en curso)"""
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+        self._build_thread = threading.Thread(target=self._build, name="dir-index-build", daemon=True)
+        self._build_thread.start()
+
+    def wait_until_ready(self, timeout: float = None) -> bool:
+        if self._build_thread and not self.is_ready():
+            self._build_thread.join(timeout)
+        return self.is_ready()
+
+    def is_ready(self) -> bool:
+        """El índice es utilizable si se completó al menos una construcción"""
+        with self._lock:
+            return self._get_meta("built_at") is not None
+
+    def covers(self, path) -> bool:
+        path = str(path)
+        return path == self.base_path or path.startswith(self.base_path.rstrip(os.sep) + os.sep)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM dirs").fetchone()[0]
+
+    def search(self, term: str, limit: int = 20, prefix_only: bool = False, within: str = None) -> list:
+        """Busca carpetas por subcadena (o prefijo) del nombre, ordenadas por relevancia"""
+        term_norm = normalize_name(term.strip())
+        if not term_norm:
+            return []
+
+        if prefix_only:
+            where = "name_norm >= ? AND name_norm < ?"
+            args = [term_norm, term_norm + "\U0010ffff"]
+        else:
+            where = "instr(name_norm, ?) > 0"
+            args = [term_norm]
+
+        if within and str(within) != self.base_path:
+            within = str(within).rstrip(os.sep)
+            where += " AND path >= ? AND path < ?"
+            args += [within + os.sep, within + chr(ord(os.sep) + 1)]
+
+        query = (
+            f"SELECT path, name, parent, depth, name_norm = ?, substr(name_norm, 1, ?) = ? "
+            f"FROM dirs WHERE {where} "
+            f"ORDER BY name_norm = ? DESC, substr(name_norm, 1, ?) = ? DESC, depth, length(path) "
+            f"LIMIT ?"
+        )
+        params = [term_norm, len(term_norm), term_norm] + args + [term_norm, len(term_norm), term_norm, limit]
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        results = []
+        for path, name, parent, depth, exact, prefix in rows:
+            score = 1.0 if exact else 0.8 if prefix else 0.5
+            results.append({
+                "path": path,
+                "name": name,
+                "parent": parent,
+                "score": round(score - min(depth, 20) * 0.01, 3)
+            })
+        return results
+
+    def status(self) -> dict:
+        """Estado y frescura del índice"""
+        with self._lock:
+            built_at = self._get_meta("built_at")
+        built_at = float(built_at) if built_at else None
+        return {
+            "ready": built_at is not None,
+            "building": self._building,
+            "built_at": built_at,
+            "age_seconds": time.time() - built_at if built_at else None,
+            "directories": self.count(),
+            "watching": self._watcher is not None and not self._watch_limit_reached,
+            "watched_dirs": self._watcher.watch_count if self._watcher else 0,
+            "events_applied": self._events_applied,
+            "last_event_at": self._last_event_at
+        }
+
+    def describe_freshness(self) -> str:
+        status = self.status()
+        if not status["ready"]:
+            return "índice en construcción"
+        if status["watching"] and not status["building"]:
+            return "índice al día, actualizado en tiempo real"
+        minutes = int(status["age_seconds"] // 60)
+        suffix = ", actualizándose" if status["building"] else ""
+        return f"índice de hace {minutes} min{suffix}"
+
+
+_shared_indexes = {}
+_shared_lock = threading.Lock()
+
+
+def get_directory_index(base_path) -> DirectoryIndex:
+    """Índice compartido por carpeta base; se arranca la primera vez que se pide"""
+    key = str(Path(base_path))
+    with _shared_lock:
+        index = _shared_indexes.get(key)
+        if index is None:
+            index = DirectoryIndex(key)
+            _shared_indexes[key] = index
+            index.start()
+        return index
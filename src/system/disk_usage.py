@@ -0,0 +1,218 @@
+# [file name]: src/system/disk_usage.py
+import os
+import json
+import heapq
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .storage_paths import get_cache_dir
+
+
+def format_size(size: int) -> str:
+    """Tamaño legible: 1536 -> '1.5 KB'"""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if value < 1024 or unit == "TB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+class DiskUsageAnalyzer:
+    """
+    Calcula cuánto ocupa cada carpeta con un recorrido paralelo de os.scandir.
+    Por cada directorio se cachea (en disco) el tamaño de sus archivos directos,
+    sus subcarpetas y sus archivos más grandes, indexado por el mtime del
+    directorio: en la siguiente consulta solo se re-listan las carpetas cuyo
+    contenido cambió. (Un archivo que crece sin que cambie el mtime de su
+    carpeta no se detecta hasta que la carpeta cambie.)
+    """
+
+    def __init__(self, max_workers: int = None, top_n: int = 10):
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 2) * 2)
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._thread = None
+        self._caches = {}
+        self.progress = {"running": False, "root": None, "dirs_done": 0, "bytes": 0, "started_at": None}
+        self.last_report = None
+
+    # ------------------------------------------------------------- caché
+    def _cache_file(self, root: str):
+        digest = hashlib.sha1(root.encode("utf-8")).hexdigest()[:12]
+        return get_cache_dir() / f"disk_usage_{digest}.json"
+
+    def _load_cache(self, root: str) -> dict:
+        if root in self._caches:
+            return self._caches[root]
+        try:
+            with open(self._cache_file(root), "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        # JSON devuelve listas: los archivos vuelven a ser tuplas (tamaño, ruta) como los recién escaneados
+        for entry in cache.values():
+            entry["files"] = [tuple(f) for f in entry.get("files", [])]
+        self._caches[root] = cache
+        return cache
+
+    def _save_cache(self, root: str, cache: dict):
+        cache_file = self._cache_file(root)
+        tmp_file = f"{cache_file}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(cache, f, separators=(",", ":"))
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"[DiskUsageAnalyzer] No se pudo guardar la caché: {e}")
+
+    # ---------------------------------------------------------- recorrido
+    def _scan_dir(self, path: str, device: int, cache: dict):
+        """Devuelve (entrada, reutilizada_de_caché) para un directorio"""
+        try:
+            mtime = os.stat(path, follow_symlinks=False).st_mtime_ns
+        except OSError:
+            return None, False
+
+        cached = cache.get(path)
+        if cached and cached["mtime"] == mtime:
+            return cached, True
+
+        own_size = 0
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # No cruzar a otros sistemas de archivos montados
+                            if entry.stat(follow_symlinks=False).st_dev == device:
+                                subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            size = entry.stat(follow_symlinks=False).st_size
+                            own_size += size
+                            files.append((size, entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+        entry = {
+            "mtime": mtime,
+            "own": own_size,
+            "subdirs": subdirs,
+            "files": heapq.nlargest(self.top_n, files)
+        }
+        return entry, False
+
+    def analyze(self, root) -> dict:
+        """Analiza root (bloqueante) y devuelve el informe"""
+        root = os.path.abspath(str(root))
+        start = time.monotonic()
+        cache = self._load_cache(root)
+        try:
+            device = os.stat(root).st_dev
+        except OSError as e:
+            raise FileNotFoundError(f"No se puede analizar {root}: {e}")
+
+        with self._lock:
+            self.progress = {"running": True, "root": root, "dirs_done": 0, "bytes": 0, "started_at": time.time()}
+
+        entries = {}
+        reused = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="disk-usage") as executor:
+            pending = {executor.submit(self._scan_dir, root, device, cache): root}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    entry, from_cache = future.result()
+                    if entry is None:
+                        continue
+                    entries[path] = entry
+                    reused += from_cache
+                    with self._lock:
+                        self.progress["dirs_done"] += 1
+                        self.progress["bytes"] += entry["own"]
+                    for subdir in entry["subdirs"]:
+                        pending[executor.submit(self._scan_dir, subdir, device, cache)] = subdir
+
+        # Totales de cada subárbol, de las hojas hacia arriba
+        totals = {}
+        for path in sorted(entries, key=lambda p: p.count(os.sep), reverse=True):
+            entry = entries[path]
+            totals[path] = entry["own"] + sum(totals.get(subdir, 0) for subdir in entry["subdirs"])
+
+        largest_files = heapq.nlargest(self.top_n, (f for entry in entries.values() for f in entry["files"]))
+        largest_dirs = sorted(((totals[subdir], subdir) for subdir in entries[root]["subdirs"] if subdir in totals),
+                              reverse=True)[:self.top_n]
+
+        # La caché solo guarda lo que sigue existiendo
+        self._caches[root] = entries
+        self._save_cache(root, entries)
+
+        report = {
+            "root": root,
+            "total": totals.get(root, 0),
+            "largest_dirs": largest_dirs,
+            "largest_files": [tuple(f) for f in largest_files],
+            "dirs_scanned": len(entries),
+            "dirs_reused": reused,
+            "elapsed": time.monotonic() - start,
+            "finished_at": time.time()
+        }
+        with self._lock:
+            self.progress["running"] = False
+            self.last_report = report
+        return report
+
+    def start(self, root) -> bool:
+        """Lanza el análisis en segundo plano; False si ya hay uno en curso"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return False
+            self.last_report = None
+            self.progress = {"running": True, "root": os.path.abspath(str(root)), "dirs_done": 0,
+                             "bytes": 0, "started_at": time.time()}
+
+        def run():
+            try:
+                self.analyze(root)
+            except Exception as e:
+                print(f"[DiskUsageAnalyzer] Error analizando {root}: {e}")
+                with self._lock:
+                    self.progress["running"] = False
+
+        self._thread = threading.Thread(target=run, name="disk-usage", daemon=True)
+        self._thread.start()
+        return True
+
+    def wait(self, timeout: float = None) -> bool:
+        """Espera al análisis en curso; True si terminó"""
+        if self._thread:
+            self._thread.join(timeout)
+        return not self.is_running()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def describe_progress(self) -> str:
+        progress = self.progress
+        elapsed = time.time() - (progress["started_at"] or time.time())
+        return (f"⏳ Analizando {progress['root']}: {progress['dirs_done']} carpetas, "
+                f"{format_size(progress['bytes'])} contados ({elapsed:.0f}s)")
+
+    def describe_report(self, report: dict) -> str:
+        lines = [f"💾 {report['root']} ocupa {format_size(report['total'])}"]
+        if report["largest_dirs"]:
+            lines.append("📂 Carpetas que más ocupan:")
+            for size, path in report["largest_dirs"][:5]:
+                lines.append(f"   {format_size(size):>9}  {os.path.basename(path)}")
+        if report["largest_files"]:
+            lines.append("📄 Archivos más grandes:")
+            for size, path in report["largest_files"][:5]:
+                lines.append(f"   {format_size(size):>9}  {path}")
+        lines.append(f"⏱️ {report['dirs_scanned']} carpetas en {report['elapsed']:.1f}s "
+                     f"({report['dirs_reused']} sin cambios desde la última vez)")
+        return "\n".join(lines)
@@ -0,0 +1,171 @@
+# [file name]: src/system/duplicate_finder.py
+import os
+import mmap
+import heapq
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from .dir_walker import DirectoryWalker
+
+
+BLOCK_SIZE = 64 * 1024
+
+
+def _hash_view(data) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def partial_hash(path: str, size: int):
+    """Hash del primer y el último bloque (o del archivo entero si es pequeño)"""
+    try:
+        with open(path, "rb") as f:
+            if size <= 2 * BLOCK_SIZE:
+                return path, _hash_view(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest = hashlib.blake2b(digest_size=20)
+                digest.update(mm[:BLOCK_SIZE])
+                digest.update(mm[-BLOCK_SIZE:])
+                return path, digest.hexdigest()
+    except (OSError, ValueError):
+        return path, None
+
+
+def full_hash(path: str):
+    """Hash del archivo completo leyendo vía mmap"""
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return path, _hash_view(mm)
+    except (OSError, ValueError):
+        return path, None
+
+
+class DuplicateFinder:
+    """
+    Busca archivos duplicados en tres etapas, cada una más cara que la anterior:
+    agrupar por tamaño (gratis, lo da el recorrido), hash del primer y último
+    bloque, y hash completo solo de los que siguen empatados. Los hashes se
+    calculan en un pool de procesos con lecturas vía mmap.
+    """
+
+    def __init__(self, walker: DirectoryWalker = None, max_workers: int = None, min_size: int = 1):
+        self.walker = walker or DirectoryWalker()
+        self.max_workers = max_workers or min(8, os.cpu_count() or 2)
+        self.min_size = min_size
+        self.last_stats = {}
+
+    def _collect_by_size(self, root, time_budget: float) -> dict:
+        """Etapa 1: archivos agrupados por tamaño (sin repetir hardlinks)"""
+        seen_inodes = set()
+        seen_lock = threading.Lock()
+
+        def is_regular_file(entry) -> bool:
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    return False
+                # El recorrido cruza puntos de montaje: un inodo solo es único dentro de su dispositivo.
+                # (El stat queda cacheado en la entrada y el walker lo reutiliza para el tamaño.)
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                return False
+            key = (stat.st_dev, stat.st_ino)
+            # match() se llama desde los hilos del walker
+            with seen_lock:
+                if key in seen_inodes:
+                    return False
+                seen_inodes.add(key)
+            return True
+
+        by_size = defaultdict(list)
+        for info in self.walker.walk(root, is_regular_file, include_files=True, time_budget=time_budget):
+            if info["size"] >= self.min_size:
+                by_size[info["size"]].append(info["path"])
+        self.last_stats["files_seen"] = len(seen_inodes)
+        if self.walker.last_stats.get("reason") == "time_budget":
+            self.last_stats["reason"] = "time_budget"
+        return {size: paths for size, paths in by_size.items() if len(paths) > 1}
+
+    def _refine(self, executor, groups: list, hasher) -> list:
+        """Parte cada grupo (tamaño, rutas) según el hash que devuelve hasher"""
+        jobs = [(path, size) for size, paths in groups for path in paths]
+        if not jobs:
+            return []
+        paths, sizes = zip(*jobs)
+        if hasher is partial_hash:
+            results = executor.map(hasher, paths, sizes, chunksize=16)
+        else:
+            results = executor.map(hasher, paths, chunksize=4)
+
+        digests = dict(results)
+        refined = []
+        for size, group_paths in groups:
+            by_digest = defaultdict(list)
+            for path in group_paths:
+                if digests.get(path):
+                    by_digest[digests[path]].append(path)
+            refined.extend((size, same, digest) for digest, same in by_digest.items() if len(same) > 1)
+        return refined
+
+    def find(self, root, time_budget: float = 10.0):
+        """
+        Generador de grupos de duplicados, del que más espacio desperdicia al que menos.
+        Cada grupo: {"size", "paths", "wasted", "hash"}. time_budget limita la
+        búsqueda entera: pasado el plazo no se empieza el hash completo de otro
+        grupo (los que quedan se cuentan en last_stats["unchecked_groups"]).
+        """
+        start = time.monotonic()
+        deadline = start + time_budget
+        self.last_stats = {"files_seen": 0, "partial_hashed": 0, "full_hashed": 0, "unchecked_groups": 0,
+                           "groups": 0, "wasted": 0, "elapsed": 0.0, "reason": "completed"}
+        by_size = self._collect_by_size(root, time_budget)
+        self.last_stats["size_candidates"] = sum(len(paths) for paths in by_size.values())
+        if not by_size:
+            self.last_stats["elapsed"] = time.monotonic() - start
+            return
+
+        # Lo que más podría desperdiciar se procesa primero
+        size_groups = sorted(by_size.items(), key=lambda item: item[0] * (len(item[1]) - 1), reverse=True)
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                partial = self._refine(executor, size_groups, partial_hash)
+                self.last_stats["partial_hashed"] = self.last_stats["size_candidates"]
+
+                # Los archivos pequeños ya se hashearon enteros en la etapa 2
+                confirmed = [(size, paths, digest) for size, paths, digest in partial if size <= 2 * BLOCK_SIZE]
+                pending = [(size, paths) for size, paths, _ in partial if size > 2 * BLOCK_SIZE]
+                pending.sort(key=lambda item: item[0] * (len(item[1]) - 1), reverse=True)
+
+                ready = []     # heap por desperdicio (negativo)
+                for size, paths, digest in confirmed:
+                    heapq.heappush(ready, (-size * (len(paths) - 1), size, paths, digest))
+
+                # Etapa 3 por grupos: un grupo confirmado se entrega en cuanto ninguno
+                # de los pendientes puede llegar a desperdiciar más que él
+                for index, group in enumerate(pending):
+                    # Hashear enteros varios vídeos o ISOs del mismo tamaño lleva minutos
+                    if time.monotonic() >= deadline:
+                        self.last_stats["reason"] = "time_budget"
+                        self.last_stats["unchecked_groups"] = len(pending) - index
+                        break
+                    self.last_stats["full_hashed"] += len(group[1])
+                    for size, paths, digest in self._refine(executor, [group], full_hash):
+                        heapq.heappush(ready, (-size * (len(paths) - 1), size, paths, digest))
+                    next_potential = 0
+                    if index + 1 < len(pending):
+                        next_size, next_paths = pending[index + 1]
+                        next_potential = next_size * (len(next_paths) - 1)
+                    while ready and -ready[0][0] >= next_potential:
+                        yield self._emit(heapq.heappop(ready))
+
+                while ready:
+                    yield self._emit(heapq.heappop(ready))
+        finally:
+            self.last_stats["elapsed"] = time.monotonic() - start
+
+    def _emit(self, item) -> dict:
+        wasted, size, paths, digest = item
+        self.last_stats["groups"] += 1
+        self.last_stats["wasted"] += -wasted
+        return {"size": size, "paths": sorted(paths), "wasted": -wasted, "hash": digest}
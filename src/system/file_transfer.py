@@ -0,0 +1,377 @@
+# [file name]: src/system/file_transfer.py
+import os
+import errno
+import shutil
+import threading
+import time
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from .disk_usage import format_size
+
+
+class TransferCancelled(Exception):
+    """La transferencia se canceló a petición del usuario"""
+
+
+class Transfer:
+    """Estado de una copia o movimiento en curso"""
+
+    def __init__(self, transfer_id: int, kind: str, sources: list, destination: str):
+        self.id = transfer_id
+        self.kind = kind
+        self.sources = sources
+        self.destination = destination
+        self.status = "planning"
+        self.error = None
+        self.total_bytes = 0
+        self.done_bytes = 0
+        self.files_total = 0
+        self.files_done = 0
+        self.renamed = 0
+        self.methods = {}
+        self.note = None
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    @property
+    def running(self) -> bool:
+        return not self.done_event.is_set()
+
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def add_bytes(self, count: int):
+        with self._lock:
+            self.done_bytes += count
+
+    def file_done(self, method: str):
+        with self._lock:
+            self.files_done += 1
+            self.methods[method] = self.methods.get(method, 0) + 1
+
+    def snapshot(self) -> dict:
+        elapsed = self.elapsed()
+        rate = self.done_bytes / elapsed if elapsed > 0 else 0.0
+        remaining = self.total_bytes - self.done_bytes
+        return {
+            "id": self.id, "kind": self.kind, "status": self.status,
+            "done_bytes": self.done_bytes, "total_bytes": self.total_bytes,
+            "files_done": self.files_done, "files_total": self.files_total,
+            "percent": 100.0 * self.done_bytes / self.total_bytes if self.total_bytes else 100.0,
+            "rate": rate, "eta": remaining / rate if rate > 0 and remaining > 0 else None,
+            "elapsed": elapsed
+        }
+
+
+class FileTransferManager:
+    """
+    Copia y mueve archivos y carpetas en segundo plano.
+    Mover dentro del mismo dispositivo es un os.rename; entre dispositivos y
+    al copiar se usa os.copy_file_range (copia en el kernel, sin pasar por
+    Python), con sendfile y lectura/escritura como alternativas. Los árboles
+    de carpetas se copian con un pool de hilos. Los eventos de progreso se
+    envían a los listeners registrados y cada transferencia se puede cancelar.
+    """
+
+    CHUNK_SIZE = 8 * 1024 * 1024
+    PROGRESS_INTERVAL = 0.5
+    COPY_METHODS = ("copy_file_range", "sendfile", "read_write")
+    KIND_NAMES = {"copy": ("Copia", "a"), "move": ("Movimiento", "o"),
+                  "compress": ("Compresión", "a"), "extract": ("Extracción", "a")}
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or min(8, os.cpu_count() or 2)
+        self.transfers = {}
+        self.listeners = [self._print_progress]
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # Métodos que el sistema no soporta, para no volver a intentarlos
+        self._unsupported = set()
+        if not hasattr(os, "copy_file_range"):
+            self._unsupported.add("copy_file_range")
+        if not hasattr(os, "sendfile"):
+            self._unsupported.add("sendfile")
+
+    # ------------------------------------------------------------ eventos
+    def add_listener(self, listener):
+        """listener(event) recibe un dict con el progreso (ver Transfer.snapshot)"""
+        self.listeners.append(listener)
+
+    def _print_progress(self, event: dict):
+        print(f"[FileTransfer] #{event['id']} {event['status']}: {event['percent']:.0f}% "
+              f"({format_size(event['done_bytes'])} de {format_size(event['total_bytes'])}, "
+              f"{event['files_done']}/{event['files_total']} archivos, {format_size(event['rate'])}/s)")
+
+    def _emit(self, transfer: Transfer):
+        event = transfer.snapshot()
+        for listener in list(self.listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"[FileTransfer] Error en listener de progreso: {e}")
+
+    def _progress_loop(self, transfer: Transfer):
+        while not transfer.done_event.wait(self.PROGRESS_INTERVAL):
+            if transfer.status == "running":
+                self._emit(transfer)
+
+    # ----------------------------------------------------------- copiado
+    def _copy_range(self, fin: int, fout: int, offset: int, count: int) -> int:
+        return os.copy_file_range(fin, fout, count, offset, offset)
+
+    def _sendfile(self, fin: int, fout: int, offset: int, count: int) -> int:
+        os.lseek(fout, offset, os.SEEK_SET)
+        return os.sendfile(fout, fin, offset, count)
+
+    def _read_write(self, fin: int, fout: int, offset: int, count: int) -> int:
+        data = os.pread(fin, count, offset)
+        return os.pwrite(fout, data, offset) if data else 0
+
+    def copy_file(self, src: str, dst: str, transfer: Transfer):
+        """Copia un archivo por bloques comprobando la cancelación entre bloque y bloque"""
+        copiers = {"copy_file_range": self._copy_range, "sendfile": self._sendfile, "read_write": self._read_write}
+        methods = [m for m in self.COPY_METHODS if m not in self._unsupported]
+        fin = os.open(src, os.O_RDONLY)
+        try:
+            size = os.fstat(fin).st_size
+            fout = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except BaseException:
+            os.close(fin)
+            raise
+        try:
+            offset = 0
+            while offset < size:
+                if transfer.cancelled:
+                    raise TransferCancelled()
+                count = min(self.CHUNK_SIZE, size - offset)
+                try:
+                    copied = copiers[methods[0]](fin, fout, offset, count)
+                except OSError as e:
+                    # EXDEV/ENOSYS/EINVAL...: este método no sirve aquí, probar el siguiente
+                    if len(methods) == 1 or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL,
+                                                            errno.EOPNOTSUPP, errno.EBADF):
+                        raise
+                    if e.errno == errno.ENOSYS:
+                        self._unsupported.add(methods[0])
+                    methods.pop(0)
+                    continue
+                if copied == 0:
+                    break
+                offset += copied
+                transfer.add_bytes(copied)
+        except BaseException:
+            # Nunca dejar a medias un archivo que hemos creado nosotros
+            os.close(fout)
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+            raise
+        else:
+            os.close(fout)
+        finally:
+            os.close(fin)
+        shutil.copystat(src, dst, follow_symlinks=False)
+        transfer.file_done(methods[0])
+
+    def _plan_tree(self, src: str, dst: str, transfer: Transfer):
+        """Lista carpetas, archivos y enlaces de un árbol y suma los bytes a copiar"""
+        dirs, files, links = [(src, dst)], [], []
+        for root, dirnames, filenames in os.walk(src):
+            target_root = os.path.join(dst, os.path.relpath(root, src))
+            for name in dirnames:
+                path = os.path.join(root, name)
+                if os.path.islink(path):
+                    links.append((path, os.path.join(target_root, name)))
+                else:
+                    dirs.append((path, os.path.join(target_root, name)))
+            for name in filenames:
+                path = os.path.join(root, name)
+                if os.path.islink(path):
+                    links.append((path, os.path.join(target_root, name)))
+                    continue
+                try:
+                    transfer.total_bytes += os.stat(path, follow_symlinks=False).st_size
+                except OSError:
+                    continue
+                files.append((path, os.path.join(target_root, name)))
+        transfer.files_total += len(files)
+        return dirs, files, links
+
+    def _copy_tree(self, plan, transfer: Transfer):
+        dirs, files, links = plan
+        root_target = dirs[0][1]
+        created_root = not os.path.lexists(root_target)
+        try:
+            for _, target in dirs:
+                os.makedirs(target, exist_ok=True)
+            for src, target in links:
+                os.symlink(os.readlink(src), target)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="file-transfer") as executor:
+                futures = [executor.submit(self.copy_file, src, target, transfer) for src, target in files]
+                errors = []
+                for future in futures:
+                    try:
+                        future.result()
+                    except TransferCancelled:
+                        pass
+                    except OSError as e:
+                        errors.append(e)
+                        transfer.cancel_event.set()
+            if transfer.cancelled and not errors:
+                raise TransferCancelled()
+            if errors:
+                raise errors[0]
+        except BaseException:
+            # Como copy_file con un archivo: un árbol creado por nosotros no se deja a medias
+            # (si no, reintentar fallaría siempre con "Ya existe")
+            if created_root:
+                shutil.rmtree(root_target, ignore_errors=True)
+            raise
+
+        # Fechas de las carpetas al final: copiar dentro las habría cambiado
+        for src, target in reversed(dirs):
+            shutil.copystat(src, target)
+
+    def _same_device(self, src: str, destination: str) -> bool:
+        try:
+            return os.stat(src, follow_symlinks=False).st_dev == os.stat(destination).st_dev
+        except OSError:
+            return False
+
+    def _copy_or_move(self, transfer: Transfer):
+        targets = []
+        for src in transfer.sources:
+            target = os.path.join(transfer.destination, os.path.basename(src.rstrip(os.sep)))
+            if os.path.lexists(target):
+                raise FileExistsError(f"Ya existe {target}")
+            if os.path.isdir(src) and (target + os.sep).startswith(src.rstrip(os.sep) + os.sep):
+                raise ValueError(f"No se puede copiar {src} dentro de sí misma")
+            targets.append((src, target))
+
+        # Planificar todo primero para conocer el total
+        plans = {}
+        for src, target in targets:
+            if transfer.kind == "move" and self._same_device(src, transfer.destination):
+                continue
+            if os.path.isdir(src) and not os.path.islink(src):
+                plans[src] = self._plan_tree(src, target, transfer)
+            else:
+                transfer.total_bytes += os.stat(src, follow_symlinks=False).st_size
+                transfer.files_total += 1
+        transfer.status = "running"
+        self._emit(transfer)
+
+        copied = []     # destinos ya completos de una copia
+        try:
+            for src, target in targets:
+                if transfer.cancelled:
+                    raise TransferCancelled()
+                if src not in plans and transfer.kind == "move" and self._same_device(src, transfer.destination):
+                    os.rename(src, target)
+                    transfer.renamed += 1
+                    continue
+                if src in plans:
+                    self._copy_tree(plans[src], transfer)
+                elif os.path.islink(src):
+                    os.symlink(os.readlink(src), target)
+                else:
+                    self.copy_file(src, target, transfer)
+                # Al mover entre dispositivos el origen se borra solo cuando su copia está completa
+                if transfer.kind == "move":
+                    if src in plans:
+                        shutil.rmtree(src)
+                    else:
+                        os.remove(src)
+                else:
+                    copied.append(target)
+        except BaseException:
+            # Una copia cancelada o fallida no deja nada en el destino; al mover, lo ya
+            # movido se queda (su origen ya no existe)
+            for target in copied:
+                if os.path.isdir(target) and not os.path.islink(target):
+                    shutil.rmtree(target, ignore_errors=True)
+                else:
+                    try:
+                        os.remove(target)
+                    except OSError:
+                        pass
+            raise
+
+    def _execute(self, transfer: Transfer, work):
+        try:
+            work(transfer)
+            transfer.status = "done"
+        except TransferCancelled:
+            transfer.status = "cancelled"
+        except Exception as e:
+            transfer.status = "error"
+            transfer.error = str(e)
+            print(f"[FileTransfer] #{transfer.id} falló: {e}")
+        finally:
+            transfer.finished_at = time.monotonic()
+            transfer.done_event.set()
+            self._emit(transfer)
+
+    # ---------------------------------------------------------------- API
+    def start(self, kind: str, sources: list, destination) -> Transfer:
+        """Lanza una copia ('copy') o un movimiento ('move') en segundo plano"""
+        if kind not in ("copy", "move"):
+            raise ValueError(f"Tipo de transferencia desconocido: {kind}")
+        return self.launch(kind, sources, destination, self._copy_or_move)
+
+    def launch(self, kind: str, sources: list, destination, work) -> Transfer:
+        """
+        Ejecuta work(transfer) en segundo plano con el mismo seguimiento que las copias
+        (progreso, cancelación, estado). work pone status="running" cuando conoce el total.
+        """
+        transfer = Transfer(next(self._ids), kind, [str(s) for s in sources], str(destination))
+        with self._lock:
+            self.transfers[transfer.id] = transfer
+        threading.Thread(target=self._execute, args=(transfer, work), name=f"transfer-{transfer.id}",
+                         daemon=True).start()
+        threading.Thread(target=self._progress_loop, args=(transfer,), name=f"transfer-progress-{transfer.id}",
+                         daemon=True).start()
+        return transfer
+
+    def active(self) -> list:
+        with self._lock:
+            return [t for t in self.transfers.values() if t.running]
+
+    def cancel(self, transfer_id: int = None) -> list:
+        """Cancela una transferencia (o todas las activas); devuelve las canceladas"""
+        cancelled = [t for t in self.active() if transfer_id is None or t.id == transfer_id]
+        for transfer in cancelled:
+            transfer.cancel_event.set()
+        return cancelled
+
+    def describe(self, transfer: Transfer) -> str:
+        event = transfer.snapshot()
+        verb, ending = self.KIND_NAMES.get(transfer.kind, (transfer.kind, "o"))
+        names = ", ".join(os.path.basename(s.rstrip(os.sep)) for s in transfer.sources)
+        throughput = f"{format_size(event['rate'])}/s" if event["done_bytes"] else ""
+        if transfer.status == "done":
+            details = f"{event['files_done']} archivos, {format_size(event['done_bytes'])}"
+            if transfer.renamed:
+                details = f"{transfer.renamed} elementos renombrados sin copiar datos" + (
+                    f" y {details}" if event["files_done"] else "")
+            if transfer.note:
+                details = f"{details}, {transfer.note}"
+            return (f"✅ {verb} de {names} a {transfer.destination} terminad{ending}: {details} "
+                    f"en {event['elapsed']:.1f}s{' (' + throughput + ')' if throughput else ''}")
+        if transfer.status == "cancelled":
+            return (f"⚠️ {verb} de {names} cancelad{ending}: {event['files_done']} de {event['files_total']} "
+                    f"archivos completados ({format_size(event['done_bytes'])})")
+        if transfer.status == "error":
+            return f"❌ {verb} de {names} falló: {transfer.error}"
+        eta = f", faltan ~{event['eta']:.0f}s" if event["eta"] else ""
+        return (f"⏳ {verb} de {names}: {event['percent']:.0f}% ({format_size(event['done_bytes'])} de "
+                f"{format_size(event['total_bytes'])}{', ' + throughput if throughput else ''}{eta})")
@@ -0,0 +1,184 @@
+# [file name]: src/system/folder_stats.py
+import os
+import json
+import hashlib
+import threading
+import time
+from pathlib import Path
+from .storage_paths import get_cache_dir
+from .dir_walker import DirectoryWalker
+
+
+class FolderStats:
+    """
+    Estadísticas de dónde se guardan los archivos de cada extensión, con
+    frecencia decaída. Se alimenta de dos fuentes: dónde viven ya los archivos
+    en la carpeta base (recorrido en segundo plano, pesan poco) y dónde decide
+    guardarlos el usuario (pesan más). Las puntuaciones se guardan referidas a
+    una época fija, así el orden no cambia con el paso del tiempo y el ranking
+    de cada extensión se recalcula solo cuando esa extensión recibe datos:
+    sugerir es una consulta O(1) a una lista ya ordenada.
+    """
+
+    HALF_LIFE = 30 * 24 * 3600      # un mes
+    OBSERVED_WEIGHT = 0.2           # un archivo existente frente a una elección del usuario
+    CHOICE_WEIGHT = 1.0
+    MAX_FOLDERS_PER_EXT = 20
+    FOLDER_DEPTH = 2                # "Documentos/Facturas", no rutas internas de proyectos
+    RESCAN_INTERVAL = 24 * 3600
+    SCAN_TIME_BUDGET = 20.0
+
+    def __init__(self, base_path, stats_file=None, walker: DirectoryWalker = None):
+        self.base_path = Path(base_path)
+        digest = hashlib.sha1(str(self.base_path).encode("utf-8")).hexdigest()[:12]
+        self.stats_file = stats_file or get_cache_dir() / f"folder_stats_{digest}.json"
+        self.walker = walker or DirectoryWalker()
+        self._lock = threading.Lock()
+        self._scan_thread = None
+
+        data = self._load()
+        self.epoch = data.get("epoch", time.time())
+        self.scanned_at = data.get("scanned_at", 0.0)
+        self.observed = data.get("observed", {})   # ext -> {carpeta: puntuación}
+        self.chosen = data.get("chosen", {})       # ext -> {carpeta: puntuación}
+        self.rankings = {}                         # ext -> [carpetas ordenadas]
+        for ext in set(self.observed) | set(self.chosen):
+            self._rerank(ext)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.stats_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"[FolderStats] No se pudo cargar {self.stats_file}: {e}")
+            return {}
+
+    def _save(self):
+        data = {"epoch": self.epoch, "scanned_at": self.scanned_at,
+                "observed": self.observed, "chosen": self.chosen}
+        tmp_file = f"{self.stats_file}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_file, self.stats_file)
+        except Exception as e:
+            print(f"[FolderStats] No se pudieron guardar las estadísticas: {e}")
+
+    def _weight(self, timestamp: float) -> float:
+        """Peso de un evento en la escala de la época: duplica cada HALF_LIFE"""
+        return 2.0 ** ((timestamp - self.epoch) / self.HALF_LIFE)
+
+    def _folder_key(self, folder) -> str:
+        """Carpeta relativa a la base, recortada a FOLDER_DEPTH niveles (None si está fuera)"""
+        try:
+            relative = Path(folder).relative_to(self.base_path)
+        except ValueError:
+            return None
+        parts = relative.parts[:self.FOLDER_DEPTH]
+        return "/".join(parts) if parts else None
+
+    @staticmethod
+    def extension_of(file_name: str) -> str:
+        return os.path.splitext(file_name)[1].lower()
+
+    def _rerank(self, ext: str):
+        """Recalcula el ranking de una extensión (solo cuando recibe datos nuevos)"""
+        combined = dict(self.observed.get(ext, {}))
+        for folder, score in self.chosen.get(ext, {}).items():
+            combined[folder] = combined.get(folder, 0.0) + score
+        ranked = sorted(combined, key=combined.get, reverse=True)[:self.MAX_FOLDERS_PER_EXT]
+        self.rankings[ext] = ranked
+
+    def _trim(self, table: dict):
+        """Limita las carpetas por extensión quedándose con las de más peso"""
+        if len(table) > self.MAX_FOLDERS_PER_EXT * 2:
+            for folder in sorted(table, key=table.get)[:len(table) - self.MAX_FOLDERS_PER_EXT * 2]:
+                del table[folder]
+
+    def record_choice(self, file_name: str, folder):
+        """El usuario guardó file_name en folder"""
+        ext = self.extension_of(file_name)
+        key = self._folder_key(folder)
+        if not ext or not key:
+            return
+        with self._lock:
+            table = self.chosen.setdefault(ext, {})
+            table[key] = table.get(key, 0.0) + self.CHOICE_WEIGHT * self._weight(time.time())
+            self._trim(table)
+            self._rerank(ext)
+            self._save()
+        print(f"[FolderStats] Elección registrada: {ext} -> {key}")
+
+    def suggest(self, file_name: str, limit: int = 3) -> list:
+        """Carpetas más probables para el archivo, ya ordenadas"""
+        return self.rankings.get(self.extension_of(file_name), [])[:limit]
+
+    # ----------------------------------------------------- recorrido base
+    def needs_scan(self) -> bool:
+        return time.time() - self.scanned_at > self.RESCAN_INTERVAL
+
+    def scan(self):
+        """Recalcula la parte observada a partir de los archivos existentes"""
+        start = time.monotonic()
+        observed = {}
+
+        def is_file(entry) -> bool:
+            try:
+                return entry.is_file(follow_symlinks=False) and "." in entry.name[1:]
+            except OSError:
+                return False
+
+        for info in self.walker.walk(self.base_path, is_file, include_files=True, time_budget=self.SCAN_TIME_BUDGET):
+            key = self._folder_key(info["parent"])
+            if not key:
+                continue
+            # Cada archivo cuenta como un uso en la fecha en que se modificó
+            table = observed.setdefault(self.extension_of(info["name"]), {})
+            table[key] = table.get(key, 0.0) + self.OBSERVED_WEIGHT * self._weight(info["mtime"])
+
+        with self._lock:
+            for table in observed.values():
+                self._trim(table)
+            previous = set(self.observed)
+            self.observed = observed
+            self.scanned_at = time.time()
+            for ext in previous | set(observed):
+                self._rerank(ext)
+            self._save()
+        print(f"[FolderStats] {len(observed)} extensiones aprendidas en {time.monotonic() - start:.1f}s "
+              f"({self.walker.describe_stats()})")
+
+    def start_scan(self, force: bool = False) -> bool:
+        """Lanza el recorrido en segundo plano si toca (o si force)"""
+        if not (force or self.needs_scan()):
+            return False
+        if self._scan_thread and self._scan_thread.is_alive():
+            return False
+
+        def run():
+            try:
+                self.scan()
+            except Exception as e:
+                print(f"[FolderStats] Error recorriendo {self.base_path}: {e}")
+
+        self._scan_thread = threading.Thread(target=run, name="folder-stats-scan", daemon=True)
+        self._scan_thread.start()
+        return True
+
+
+_shared_stats = {}
+_shared_lock = threading.Lock()
+
+
+def get_folder_stats(base_path) -> FolderStats:
+    """Estadísticas compartidas por carpeta base; el recorrido se lanza la primera vez"""
+    key = str(Path(base_path))
+    with _shared_lock:
+        stats = _shared_stats.get(key)
+        if stats is None:
+            stats = FolderStats(key)
+            _shared_stats[key] = stats
+            stats.start_scan()
+        return stats
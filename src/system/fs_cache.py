@@ -0,0 +1,142 @@
+# [file name]: src/system/fs_cache.py
+import os
+import stat
+import threading
+import time
+from . import inotify_watcher as inotify
+
+
+class FsMetadataCache:
+    """
+    Caché compartida de metadatos de ficheros (exists / is_dir / mtime).
+    Las entradas caducan por TTL y, si hay inotify, se invalidan en cuanto
+    cambia el directorio que las contiene. Cuenta las llamadas al sistema
+    ahorradas por petición.
+    """
+
+    MAX_ENTRIES = 4096
+    UNWATCHED_TTL = 2.0
+    WATCH_MASK = inotify.DIR_CHANGES | inotify.IN_ATTRIB | inotify.IN_ONLYDIR
+
+    def __init__(self, ttl: float = None):
+        self._lock = threading.Lock()
+        self._entries = {}          # ruta -> (caduca_en, {"exists", "is_dir", "mtime"})
+        self._watcher = None
+        if inotify.inotify_available():
+            try:
+                self._watcher = inotify.InotifyWatcher(self._on_event, name="fs-cache-watcher")
+                self._watcher.start()
+            except OSError as e:
+                print(f"[FsMetadataCache] inotify no disponible, solo TTL: {e}")
+        # Con inotify el TTL es solo una red de seguridad, pero solo para las
+        # entradas vigiladas: pasado el límite de watches se vuelve al TTL corto
+        self.ttl = ttl if ttl is not None else (30.0 if self._watcher else 2.0)
+        self.unwatched_ttl = min(self.ttl, self.UNWATCHED_TTL)
+        self.totals = {"hits": 0, "misses": 0, "invalidations": 0}
+        self._invalidation_seq = 0
+        self.request = {"hits": 0, "misses": 0}
+
+    def _on_event(self, event: dict):
+        path = event["path"]
+        if not path:
+            return
+        # Cambia la entrada afectada y el mtime del directorio que la contiene
+        self.invalidate(path)
+        if event["name"]:
+            self.invalidate(os.path.dirname(path))
+
+    def _watch(self, directory: str) -> bool:
+        """Vigila el directorio si aún caben watches; True si queda vigilado"""
+        if not self._watcher:
+            return False
+        if self._watcher.is_watched(directory):
+            return True
+        if self._watcher.watch_count < self.MAX_ENTRIES:
+            return self._watcher.add_watch(directory, self.WATCH_MASK) >= 0
+        return False
+
+    def stat(self, path) -> dict:
+        """Metadatos de la ruta (desde la caché si siguen vigentes)"""
+        path = os.path.abspath(str(path))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached and cached[0] > now:
+                self.totals["hits"] += 1
+                self.request["hits"] += 1
+                return cached[1]
+            self.totals["misses"] += 1
+            self.request["misses"] += 1
+            seq = self._invalidation_seq
+
+        try:
+            st = os.stat(path)
+            info = {"exists": True, "is_dir": stat.S_ISDIR(st.st_mode), "mtime": st.st_mtime_ns}
+        except OSError:
+            info = {"exists": False, "is_dir": False, "mtime": None}
+
+        # El padre avisa de altas/bajas; el propio directorio, de cambios en su contenido
+        watched = self._watch(os.path.dirname(path))
+        if info["is_dir"]:
+            watched = self._watch(path) and watched
+        ttl = self.ttl if watched else self.unwatched_ttl
+
+        with self._lock:
+            if seq != self._invalidation_seq:
+                # Hubo cambios mientras hacíamos el stat: no cachear un dato dudoso
+                return info
+            if len(self._entries) >= self.MAX_ENTRIES:
+                # Expulsar la entrada más antigua (orden de inserción)
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[path] = (now + ttl, info)
+        return info
+
+    def exists(self, path) -> bool:
+        return self.stat(path)["exists"]
+
+    def is_dir(self, path) -> bool:
+        return self.stat(path)["is_dir"]
+
+    def mtime(self, path):
+        return self.stat(path)["mtime"]
+
+    def invalidate(self, path=None, ancestors: bool = False):
+        """
+        Olvida una ruta (tras crearla/borrarla nosotros) o toda la caché.
+        Con ancestors=True también sus padres (p.ej. tras mkdir(parents=True)).
+        """
+        with self._lock:
+            self._invalidation_seq += 1
+            if path is None:
+                self._entries.clear()
+                return
+            path = os.path.abspath(str(path))
+            while True:
+                if self._entries.pop(path, None) is not None:
+                    self.totals["invalidations"] += 1
+                parent = os.path.dirname(path)
+                if not ancestors or parent == path:
+                    break
+                path = parent
+
+    def begin_request(self):
+        """Reinicia los contadores de la petición actual"""
+        with self._lock:
+            self.request = {"hits": 0, "misses": 0}
+
+    def request_summary(self) -> str:
+        hits, misses = self.request["hits"], self.request["misses"]
+        return f"{hits} stat ahorrados, {misses} realizados en esta petición (total ahorrados: {self.totals['hits']})"
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_fs_cache() -> FsMetadataCache:
+    """Caché de metadatos compartida por todos los gestores de archivos"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FsMetadataCache()
+        return _shared_cache
@@ -0,0 +1,48 @@
+# [file name]: src/system/ignore_rules.py
+import fnmatch
+from pathlib import Path
+import yaml
+
+
+DEFAULT_CONFIG = "configs/file_search.yaml"
+
+
+class IgnoreRules:
+    """Reglas para descartar carpetas en índices y búsquedas (ocultas, node_modules, venvs...)"""
+
+    def __init__(self, names=None, patterns=None, hidden: bool = True, max_depth: int = 12):
+        self.names = set(names or [])
+        self.patterns = list(patterns or [])
+        self.hidden = hidden
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_config(cls, config_file: str = DEFAULT_CONFIG):
+        """Carga las reglas desde configs/file_search.yaml"""
+        current_dir = Path(__file__).resolve().parent.parent.parent
+        config_path = current_dir / config_file
+        try:
+            config = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+        except Exception as e:
+            print(f"[IgnoreRules] No se pudo cargar {config_path}: {e}")
+            config = {}
+
+        ignore = config.get("ignore", {})
+        return cls(
+            names=ignore.get("names", []),
+            patterns=ignore.get("patterns", []),
+            hidden=ignore.get("hidden", True),
+            max_depth=config.get("max_depth", 12)
+        )
+
+    def should_skip(self, name: str) -> bool:
+        """Indica si una carpeta con este nombre debe omitirse"""
+        if self.hidden and name.startswith("."):
+            return True
+        if name in self.names:
+            return True
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+
+    def key(self) -> str:
+        """Firma de las reglas (para invalidar índices construidos con otras reglas)"""
+        return repr((sorted(self.names), self.patterns, self.hidden, self.max_depth))
@@ -0,0 +1,180 @@
+# [file name]: src/system/inotify_watcher.py
+import os
+import ctypes
+import ctypes.util
+import platform
+import select
+import struct
+import threading
+
+# Máscaras de eventos (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+DIR_CHANGES = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+FILE_CHANGES = DIR_CHANGES | IN_CLOSE_WRITE | IN_ATTRIB
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    if platform.system() != "Linux":
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+
+
+def inotify_available() -> bool:
+    return _libc is not None
+
+
+def max_user_watches() -> int:
+    """Límite del kernel de watches por usuario"""
+    try:
+        with open("/proc/sys/fs/inotify/max_user_watches", "r") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return 8192
+
+
+class InotifyWatcher:
+    """
+    Envoltorio mínimo de inotify (vía ctypes) con un hilo lector.
+    Llama a callback(event) con un dict: path, name, mask, cookie, is_dir.
+    Un evento con mask IN_Q_OVERFLOW indica que se perdieron eventos.
+    """
+
+    def __init__(self, callback, name: str = "inotify"):
+        if _libc is None:
+            raise OSError("inotify no está disponible en este sistema")
+        self.callback = callback
+        self.name = name
+        self._fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._lock = threading.Lock()
+        self._wd_paths = {}
+        self._path_wds = {}
+        self._running = False
+        self._thread = None
+
+    @property
+    def watch_count(self) -> int:
+        return len(self._wd_paths)
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """Añade un watch; devuelve el wd o -1 si falló (p.ej. límite de watches)"""
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            return -1
+        with self._lock:
+            self._wd_paths[wd] = path
+            self._path_wds[path] = wd
+        return wd
+
+    def remove_watch(self, path: str):
+        with self._lock:
+            wd = self._path_wds.pop(path, None)
+            if wd is not None:
+                self._wd_paths.pop(wd, None)
+        if wd is not None:
+            _libc.inotify_rm_watch(self._fd, wd)
+
+    def remove_tree(self, path: str):
+        """Quita los watches de un directorio y de todos sus descendientes"""
+        prefix = path.rstrip(os.sep) + os.sep
+        with self._lock:
+            paths = [p for p in self._path_wds if p == path or p.startswith(prefix)]
+        for watched in paths:
+            self.remove_watch(watched)
+
+    def is_watched(self, path: str) -> bool:
+        return path in self._path_wds
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+    def _loop(self):
+        while self._running:
+            try:
+                ready, _, _ = select.select([self._fd], [], [], 1.0)
+                if not ready:
+                    continue
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError:
+                break
+
+            for event in self._parse(data):
+                try:
+                    self.callback(event)
+                except Exception as e:
+                    print(f"[InotifyWatcher] Error procesando evento: {e}")
+
+    def _parse(self, data: bytes):
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_IGNORED:
+                # El kernel retiró el watch (directorio borrado o desmontado)
+                with self._lock:
+                    path = self._wd_paths.pop(wd, None)
+                    if path is not None and self._path_wds.get(path) == wd:
+                        del self._path_wds[path]
+                continue
+
+            with self._lock:
+                parent = self._wd_paths.get(wd)
+            if parent is None and not mask & IN_Q_OVERFLOW:
+                continue
+
+            name = os.fsdecode(raw_name)
+            yield {
+                "path": os.path.join(parent, name) if (parent and name) else parent,
+                "name": name,
+                "mask": mask,
+                "cookie": cookie,
+                "is_dir": bool(mask & IN_ISDIR)
+            }
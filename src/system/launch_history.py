@@ -0,0 +1,163 @@
+# [file name]: src/system/launch_history.py
+import os
+import json
+import threading
+import time
+from .storage_paths import get_cache_dir
+
+
+class LaunchHistory:
+    """
+    Historial compacto de lanzamientos de aplicaciones con frecencia decaída.
+    Por cada aplicación guarda: número de usos, último uso, puntuación de
+    frecencia, tiempo medio de carga (hasta que el proceso deja de mapear
+    bibliotecas nuevas) y los ficheros que mapea (para prewarm).
+    """
+
+    HALF_LIFE = 7 * 24 * 3600  # una semana
+    MAX_PREWARM_FILES = 200
+
+    def __init__(self, history_file=None):
+        self.history_file = history_file or get_cache_dir() / "launch_history.json"
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.history_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"[LaunchHistory] No se pudo cargar {self.history_file}: {e}")
+            return {}
+
+    def _save(self):
+        tmp_file = f"{self.history_file}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_file, self.history_file)
+        except Exception as e:
+            print(f"[LaunchHistory] No se pudo guardar el historial: {e}")
+
+    def _decay(self, elapsed: float) -> float:
+        return 0.5 ** (max(elapsed, 0.0) / self.HALF_LIFE)
+
+    def record_launch(self, name: str, executable: str):
+        """Registra un uso de la aplicación (lanzada o traída al frente)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.setdefault(name, {
+                "executable": executable, "count": 0, "last_used": now,
+                "score": 0.0, "files": []
+            })
+            entry["score"] = entry["score"] * self._decay(now - entry["last_used"]) + 1.0
+            entry["count"] += 1
+            entry["last_used"] = now
+            entry["executable"] = executable
+            self._save()
+
+    def record_load_time(self, name: str, seconds: float, prewarmed: bool):
+        """
+        Media móvil del tiempo de carga, separada según los ficheros estaban
+        precargados o no: así se ve qué aporta el prewarm.
+        """
+        key = "load_ms_warm" if prewarmed else "load_ms_cold"
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+            load_ms = seconds * 1000
+            previous = entry.get(key)
+            entry[key] = load_ms if previous is None else previous * 0.7 + load_ms * 0.3
+            entry["launches"] = entry.get("launches", 0) + 1
+            self._save()
+
+    def record_files(self, name: str, files: list):
+        """Guarda el binario y las bibliotecas que usa la aplicación"""
+        with self._lock:
+            if name in self._entries:
+                self._entries[name]["files"] = files[:self.MAX_PREWARM_FILES]
+                self._save()
+
+    def files(self, name: str) -> list:
+        entry = self._entries.get(name)
+        return list(entry["files"]) if entry else []
+
+    def needs_files(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return entry is not None and not entry["files"]
+
+    def frecency(self, name: str) -> float:
+        entry = self._entries.get(name)
+        if not entry:
+            return 0.0
+        return entry["score"] * self._decay(time.time() - entry["last_used"])
+
+    def top(self, limit: int = 5) -> list:
+        """Aplicaciones ordenadas por frecencia"""
+        with self._lock:
+            names = list(self._entries)
+        ranked = sorted(names, key=self.frecency, reverse=True)[:limit]
+        return [dict(self._entries[name], name=name, frecency=self.frecency(name)) for name in ranked]
+
+
+def read_mapped_files(pid: int, proc_path: str = "/proc") -> list:
+    """Lista el ejecutable y las bibliotecas mapeadas por un proceso"""
+    files = []
+    try:
+        with open(os.path.join(proc_path, str(pid), "maps"), "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                fields = line.split(None, 5)
+                if len(fields) == 6:
+                    path = fields[5].strip()
+                    if path.startswith("/") and path not in files and not path.startswith(("/dev/", "/memfd:")):
+                        files.append(path)
+    except OSError:
+        pass
+    return files
+
+
+def wait_until_loaded(pid: int, started: float, timeout: float = 20.0, settle: float = 0.5,
+                      poll: float = 0.05, proc_path: str = "/proc"):
+    """
+    Espera a que el proceso termine de cargar: el momento en que /proc/<pid>/maps
+    deja de crecer durante `settle` segundos (el cargador dinámico y los plugins
+    ya están mapeados). Devuelve (segundos desde started, ficheros mapeados),
+    o (None, ficheros) si el proceso terminó o no se estabilizó a tiempo.
+    """
+    last_count, last_change = -1, started
+    files = []
+    deadline = started + timeout
+    while time.perf_counter() < deadline:
+        if not os.path.exists(os.path.join(proc_path, str(pid))):
+            return None, files
+        current = read_mapped_files(pid, proc_path)
+        now = time.perf_counter()
+        if len(current) != last_count:
+            last_count, last_change, files = len(current), now, current
+        elif current and now - last_change >= settle:
+            return last_change - started, files
+        time.sleep(poll)
+    return None, files
+
+
+def prewarm_files(files: list) -> int:
+    """Pide al kernel que cargue los ficheros en la page cache; devuelve los bytes solicitados"""
+    if not hasattr(os, "posix_fadvise"):
+        return 0
+    requested = 0
+    for path in files:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            requested += os.fstat(fd).st_size
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    return requested
@@ -0,0 +1,160 @@
+# [file name]: src/system/path_index.py
+import os
+import bisect
+import platform
+import threading
+import time
+
+
+class PathIndex:
+    """
+    Índice en memoria de los ejecutables del PATH.
+    Se construye una sola vez y solo vuelve a escanear los directorios
+    cuyo mtime haya cambiado (o si cambia la variable PATH).
+    """
+
+    def __init__(self, path_env: str = None, check_interval: float = 2.0):
+        self.system = platform.system()
+        self.check_interval = check_interval
+        self._path_env = path_env
+        self._lock = threading.Lock()
+        self._dirs = []
+        self._dir_mtimes = {}     # directorio -> st_mtime_ns del último escaneo
+        self._dir_entries = {}    # directorio -> {nombre: ruta completa}
+        self._executables = {}    # nombre -> ruta completa (gana el primero del PATH)
+        self._sorted_names = []
+        self._last_check = 0.0
+        self._pathext = self._load_pathext()
+
+    def _load_pathext(self):
+        """Extensiones ejecutables en Windows"""
+        if self.system != "Windows":
+            return []
+        return [ext.lower() for ext in os.environ.get("PATHEXT", ".EXE;.COM;.BAT;.CMD").split(os.pathsep) if ext]
+
+    def _normalize(self, name: str) -> str:
+        return name.lower() if self.system == "Windows" else name
+
+    def _current_dirs(self):
+        path_env = self._path_env if self._path_env is not None else os.environ.get("PATH", os.defpath)
+        dirs = []
+        for directory in path_env.split(os.pathsep):
+            if directory and directory not in dirs:
+                dirs.append(directory)
+        return dirs
+
+    def _scan_dir(self, directory: str) -> dict:
+        """Lista los ejecutables de un directorio del PATH"""
+        entries = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    if self.system == "Windows":
+                        if os.path.splitext(entry.name)[1].lower() not in self._pathext:
+                            continue
+                    elif not os.access(entry.path, os.X_OK):
+                        continue
+                    entries[self._normalize(entry.name)] = entry.path
+        except OSError:
+            pass
+        return entries
+
+    def _dir_mtime(self, directory: str):
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _rebuild_merged(self):
+        merged = {}
+        for directory in self._dirs:
+            for name, full_path in self._dir_entries.get(directory, {}).items():
+                merged.setdefault(name, full_path)
+        self._executables = merged
+        self._sorted_names = sorted(merged)
+
+    def refresh(self, force: bool = False):
+        """Re-escanea solo los directorios del PATH que cambiaron"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._sorted_names and now - self._last_check < self.check_interval:
+                return
+            self._last_check = now
+
+            dirs = self._current_dirs()
+            changed = dirs != self._dirs
+            for directory in dirs:
+                mtime = self._dir_mtime(directory)
+                if force or directory not in self._dir_entries or self._dir_mtimes.get(directory) != mtime:
+                    self._dir_entries[directory] = self._scan_dir(directory) if mtime is not None else {}
+                    self._dir_mtimes[directory] = mtime
+                    changed = True
+
+            for directory in list(self._dir_entries):
+                if directory not in dirs:
+                    del self._dir_entries[directory]
+                    self._dir_mtimes.pop(directory, None)
+
+            self._dirs = dirs
+            if changed:
+                self._rebuild_merged()
+
+    def which(self, name: str):
+        """Equivalente a shutil.which pero resuelto desde memoria"""
+        if not name:
+            return None
+
+        # Rutas explícitas: se comprueban directamente, igual que shutil.which
+        if os.path.dirname(name):
+            if os.path.isfile(name) and os.access(name, os.X_OK):
+                return name
+            return None
+
+        self.refresh()
+        key = self._normalize(name)
+        full_path = self._executables.get(key)
+        if full_path is None and self.system == "Windows":
+            for ext in self._pathext:
+                full_path = self._executables.get(key + ext)
+                if full_path:
+                    break
+        return full_path
+
+    def exists(self, name: str) -> bool:
+        """Indica si el ejecutable está disponible en el PATH"""
+        return self.which(name) is not None
+
+    def complete(self, prefix: str, limit: int = 10) -> list:
+        """Devuelve los ejecutables del PATH que empiezan por el prefijo"""
+        self.refresh()
+        prefix = self._normalize(prefix)
+        names = self._sorted_names
+        start = bisect.bisect_left(names, prefix)
+        completions = []
+        for name in names[start:]:
+            if not name.startswith(prefix) or len(completions) >= limit:
+                break
+            completions.append(name)
+        return completions
+
+    def __len__(self):
+        self.refresh()
+        return len(self._executables)
+
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+
+def get_path_index() -> PathIndex:
+    """Índice del PATH compartido por todos los gestores de aplicaciones"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = PathIndex()
+        return _shared_index
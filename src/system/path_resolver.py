@@ -0,0 +1,177 @@
+# [file name]: src/system/path_resolver.py
+import os
+import re
+import difflib
+import threading
+from pathlib import Path
+from .directory_index import normalize_name
+from .ignore_rules import IgnoreRules
+from .fs_cache import get_fs_cache
+
+
+# Palabras que el STT suele meter entre nombres de carpeta
+STOPWORDS = {"en", "la", "el", "los", "las", "de", "del", "mi", "mis", "carpeta", "carpetas", "dentro", "a"}
+
+
+def compact_name(name: str) -> str:
+    """Nombre normalizado sin separadores: 'Mis_Documentos' -> 'misdocumentos'"""
+    return re.sub(r"[\W_]+", "", normalize_name(name))
+
+
+class SpokenPathResolver:
+    """
+    Traduce ubicaciones dictadas ("documentos proyectos margarita", "musica",
+    "Documentos/ Proyectos") a la ruta existente que mejor encaja, comparando
+    por tokens sin tildes ni mayúsculas. Las subcarpetas de cada directorio se
+    cachean y solo se vuelven a listar si cambia su mtime.
+    """
+
+    MIN_SIMILARITY = 0.8
+    MAX_TOKENS_PER_NAME = 3
+    SKIP_PENALTY = 0.1
+    # Por debajo de esta confianza no se redirige a un árbol existente: el
+    # llamador pregunta (no encontré) o crea la ruta tal cual se dijo
+    MIN_SCORE = 0.5
+
+    def __init__(self, base_path, rules: IgnoreRules = None):
+        self.base_path = str(Path(base_path))
+        self.rules = rules or IgnoreRules.from_config()
+        self.fs_cache = get_fs_cache()
+        self._lock = threading.Lock()
+        self._children_cache = {}   # ruta -> (mtime_ns, [(nombre, nombre_compacto)])
+
+    def _children(self, path: str) -> list:
+        """Subcarpetas de path (cacheadas mientras no cambie el mtime del directorio)"""
+        mtime = self.fs_cache.mtime(path)
+        if mtime is None:
+            return []
+        with self._lock:
+            cached = self._children_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        children = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir() and not self.rules.should_skip(entry.name):
+                            children.append((entry.name, compact_name(entry.name)))
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+
+        with self._lock:
+            self._children_cache[path] = (mtime, children)
+        return children
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._children_cache.clear()
+            else:
+                self._children_cache.pop(str(path), None)
+
+    def _tokenize(self, location: str):
+        """Devuelve (palabras originales, índice de segmento por palabra, tokens útiles)"""
+        words, segment_of = [], []
+        for segment_index, segment in enumerate(re.split(r"[\\/]+", location)):
+            for word in segment.split():
+                words.append(word)
+                segment_of.append(segment_index)
+
+        tokens = [(compact_name(word), i) for i, word in enumerate(words)
+                  if normalize_name(word) not in STOPWORDS and compact_name(word)]
+        if not tokens:
+            tokens = [(compact_name(word), i) for i, word in enumerate(words) if compact_name(word)]
+        return words, segment_of, tokens
+
+    def _similarity(self, spoken: str, existing: str) -> float:
+        if spoken == existing:
+            return 1.0
+        shorter, longer = sorted((len(spoken), len(existing)))
+        if not longer or shorter / longer < self.MIN_SIMILARITY:
+            return 0.0
+        return difflib.SequenceMatcher(None, spoken, existing).ratio()
+
+    def _search(self, path: str, pos: int, sims: list, skipped: bool, tokens: list, candidates: list):
+        candidates.append((path, pos, sims, skipped))
+        if pos >= len(tokens):
+            return
+
+        children = self._children(path)
+        for k in range(1, self.MAX_TOKENS_PER_NAME + 1):
+            if pos + k > len(tokens):
+                break
+            spoken = "".join(token for token, _ in tokens[pos:pos + k])
+            for name, compact in children:
+                similarity = self._similarity(spoken, compact)
+                if similarity >= self.MIN_SIMILARITY:
+                    self._search(os.path.join(path, name), pos + k, sims + [similarity] * k,
+                                 skipped, tokens, candidates)
+
+        # Se permite saltar un nivel al principio: "proyectos" -> Documentos/Proyectos
+        if pos == 0 and not skipped and path == self.base_path:
+            for name, _ in children:
+                self._search(os.path.join(path, name), 0, sims, True, tokens, candidates)
+
+    def resolve(self, location: str):
+        """
+        Resuelve una ubicación dictada. Devuelve None si nada coincide, o un dict:
+        path (ruta final, existente + lo que falte por crear), existing (parte que ya existe),
+        missing (segmentos a crear), score (0-1) y exact (si la ruta completa existe).
+        """
+        if not location or not location.strip():
+            return None
+
+        literal = Path(location)
+        if not literal.is_absolute():
+            literal = Path(self.base_path) / literal
+        if self.fs_cache.is_dir(literal):
+            return {"path": str(literal), "existing": str(literal), "missing": [], "score": 1.0, "exact": True}
+
+        words, segment_of, tokens = self._tokenize(location)
+        if not tokens:
+            return None
+
+        candidates = []
+        self._search(self.base_path, 0, [], False, tokens, candidates)
+
+        best, best_key = None, None
+        for path, pos, sims, skipped in candidates:
+            if pos == 0:
+                continue
+            quality = sum(sims) / len(sims)
+            score = quality * pos / len(tokens) - (self.SKIP_PENALTY if skipped else 0.0)
+            # Un prefijo exacto desde la carpeta base (solo cambian tildes/mayúsculas) no es
+            # una suposición; cualquier otra coincidencia necesita confianza suficiente
+            literal_prefix = not skipped and min(sims) == 1.0
+            if score < self.MIN_SCORE and not literal_prefix:
+                continue
+            key = (score, -skipped, -path.count(os.sep))
+            if best_key is None or key > best_key:
+                best, best_key = (path, pos, score), key
+
+        if best is None:
+            if candidates:
+                print(f"[SpokenPathResolver] '{location}': ninguna coincidencia con confianza >= {self.MIN_SCORE}")
+            return None
+
+        path, pos, score = best
+        missing = []
+        if pos < len(tokens):
+            # Lo no reconocido se conserva tal cual se dijo, una carpeta por segmento
+            first_word = tokens[pos][1]
+            segments = {}
+            for i in range(first_word, len(words)):
+                segments.setdefault(segment_of[i], []).append(words[i])
+            missing = [" ".join(segment_words) for segment_words in segments.values()]
+
+        return {
+            "path": os.path.join(path, *missing),
+            "existing": path,
+            "missing": missing,
+            "score": round(max(score, 0.0), 3),
+            "exact": not missing
+        }
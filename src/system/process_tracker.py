@@ -0,0 +1,206 @@
+# [file name]: src/system/process_tracker.py
+import os
+import signal
+import threading
+import time
+
+
+class ProcessTracker:
+    """
+    Instantánea incremental de los procesos en ejecución (leída de /proc)
+    más el registro de las aplicaciones que lanzó Margarita.
+    Solo se leen comm/cmdline/stat de los PIDs nuevos en cada refresco.
+    """
+
+    def __init__(self, proc_path: str = "/proc", min_refresh_interval: float = 0.5):
+        self.proc_path = proc_path
+        self.min_refresh_interval = min_refresh_interval
+        self.available = os.path.isdir(proc_path)
+        self._lock = threading.Lock()
+        self._processes = {}   # pid -> {"pid", "ppid", "comm", "cmdline"}
+        self._launched = {}    # pid -> {"name", "executable", "popen", "started_at"}
+        self._last_refresh = 0.0
+
+    def _read_process(self, pid: int):
+        """Lee comm, cmdline y ppid de un proceso; None si ya no existe"""
+        base = os.path.join(self.proc_path, str(pid))
+        try:
+            with open(os.path.join(base, "comm"), "r", encoding="utf-8", errors="replace") as f:
+                comm = f.read().strip()
+            with open(os.path.join(base, "cmdline"), "rb") as f:
+                cmdline = [part.decode("utf-8", "replace") for part in f.read().split(b"\0") if part]
+            with open(os.path.join(base, "stat"), "r", encoding="utf-8", errors="replace") as f:
+                # El campo comm va entre paréntesis y puede contener espacios
+                stat_fields = f.read().rsplit(")", 1)[1].split()
+            ppid = int(stat_fields[1])
+        except (OSError, IndexError, ValueError):
+            return None
+
+        return {"pid": pid, "ppid": ppid, "comm": comm, "cmdline": cmdline}
+
+    def refresh(self, force: bool = False):
+        """Actualiza la instantánea leyendo solo los procesos nuevos"""
+        if not self.available:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._processes and now - self._last_refresh < self.min_refresh_interval:
+                return
+            self._last_refresh = now
+
+            try:
+                current = {int(name) for name in os.listdir(self.proc_path) if name.isdigit()}
+            except OSError:
+                return
+
+            for pid in list(self._processes):
+                if pid not in current:
+                    del self._processes[pid]
+
+            for pid in current - self._processes.keys():
+                info = self._read_process(pid)
+                # Los hilos del kernel no tienen cmdline: no nos interesan
+                if info and info["cmdline"]:
+                    self._processes[pid] = info
+
+            for pid, launch in list(self._launched.items()):
+                if launch["popen"].poll() is not None:
+                    del self._launched[pid]
+
+    def register_launch(self, name: str, executable: str, popen):
+        """Registra un proceso lanzado por Margarita"""
+        with self._lock:
+            self._launched[popen.pid] = {
+                "name": name,
+                "executable": executable,
+                "popen": popen,
+                "started_at": time.time()
+            }
+
+    def _matches(self, info: dict, executable: str) -> bool:
+        exe_name = os.path.basename(executable)
+        if not exe_name:
+            return False
+        # /proc/<pid>/comm se trunca a 15 caracteres
+        if info["comm"] == exe_name[:15]:
+            return True
+        argv0 = info["cmdline"][0]
+        return argv0 == executable or os.path.basename(argv0) == exe_name
+
+    def find(self, executable: str) -> list:
+        """
+        Devuelve los procesos raíz que ejecutan el binario indicado
+        (se descartan los hijos cuyo padre también coincide, p.ej. Electron)
+        """
+        self.refresh()
+        with self._lock:
+            matching = {pid: info for pid, info in self._processes.items() if self._matches(info, executable)}
+            for pid, launch in self._launched.items():
+                if launch["executable"] == executable and pid not in matching and launch["popen"].poll() is None:
+                    matching[pid] = {"pid": pid, "ppid": os.getpid(), "comm": os.path.basename(executable),
+                                     "cmdline": [executable]}
+
+        roots = [info for info in matching.values() if info["ppid"] not in matching]
+        return sorted(roots, key=lambda info: info["pid"])
+
+    def _own_lineage(self) -> set:
+        """PID de Margarita y todos sus antecesores (terminal, sesión...)"""
+        lineage = set()
+        pid = os.getpid()
+        while pid > 1 and pid not in lineage:
+            lineage.add(pid)
+            with self._lock:
+                info = self._processes.get(pid)
+            info = info or self._read_process(pid)
+            if not info:
+                break
+            pid = info["ppid"]
+        return lineage
+
+    def find_closable(self, executable: str) -> list:
+        """
+        Procesos que se pueden cerrar para el binario indicado: nunca Margarita
+        ni sus antecesores ("cierra python") y, si Margarita lanzó alguno, solo esos.
+        """
+        protected = self._own_lineage()
+        roots = [info for info in self.find(executable) if info["pid"] not in protected]
+        ours = [info for info in roots if self.launched_by_us(info["pid"])]
+        return ours or roots
+
+    def is_running(self, executable: str) -> bool:
+        return bool(self.find(executable))
+
+    def launched_by_us(self, pid: int) -> bool:
+        with self._lock:
+            return pid in self._launched
+
+    def terminate(self, pids: list, timeout: float = 3.0) -> list:
+        """Envía SIGTERM (y SIGKILL tras el timeout) a los PIDs; devuelve los que terminaron"""
+        pending = set()
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                pending.add(pid)
+            except ProcessLookupError:
+                continue
+            except PermissionError:
+                print(f"[ProcessTracker] Sin permisos para terminar el proceso {pid}")
+
+        deadline = time.monotonic() + timeout
+        finished = []
+        while pending and time.monotonic() < deadline:
+            for pid in list(pending):
+                if not self._alive(pid):
+                    pending.discard(pid)
+                    finished.append(pid)
+            if pending:
+                time.sleep(0.1)
+
+        killed = []
+        for pid in pending:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                killed.append(pid)
+            except OSError:
+                pass
+        # SIGKILL no es instantáneo (y puede fallar en procesos en espera no interrumpible)
+        deadline = time.monotonic() + 1.0
+        while killed and time.monotonic() < deadline:
+            for pid in list(killed):
+                if not self._alive(pid):
+                    killed.remove(pid)
+                    finished.append(pid)
+            if killed:
+                time.sleep(0.05)
+        for pid in killed:
+            print(f"[ProcessTracker] El proceso {pid} sigue vivo tras SIGKILL")
+
+        self.refresh(force=True)
+        return finished
+
+    def _alive(self, pid: int) -> bool:
+        with self._lock:
+            launch = self._launched.get(pid)
+        if launch:
+            # Recoger al hijo para que no quede como zombi
+            return launch["popen"].poll() is None
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+
+_shared_tracker = None
+_shared_lock = threading.Lock()
+
+
+def get_process_tracker() -> ProcessTracker:
+    """Tracker de procesos compartido por todos los gestores"""
+    global _shared_tracker
+    with _shared_lock:
+        if _shared_tracker is None:
+            _shared_tracker = ProcessTracker()
+        return _shared_tracker
@@ -0,0 +1,19 @@
+# [file name]: src/system/storage_paths.py
+import os
+from pathlib import Path
+
+
+def get_cache_dir() -> Path:
+    """Directorio local donde Margarita guarda índices, historiales y cachés"""
+    base = os.environ.get("XDG_CACHE_HOME")
+    cache_dir = (Path(base) if base else Path.home() / ".cache") / "margarita"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def get_data_dir() -> Path:
+    """Directorio local para datos del usuario que no se pueden regenerar (plantillas, grabaciones)"""
+    base = os.environ.get("XDG_DATA_HOME")
+    data_dir = (Path(base) if base else Path.home() / ".local" / "share") / "margarita"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
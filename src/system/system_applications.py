@@ -3,13 +3,24 @@ import re
 import json
 import subprocess
 import platform
-import shutil
+import shlex
+import threading
+import time
 from pathlib import Path
+from .path_index import get_path_index
+from .process_tracker import get_process_tracker
+from .launch_history import LaunchHistory, prewarm_files, wait_until_loaded
 
 class SystemApplications:
     """Maneja la apertura de aplicaciones del sistema"""
 
-    def __init__(self, config_file: str = "configs/apps_config.json"):
+    # Aplicaciones en las que abrir otra instancia es lo esperado
+    MULTI_INSTANCE_APPS = {'gnome-terminal', 'kitty', 'xterm', 'uxterm', 'konsole', 'alacritty', 'vim'}
+
+    # Segundos de inactividad antes de precargar las apps más usadas
+    PREWARM_IDLE_DELAY = 30
+
+    def __init__(self, config_file: str = "configs/apps_config.json", prewarm: bool = True):
         self.system = platform.system()
         
         # Corregir la ruta del archivo de configuración
@@ -20,7 +31,15 @@ class SystemApplications:
         self.config_file.parent.mkdir(exist_ok=True)
         
         self.applications = self._load_application_mappings()
+        self.path_index = get_path_index()
+        self.process_tracker = get_process_tracker()
+        self.history = LaunchHistory()
+        self.prewarm_enabled = prewarm
+        self._prewarm_timer = None
+        self._prewarmed = set()     # apps precargadas desde su último lanzamiento
+        self._desktop_entries = None
         print(f"[SystemApplications] Sistema detectado: {self.system}")
+        self._schedule_prewarm()
 
     def _default_app_mappings(self):
         """Mapeo por defecto según el sistema operativo"""
@@ -87,24 +106,75 @@ class SystemApplications:
         
         return default_apps
 
+    def _load_desktop_entries(self) -> set:
+        """Ejecutables de las aplicaciones instaladas con entrada .desktop (Linux)"""
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        data_dirs = (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+        executables = set()
+        for data_dir in [data_home] + data_dirs:
+            applications = Path(data_dir) / "applications"
+            if not applications.is_dir():
+                continue
+            for entry in applications.glob("*.desktop"):
+                try:
+                    for line in entry.read_text(encoding="utf-8", errors="replace").splitlines():
+                        if line.startswith("Exec="):
+                            # "env VAR=1 firefox %u" -> firefox
+                            words = [w for w in shlex.split(line[5:]) if w != "env" and "=" not in w]
+                            if words:
+                                executables.add(os.path.basename(words[0]))
+                            break
+                except (OSError, ValueError):
+                    continue
+        return executables
+
+    def _is_known_application(self, executable: str) -> bool:
+        """Un alias configurado, una app con entrada .desktop o una ya abierta antes"""
+        if self._desktop_entries is None:
+            self._desktop_entries = self._load_desktop_entries() if self.system == "Linux" else set()
+        configured = {key for key in self.applications} | {
+            command.split()[0] for command in self.applications.values() if command}
+        return (executable in configured or executable in self._desktop_entries
+                or self.history.frecency(executable) > 0)
+
+    def unconfirmed_match(self, app_name: str):
+        """
+        Ejecutable del PATH que empieza por lo dictado pero no es una aplicación
+        conocida ("fire" -> "firefox-esr"): no se lanza sin que el usuario lo confirme.
+        None si _find_application ya resuelve el nombre o no hay una única coincidencia.
+        """
+        if self._find_application(app_name)[0]:
+            return None
+        completions = self.path_index.complete(app_name.lower().replace(' ', '-'), limit=2)
+        return completions[0] if len(completions) == 1 else None
+
     def _find_application(self, app_name: str):
         """Busca una aplicación en el sistema"""
         app_name_lower = app_name.lower()
         
         # Estrategia 1: Buscar en el mapeo configurado
-        for key, command in self.applications.items():
-            if re.search(rf"\b{re.escape(key)}\b", app_name_lower):
-                return command, key
+        # (si varios alias coinciden, desempata el historial de uso)
+        candidates = [
+            (key, command) for key, command in self.applications.items()
+            if re.search(rf"\b{re.escape(key)}\b", app_name_lower)
+        ]
+        if candidates:
+            key, command = max(candidates, key=lambda item: self.history.frecency(item[0]))
+            return command, key
         
-        # Estrategia 2: Buscar directamente en el PATH
-        if shutil.which(app_name):
+        # Estrategia 2: Buscar directamente en el índice del PATH
+        # (en Windows el índice ya prueba las extensiones de PATHEXT)
+        full_path = self.path_index.which(app_name)
+        if full_path:
+            if self.system == "Windows":
+                return os.path.basename(full_path), app_name
             return app_name, app_name
         
-        # Estrategia 3: Para Windows, probar con extensiones comunes
-        if self.system == "Windows":
-            for ext in ['.exe', '.com', '.bat', '.cmd']:
-                if shutil.which(app_name + ext):
-                    return app_name + ext, app_name
+        # Estrategia 3: Completar por prefijo si la coincidencia es única y es una app
+        # conocida; un prefijo mal oído no debe lanzar un binario cualquiera del PATH
+        completions = self.path_index.complete(app_name_lower.replace(' ', '-'), limit=2)
+        if len(completions) == 1 and self._is_known_application(completions[0]):
+            return completions[0], completions[0]
         
         return None, app_name
 
@@ -125,22 +195,188 @@ class SystemApplications:
                 subprocess.Popen(["open", "-a", command])
             else:  # Linux
                 executable = command.split()[0] if ' ' in command else command
-                if shutil.which(executable) is None:
+                if not self.path_index.exists(executable):
                     return f"No encontré el ejecutable '{executable}' para '{found_name}'"
                 
-                subprocess.Popen(
+                # Si ya está en ejecución, reutilizarla en lugar de lanzar otra instancia
+                if os.path.basename(executable) not in self.MULTI_INSTANCE_APPS:
+                    running = self.process_tracker.find(executable)
+                    if running:
+                        self.history.record_launch(found_name, executable)
+                        if self._focus_process(running):
+                            return f"Aplicación '{found_name}' ya estaba abierta, la traje al frente"
+                        return f"Aplicación '{found_name}' ya está en ejecución (PID {running[0]['pid']})"
+                
+                launch_start = time.perf_counter()
+                process = subprocess.Popen(
                     command.split(), 
                     stdout=subprocess.DEVNULL, 
                     stderr=subprocess.DEVNULL,
                     start_new_session=True
                 )
+                self.process_tracker.register_launch(found_name, executable, process)
+                self.history.record_launch(found_name, executable)
+                self._measure_load(found_name, process.pid, launch_start)
+            
+            self._schedule_prewarm()
             
             return f"Aplicación '{found_name}' abierta correctamente"
             
         except Exception as e:
             return f"Error al abrir '{found_name}': {str(e)}"
 
+    def _focus_process(self, processes: list) -> bool:
+        """Intenta traer al frente la ventana de un proceso (wmctrl o xdotool)"""
+        pids = {str(info['pid']) for info in processes}
+        
+        if self.path_index.exists('wmctrl'):
+            try:
+                listing = subprocess.run(['wmctrl', '-lp'], capture_output=True, text=True, timeout=2).stdout
+                for line in listing.splitlines():
+                    fields = line.split(None, 4)
+                    if len(fields) >= 3 and fields[2] in pids:
+                        subprocess.run(['wmctrl', '-i', '-a', fields[0]], timeout=2)
+                        return True
+            except Exception as e:
+                print(f"[SystemApplications] wmctrl falló: {e}")
+        
+        if self.path_index.exists('xdotool'):
+            for pid in sorted(pids, key=int)[:5]:
+                try:
+                    result = subprocess.run(
+                        ['xdotool', 'search', '--onlyvisible', '--pid', pid, 'windowactivate'],
+                        capture_output=True, timeout=2
+                    )
+                    if result.returncode == 0:
+                        return True
+                except Exception as e:
+                    print(f"[SystemApplications] xdotool falló: {e}")
+        
+        return False
+
+    def close_application(self, app_name: str) -> str:
+        """Cierra una aplicación en ejecución usando el índice de procesos"""
+        command, found_name = self._find_application(app_name)
+        
+        if not command:
+            return f"No pude encontrar la aplicación '{app_name}' en el sistema"
+        
+        if not self.process_tracker.available:
+            return f"No puedo cerrar aplicaciones en {self.system} todavía"
+        
+        executable = command.split()[0]
+        running = self.process_tracker.find_closable(executable)
+        if not running:
+            return f"La aplicación '{found_name}' no está en ejecución"
+        
+        finished = self.process_tracker.terminate([info['pid'] for info in running])
+        if not finished:
+            return f"No pude cerrar '{found_name}'"
+        return f"Aplicación '{found_name}' cerrada ({len(finished)} proceso(s))"
+
+    def open_file(self, path) -> str:
+        """Abre un archivo con la aplicación predeterminada del sistema"""
+        path = str(path)
+        if not os.path.exists(path):
+            return f"❌ El archivo ya no existe: {path}"
+        
+        try:
+            if self.system == "Windows":
+                os.startfile(path)
+            elif self.system == "Darwin":  # macOS
+                subprocess.Popen(["open", path])
+            else:  # Linux
+                if not self.path_index.exists('xdg-open'):
+                    return "No encontré 'xdg-open' para abrir archivos"
+                subprocess.Popen(
+                    ['xdg-open', path],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True
+                )
+            return f"📄 Abriendo {os.path.basename(path)}"
+        except Exception as e:
+            return f"Error al abrir '{path}': {str(e)}"
+
+    def _measure_load(self, name: str, pid: int, launch_start: float):
+        """
+        En segundo plano: tiempo hasta que la app termina de mapear sus bibliotecas
+        (Popen vuelve tras el exec, antes de que el cargador las lea) y, la primera
+        vez, los ficheros que mapea para precargarlos después.
+        """
+        prewarmed = name in self._prewarmed
+        self._prewarmed.discard(name)
+        
+        def measure():
+            seconds, files = wait_until_loaded(pid, launch_start)
+            if seconds is not None:
+                self.history.record_load_time(name, seconds, prewarmed)
+                print(f"[SystemApplications] '{name}' cargada en {seconds * 1000:.0f} ms"
+                      f"{' (precargada)' if prewarmed else ''}")
+            if files and self.history.needs_files(name):
+                self.history.record_files(name, files)
+        
+        threading.Thread(target=measure, name=f"load-{name}", daemon=True).start()
+
+    def _schedule_prewarm(self):
+        """(Re)programa la precarga para cuando el asistente lleve un rato inactivo"""
+        if not self.prewarm_enabled or not hasattr(os, "posix_fadvise"):
+            return
+        if self._prewarm_timer:
+            self._prewarm_timer.cancel()
+        self._prewarm_timer = threading.Timer(self.PREWARM_IDLE_DELAY, self.prewarm_top_apps)
+        self._prewarm_timer.daemon = True
+        self._prewarm_timer.start()
+
+    def prewarm_top_apps(self, limit: int = 3) -> int:
+        """Carga en la page cache el binario y las bibliotecas de las apps más usadas"""
+        requested = 0
+        for entry in self.history.top(limit):
+            if self.process_tracker.is_running(entry["executable"]):
+                continue
+            requested += prewarm_files(entry["files"])
+            if entry["files"]:
+                self._prewarmed.add(entry["name"])
+        if requested:
+            print(f"[SystemApplications] Prewarm: {requested / (1024**2):.1f} MB solicitados a la page cache")
+        return requested
+
+    def prewarm_application(self, app_name: str) -> int:
+        """Precarga una app que está a punto de abrirse (el usuario aún está hablando)"""
+        command, found_name = self._find_application(app_name)
+        if not command or not hasattr(os, "posix_fadvise"):
+            return 0
+        executable = command.split()[0]
+        if self.process_tracker.is_running(executable):
+            return 0
+        files = self.history.files(found_name)
+        if not files:
+            full_path = self.path_index.which(executable)
+            files = [full_path] if full_path else []
+        requested = prewarm_files(files)
+        if requested and self.history.files(found_name):
+            self._prewarmed.add(found_name)
+        if requested:
+            print(f"[SystemApplications] Prewarm de '{found_name}': {requested / (1024**2):.1f} MB")
+        return requested
+
+    def get_usage_stats(self, limit: int = 5) -> str:
+        """Resumen de las aplicaciones más usadas"""
+        top_apps = self.history.top(limit)
+        if not top_apps:
+            return "Todavía no he abierto ninguna aplicación"
+        
+        lines = ["📊 Aplicaciones que más usas:"]
+        for position, entry in enumerate(top_apps, 1):
+            last_used = time.strftime("%d/%m %H:%M", time.localtime(entry["last_used"]))
+            loads = [f"carga ~{entry[key]:.0f} ms {label}" for key, label in
+                     (("load_ms_cold", "en frío"), ("load_ms_warm", "precargada")) if entry.get(key) is not None]
+            load = f", {', '.join(loads)}" if loads else ""
+            lines.append(f"  {position}. {entry['name']}: {entry['count']} usos (último {last_used}{load})")
+        return "\n".join(lines)
+
     def reload_config(self):
         """Recarga la configuración de aplicaciones"""
         self.applications = self._load_application_mappings()
+        self._desktop_entries = None
         return "Configuración recargada correctamente"
\ No newline at end of file
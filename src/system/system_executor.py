@@ -1,20 +1,48 @@
 # [file name]: src/system/system_executor.py
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
 from .system_applications import SystemApplications
 from .system_files import SystemFiles
 from .system_info import SystemInfo
 from .system_files_intelligent import IntelligentFileManager
 from .conversation_manager import ConversationManager
+from .content_search import ContentSearcher
+from .disk_usage import DiskUsageAnalyzer, format_size
+from .duplicate_finder import DuplicateFinder
+from .activity_journal import get_activity_journal, extensions_for, CREATED
+from .file_transfer import FileTransferManager
+from .archiver import Archiver
+from .batch_transcriber import BatchTranscriber
+from .directory_index import normalize_name
 
 class SystemCommandExecutor:
     """
     Orquestador principal que elige qué clase usar para cada comando
     """
 
+    # Segundos que se espera al análisis de disco antes de responder con el progreso
+    DISK_USAGE_WAIT = 3.0
+    # Un informe terminado se reutiliza durante este tiempo al volver a preguntar
+    DISK_USAGE_REPORT_TTL = 300.0
+    # Las copias pequeñas se esperan y se responde con el resultado directamente
+    TRANSFER_WAIT = 2.0
+    # Carpetas con pocas notas de voz se responden con el resultado directamente
+    TRANSCRIBE_WAIT = 3.0
+
     def __init__(self, config_file: str = "configs/apps_config.json", base_path=None):
         self.apps_manager = SystemApplications(config_file)
         self.files_manager = SystemFiles(base_path)
         self.info_manager = SystemInfo(base_path)
         self.intelligent_manager = IntelligentFileManager(base_path)
+        self.content_searcher = ContentSearcher(self.files_manager.walker)
+        self.disk_usage_analyzer = DiskUsageAnalyzer()
+        self.duplicate_finder = DuplicateFinder(self.files_manager.walker)
+        self.activity_journal = get_activity_journal(self.files_manager.base_path)
+        self.transfer_manager = FileTransferManager()
+        self.archiver = Archiver(self.transfer_manager)
+        self.batch_transcriber = BatchTranscriber(self._create_batch_stt, self.files_manager.walker)
         self.conversation_manager = ConversationManager(self)
         
         print("[SystemCommandExecutor] Inicializado con todos los módulos incluyendo gestor inteligente")
@@ -25,6 +53,10 @@ class SystemCommandExecutor:
         
         if command_type == 'open_app':
             return self.apps_manager.open_application(params)
+        elif command_type == 'close_app':
+            return self.apps_manager.close_application(params)
+        elif command_type == 'app_stats':
+            return self.apps_manager.get_usage_stats()
         elif command_type == 'create_folder':
             # Si params es un diccionario (con nombre y ubicación)
             if isinstance(params, dict):
@@ -45,14 +77,423 @@ class SystemCommandExecutor:
             else:
                 # Comando simple
                 return self.files_manager.create_file(params)
+        elif command_type == 'create_folders':
+            result = self.intelligent_manager.bulk_create_folders(params.get('folder_names') or [], params.get('location'))
+            return result["message"]
+        elif command_type == 'create_scaffold':
+            result = self.intelligent_manager.create_scaffold(
+                params.get('scaffold'), params.get('project_name'), params.get('location')
+            )
+            return result["message"]
         elif command_type == 'search_folder':
             result = self.files_manager.search_folder(params)
             return result["message"]
+        elif command_type == 'search_content':
+            return self.search_content(params.get('query'), params.get('location'))
+        elif command_type == 'disk_usage':
+            return self.disk_usage(params)
+        elif command_type == 'find_duplicates':
+            return self.find_duplicates(params)
+        elif command_type == 'open_recent':
+            return self.open_recent(params)
+        elif command_type == 'recent_files':
+            return self.recent_files(params)
+        elif command_type in ('copy', 'move'):
+            return self.transfer(command_type, params.get('source'), params.get('source_location'),
+                                 params.get('destination'))
+        elif command_type == 'compress':
+            return self.compress(params.get('source'), params.get('location'), params.get('format'))
+        elif command_type == 'extract':
+            return self.extract(params.get('source'), params.get('location'), params.get('destination'))
+        elif command_type == 'transcribe_folder':
+            # Escribe archivos en la carpeta: siempre pasa por la confirmación
+            return self.conversation_manager.handle_system_command({'type': command_type, 'params': params})
+        elif command_type == 'transcription_status':
+            return self.transcription_status()
+        elif command_type == 'cancel_transfer':
+            # Con varias tareas en curso se pregunta cuál cancelar
+            return self.conversation_manager.handle_system_command({'type': command_type, 'params': params})
+        elif command_type == 'transfer_status':
+            return self.transfer_status()
         elif command_type == 'system_info':
             return self.info_manager.get_system_info()
         else:
             return "Tipo de comando no reconocido"
 
+    def resolve_existing_location(self, location: str = None):
+        """
+        Carpeta existente a la que se refiere una ubicación dictada (base_path si no
+        se indica). None si no existe entera: nunca se cae a su carpeta padre.
+        """
+        if not location:
+            return self.files_manager.base_path
+        resolution = self.intelligent_manager.path_resolver.resolve(location)
+        if resolution and resolution["exact"] and not resolution["missing"]:
+            return Path(resolution["existing"])
+        return None
+
+    def search_content(self, query: str, location: str = None, max_results: int = 20, time_budget: float = 4.0) -> str:
+        """Busca archivos de texto que contengan query"""
+        if not query:
+            return "¿Qué texto quieres que busque dentro de los archivos?"
+        root = self.resolve_existing_location(location)
+        if root is None:
+            return f"❌ No encontré la carpeta '{location}'"
+        
+        results = self.content_searcher.search_ranked(query, root, max_results=max_results, time_budget=time_budget)
+        stats = self.content_searcher.last_stats
+        timing = f"{stats['files_scanned']} archivos revisados en {stats['elapsed']:.1f}s"
+        if stats["reason"] == "time_budget":
+            timing += ", búsqueda cortada por tiempo"
+        
+        if not results:
+            return f"❌ Ningún archivo en {root} contiene '{query}' ({timing})"
+        
+        lines = [f"🔎 {len(results)} archivos contienen '{query}' ({timing}):"]
+        for result in results[:5]:
+            first_hit = result["hits"][0]
+            lines.append(f"   📄 {result['path']}:{first_hit['line']} → {first_hit['preview']}")
+        return "\n".join(lines)
+
+    def disk_usage(self, location: str = None) -> str:
+        """
+        Qué ocupa espacio en una carpeta. El análisis corre en segundo plano:
+        si no termina en DISK_USAGE_WAIT segundos se responde con el progreso
+        y el resultado se entrega al volver a preguntar.
+        """
+        root = self.resolve_existing_location(location)
+        if root is None:
+            return f"❌ No encontré la carpeta '{location}'"
+        root = str(root)
+        analyzer = self.disk_usage_analyzer
+        
+        if analyzer.is_running():
+            if analyzer.progress["root"] != root:
+                return f"{analyzer.describe_progress()}\n   Cuando termine podré analizar {root}."
+            return f"{analyzer.describe_progress()}\n   Pregúntame de nuevo en un momento."
+        
+        report = analyzer.last_report
+        if not (report and report["root"] == root and time.time() - report["finished_at"] < self.DISK_USAGE_REPORT_TTL):
+            analyzer.start(root)
+            if not analyzer.wait(self.DISK_USAGE_WAIT):
+                return (f"{analyzer.describe_progress()}\n"
+                        f"   Sigo en segundo plano; pregúntame otra vez 'qué ocupa espacio' en un momento.")
+            report = analyzer.last_report
+            if report is None:
+                return f"❌ No pude analizar {root}"
+        
+        return f"{analyzer.describe_report(report)}\n{self.info_manager.get_disk_usage(root)}"
+
+    def find_duplicates(self, location: str = None, max_groups: int = 5, time_budget: float = 10.0) -> str:
+        """Grupos de archivos duplicados, del que más espacio desperdicia al que menos"""
+        root = self.resolve_existing_location(location)
+        if root is None:
+            return f"❌ No encontré la carpeta '{location}'"
+        
+        groups = []
+        for group in self.duplicate_finder.find(root, time_budget=time_budget):
+            groups.append(group)
+            print(f"[Executor] Duplicados: {len(group['paths'])} × {format_size(group['size'])} "
+                  f"({format_size(group['wasted'])} desperdiciados)")
+        stats = self.duplicate_finder.last_stats
+        timing = (f"{stats['files_seen']} archivos, {stats['partial_hashed']} con hash parcial y "
+                  f"{stats['full_hashed']} con hash completo en {stats['elapsed']:.1f}s")
+        if stats["reason"] == "time_budget":
+            timing += ", búsqueda cortada por tiempo"
+            if stats["unchecked_groups"]:
+                timing += f"; {stats['unchecked_groups']} grupos del mismo tamaño sin comprobar"
+        
+        if not groups:
+            return f"✅ No hay archivos duplicados en {root} ({timing})"
+        
+        lines = [f"🗂️ {len(groups)} grupos de duplicados en {root}, "
+                 f"{format_size(stats['wasted'])} recuperables ({timing}):"]
+        for group in groups[:max_groups]:
+            lines.append(f"   {format_size(group['wasted'])} en {len(group['paths'])} copias de {format_size(group['size'])}:")
+            for path in group["paths"]:
+                lines.append(f"      📄 {os.path.relpath(path, root)}")
+        return "\n".join(lines)
+
+    def _recent_scope(self, params: dict):
+        """Traduce los parámetros dictados a filtros del diario: (extensiones, carpeta, tipo, descripción)"""
+        category = params.get('category')
+        action = params.get('action')
+        extensions = extensions_for(category)
+        label = category if category and extensions is not None else "archivo"
+        folder, kind = None, None
+        
+        if category and category.lower().startswith('descarga'):
+            action = 'descargar'
+        if action == 'descargar':
+            folder = next((str(f) for f in self.activity_journal.folders
+                           if f.name in ('Descargas', 'Downloads') and self.files_manager.fs_cache.is_dir(f)), None)
+        elif action == 'crear':
+            kind = CREATED
+        
+        location = params.get('location')
+        if location:
+            resolved = self.resolve_existing_location(location)
+            if resolved is None:
+                raise FileNotFoundError(f"No encontré la carpeta '{location}'")
+            folder = str(resolved)
+        return extensions, folder, kind, label
+
+    def _period_range(self, period: str):
+        """(desde, hasta) para hoy / ayer / esta semana / este mes; por defecto los últimos 7 días"""
+        now = datetime.now()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        if period == 'hoy':
+            return midnight.timestamp(), None
+        if period == 'ayer':
+            return (midnight - timedelta(days=1)).timestamp(), midnight.timestamp()
+        if period == 'esta semana':
+            return (midnight - timedelta(days=midnight.weekday())).timestamp(), None
+        if period == 'este mes':
+            return midnight.replace(day=1).timestamp(), None
+        return (now - timedelta(days=7)).timestamp(), None
+
+    def _describe_age(self, timestamp: float) -> str:
+        minutes = int((time.time() - timestamp) // 60)
+        if minutes < 1:
+            return "hace un momento"
+        if minutes < 60:
+            return f"hace {minutes} min"
+        if minutes < 24 * 60:
+            return f"hace {minutes // 60} h"
+        return datetime.fromtimestamp(timestamp).strftime("el %d/%m a las %H:%M")
+
+    def open_recent(self, params: dict) -> str:
+        """Abre el archivo más reciente que encaje según el diario de actividad"""
+        try:
+            extensions, folder, kind, label = self._recent_scope(params)
+        except FileNotFoundError as e:
+            return f"❌ {e}"
+        
+        # El diario responde sin tocar el disco; solo se comprueba que el elegido siga existiendo
+        for entry in self.activity_journal.query(extensions=extensions, folder=folder, kind=kind, limit=10):
+            if self.files_manager.fs_cache.exists(entry["path"]):
+                message = self.apps_manager.open_file(entry["path"])
+                return f"{message} ({self._describe_age(entry['time'])})"
+        
+        return (f"❌ No tengo registrado ningún {label} reciente"
+                f"{' en ' + folder if folder else ''}. Solo veo la actividad desde que estoy en marcha.")
+
+    def recent_files(self, params: dict, limit: int = 10) -> str:
+        """Archivos creados o modificados en un periodo según el diario de actividad"""
+        try:
+            extensions, folder, kind, label = self._recent_scope(params)
+        except FileNotFoundError as e:
+            return f"❌ {e}"
+        period = params.get('period')
+        since, until = self._period_range(period)
+        
+        entries = self.activity_journal.query(extensions=extensions, since=since, until=until,
+                                              folder=folder, kind=kind, limit=limit)
+        period_text = period or "en los últimos 7 días"
+        if not entries:
+            return f"📭 No veo actividad de tipo {label} {period_text}"
+        
+        base_path = str(self.files_manager.base_path)
+        lines = [f"🕘 {len(entries)} archivos recientes {period_text}:"]
+        for entry in entries:
+            when = datetime.fromtimestamp(entry["time"]).strftime("%d/%m %H:%M")
+            action = "creado" if entry["kind"] == CREATED else "modificado"
+            lines.append(f"   {when}  {os.path.relpath(entry['path'], base_path)} ({action})")
+        return "\n".join(lines)
+
+    def resolve_existing_path(self, name: str, location: str = None):
+        """
+        Archivo o carpeta existente al que se refiere un nombre dictado, buscando en
+        location (o en la carpeta base): ruta literal, carpeta resuelta o nombre sin tildes/mayúsculas.
+        """
+        folder = self.resolve_existing_location(location)
+        if folder is None or not name:
+            return None
+        literal = Path(name) if Path(name).is_absolute() else folder / name
+        if self.files_manager.fs_cache.exists(literal):
+            return literal
+        
+        wanted = normalize_name(name)
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if normalize_name(entry.name) == wanted:
+                        return Path(entry.path)
+        except OSError:
+            pass
+        
+        if not location:
+            resolution = self.intelligent_manager.path_resolver.resolve(name)
+            if resolution and resolution["exact"]:
+                return Path(resolution["path"])
+        return None
+
+    def transfer(self, kind: str, source: str, source_location: str, destination: str) -> str:
+        """Copia o mueve en segundo plano; las transferencias cortas se responden al terminar"""
+        if not source or not destination:
+            return "¿Qué quieres copiar y a dónde? Por ejemplo: 'copia informe.pdf de Descargas a Documentos'"
+        source_path = self.resolve_existing_path(source, source_location)
+        if source_path is None:
+            where = f" en {source_location}" if source_location else ""
+            return (f"❌ No encontré '{source}'{where}. Dime también dónde está: "
+                    f"'copia {source} de Descargas a Documentos'")
+        
+        resolution = self.intelligent_manager.path_resolver.resolve(destination)
+        if not resolution or not resolution["exact"]:
+            return f"❌ La carpeta destino '{destination}' no existe"
+        
+        transfer = self.transfer_manager.start(kind, [source_path], resolution["path"])
+        return self._wait_for_transfer(transfer)
+
+    def _wait_for_transfer(self, transfer) -> str:
+        """Responde con el resultado si termina enseguida; si no, con el progreso"""
+        if transfer.done_event.wait(self.TRANSFER_WAIT):
+            self._invalidate_after_transfer(transfer)
+            return self.transfer_manager.describe(transfer)
+        return f"{self.transfer_manager.describe(transfer)}\n   Sigo en segundo plano; di 'cancela' para detenerlo."
+
+    def _invalidate_after_transfer(self, transfer):
+        """Olvida en la caché de listados las carpetas cuyo contenido cambió"""
+        fs_cache = self.files_manager.fs_cache
+        if transfer.kind in ("copy", "move"):
+            # destination es la carpeta que recibió los archivos
+            fs_cache.invalidate(transfer.destination)
+            if transfer.kind == "move":
+                for source in transfer.sources:
+                    fs_cache.invalidate(os.path.dirname(source.rstrip(os.sep)))
+        else:
+            # Comprimir/extraer: destination es el archivo o carpeta nuevos
+            fs_cache.invalidate(os.path.dirname(transfer.destination.rstrip(os.sep)))
+
+    def compress(self, source: str, location: str = None, archive_format: str = None) -> str:
+        """Comprime un archivo o carpeta en segundo plano"""
+        if not source:
+            return "¿Qué quieres comprimir?"
+        source_path = self.resolve_existing_path(source, location)
+        if source_path is None:
+            return f"❌ No encontré '{source}'"
+        try:
+            transfer = self.archiver.compress(source_path, archive_format)
+        except ValueError as e:
+            return f"❌ {e}"
+        return self._wait_for_transfer(transfer)
+
+    def extract(self, source: str, location: str = None, destination: str = None) -> str:
+        """Extrae un archivo comprimido en una carpeta nueva"""
+        if not source:
+            return "¿Qué archivo quieres descomprimir?"
+        archive_path = self.resolve_existing_path(source, location)
+        if archive_path is None:
+            return f"❌ No encontré '{source}'"
+        target, created = None, False
+        if destination:
+            # Una carpeta destino que no existe se crea tal cual se dijo (y se avisa),
+            # nunca se extrae en su carpeta padre
+            resolution = self.intelligent_manager.path_resolver.resolve(destination)
+            if not resolution:
+                return f"❌ No encontré la carpeta destino '{destination}'"
+            target, created = Path(resolution["path"]), not resolution["exact"]
+        try:
+            transfer = self.archiver.extract(archive_path, target)
+        except ValueError as e:
+            return f"❌ {e}"
+        message = self._wait_for_transfer(transfer)
+        if created:
+            self.files_manager.fs_cache.invalidate(resolution["existing"])
+            message = f"📁 La carpeta {target} no existía: la he creado para extraer ahí\n{message}"
+        return message
+
+    def _create_batch_stt(self):
+        """Whisper para las transcripciones por lotes: solo se carga la primera vez que se pide una"""
+        from src.utils.stt import SpeechToText, load_stt_config
+        config = load_stt_config()
+        self.batch_transcriber.batch_size = config.get("batch_size", self.batch_transcriber.batch_size)
+        return SpeechToText(device="cpu", profile=config.get("batch_profile"))
+
+    def transcription_root(self, location: str = None):
+        """(carpeta a transcribir, None) o (None, mensaje de error) para una ubicación dictada"""
+        if not location:
+            return None, "¿Qué carpeta quieres transcribir? Por ejemplo: 'transcribe las grabaciones en Música/Notas'"
+        root = self.resolve_existing_location(location)
+        if root is None:
+            return None, f"❌ No encontré la carpeta '{location}'"
+        return root, None
+
+    def transcribe_folder(self, root) -> str:
+        """
+        Transcribe las grabaciones de root en segundo plano (un .txt junto a cada
+        audio). root ya debe estar resuelta y confirmada por el usuario (ver
+        ConversationManager). Si no termina en TRANSCRIBE_WAIT segundos se
+        responde con el progreso y el resultado se entrega al preguntar cómo va.
+        """
+        transcriber = self.batch_transcriber
+        if transcriber.is_running():
+            return f"{transcriber.describe_progress()}\n   Cuando termine podré transcribir {root}."
+        
+        transcriber.start(root)
+        if not transcriber.wait(self.TRANSCRIBE_WAIT):
+            return (f"{transcriber.describe_progress()}\n"
+                    f"   Sigo en segundo plano; pregúntame 'cómo va la transcripción' o di 'cancela' para pararla.")
+        if transcriber.last_report is None:
+            return f"❌ No pude transcribir {root}"
+        self.files_manager.fs_cache.invalidate(str(root))
+        return transcriber.describe_report(transcriber.last_report)
+
+    def transcription_status(self) -> str:
+        transcriber = self.batch_transcriber
+        if transcriber.is_running():
+            return transcriber.describe_progress()
+        if transcriber.last_report:
+            return transcriber.describe_report(transcriber.last_report)
+        return "No hay ninguna transcripción en curso"
+
+    def running_jobs(self) -> list:
+        """Tareas en segundo plano que se pueden cancelar, la más reciente primero: [(clave, descripción)]"""
+        jobs = []
+        for transfer in self.transfer_manager.active():
+            verb, _ = self.transfer_manager.KIND_NAMES.get(transfer.kind, (transfer.kind, "o"))
+            names = ", ".join(os.path.basename(s.rstrip(os.sep)) for s in transfer.sources)
+            jobs.append((time.time() - transfer.elapsed(), f"transfer:{transfer.id}", f"{verb.lower()} de {names}"))
+        if self.batch_transcriber.is_running():
+            progress = self.batch_transcriber.progress
+            jobs.append((progress["started_at"] or time.time(), "transcription",
+                         f"transcripción de {progress['root']}"))
+        return [(key, label) for _, key, label in sorted(jobs, reverse=True)]
+
+    def cancel_job(self, key: str) -> str:
+        """Cancela una tarea de running_jobs y describe cómo ha quedado"""
+        if key == "transcription":
+            if not self.batch_transcriber.cancel():
+                return "La transcripción ya había terminado"
+            # Whisper no se interrumpe a mitad de archivo: no se bloquea la conversación esperando
+            if self.batch_transcriber.wait(self.TRANSCRIBE_WAIT) and self.batch_transcriber.last_report:
+                return self.batch_transcriber.describe_report(self.batch_transcriber.last_report)
+            return "⏹️ La transcripción se detendrá tras el archivo actual; lo ya transcrito queda guardado"
+        
+        cancelled = self.transfer_manager.cancel(int(key.split(":", 1)[1]))
+        if not cancelled:
+            return "Esa tarea ya había terminado"
+        transfer = cancelled[0]
+        transfer.done_event.wait(5)
+        self._invalidate_after_transfer(transfer)
+        return self.transfer_manager.describe(transfer)
+
+    def cancel_transfer(self) -> str:
+        """
+        "cancela": detiene solo la tarea más reciente. Con varias en curso,
+        ConversationManager pregunta antes cuál (ver cancel_job).
+        """
+        jobs = self.running_jobs()
+        if not jobs:
+            return "No hay ninguna copia, compresión ni transcripción en curso"
+        return self.cancel_job(jobs[0][0])
+
+    def transfer_status(self) -> str:
+        active = self.transfer_manager.active()
+        if not active:
+            return "No hay ninguna copia ni compresión en curso"
+        return "\n".join(self.transfer_manager.describe(transfer) for transfer in active)
+
     def get_applications_manager(self) -> SystemApplications:
         """Retorna el gestor de aplicaciones"""
         return self.apps_manager
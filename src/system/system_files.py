@@ -2,12 +2,21 @@
 import os
 import re
 from pathlib import Path
+from .directory_index import get_directory_index
+from .dir_walker import DirectoryWalker
+from .fs_cache import get_fs_cache
 
 class SystemFiles:
     """Maneja operaciones con archivos y carpetas"""
 
+    # Presupuesto de tiempo para búsquedas sin índice (turno de voz)
+    WALK_TIME_BUDGET = 5.0
+
     def __init__(self, base_path=None):
         self.base_path = Path(base_path) if base_path else Path.home()
+        self.directory_index = get_directory_index(self.base_path)
+        self.walker = DirectoryWalker()
+        self.fs_cache = get_fs_cache()
 
     def create_file(self, file_path: str, content: str = "") -> str:
         """Crea un archivo en la ruta especificada"""
@@ -22,6 +31,7 @@ class SystemFiles:
 
         # Crear el archivo con contenido inicial
         path.write_text(content, encoding="utf-8")
+        self.fs_cache.invalidate(path, ancestors=True)
         return f"✅ Archivo creado en: {path}"
 
     def create_folder(self, folder_path: str) -> str:
@@ -31,6 +41,7 @@ class SystemFiles:
             path = self.base_path / path
 
         path.mkdir(parents=True, exist_ok=True)
+        self.fs_cache.invalidate(path, ancestors=True)
         return f"✅ Carpeta creada en: {path}"
 
     def create_folder_in_location(self, folder_name: str, location: str) -> str:
@@ -45,6 +56,7 @@ class SystemFiles:
         
         full_path = location_path / folder_name
         full_path.mkdir(parents=True, exist_ok=True)
+        self.fs_cache.invalidate(full_path, ancestors=True)
         return f"✅ Carpeta '{folder_name}' creada en: {full_path}"
 
     def create_file_in_location(self, file_name: str, location: str, content: str = "") -> str:
@@ -74,7 +86,7 @@ class SystemFiles:
         }
 
         # Verificar si la carpeta existe
-        if path.exists() and path.is_dir():
+        if self.fs_cache.is_dir(path):
             result["exists"] = True
             result["message"] = f"✅ La carpeta ya existe: {path}"
             return result
@@ -86,6 +98,7 @@ class SystemFiles:
         if auto_create:
             try:
                 path.mkdir(parents=True, exist_ok=True)
+                self.fs_cache.invalidate(path, ancestors=True)
                 result["created"] = True
                 result["exists"] = True
                 result["message"] = f"✅ Carpeta creada automáticamente: {path}"
@@ -96,8 +109,8 @@ class SystemFiles:
         
         return result
 
-    def search_folder(self, folder_name: str, search_path: str = None) -> dict:
-        """Busca una carpeta en el sistema"""
+    def search_folder(self, folder_name: str, search_path: str = None, limit: int = 50) -> dict:
+        """Busca una carpeta en el sistema (usa el índice de carpetas si está listo)"""
         search_dir = Path(search_path) if search_path else self.base_path
         folder_name = folder_name.lower()
         
@@ -105,36 +118,48 @@ class SystemFiles:
             "found": False,
             "matches": [],
             "search_path": str(search_dir),
-            "message": ""
+            "message": "",
+            "source": "index"
         }
         
         try:
-            # Buscar recursivamente
-            for path in search_dir.rglob("*"):
-                if path.is_dir() and folder_name in path.name.lower():
-                    results["matches"].append({
-                        "path": str(path),
-                        "name": path.name,
-                        "parent": str(path.parent)
-                    })
+            if self.directory_index.is_ready() and self.directory_index.covers(search_dir):
+                results["matches"] = self.directory_index.search(folder_name, limit=limit, within=str(search_dir))
+                freshness = f" ({self.directory_index.describe_freshness()})"
+            else:
+                results["source"] = "walk"
+                results["matches"] = self._search_folder_walk(folder_name, search_dir, limit)
+                freshness = f" ({self.walker.describe_stats()})"
             
             if results["matches"]:
                 results["found"] = True
-                results["message"] = f"✅ Encontradas {len(results['matches'])} coincidencias para '{folder_name}'"
+                results["message"] = f"✅ Encontradas {len(results['matches'])} coincidencias para '{folder_name}'{freshness}"
+                for match in results["matches"][:5]:
+                    results["message"] += f"\n   📁 {match['path']}"
             else:
-                results["message"] = f"❌ No se encontraron carpetas con '{folder_name}' en {search_dir}"
+                results["message"] = f"❌ No se encontraron carpetas con '{folder_name}' en {search_dir}{freshness}"
                 
         except Exception as e:
             results["message"] = f"❌ Error en la búsqueda: {str(e)}"
         
         return results
 
+    def _search_folder_walk(self, folder_name: str, search_dir: Path, limit: int = 50) -> list:
+        """Búsqueda recorriendo el disco en paralelo (cuando el índice no está disponible)"""
+        matches = self.walker.walk(
+            search_dir,
+            lambda entry: folder_name in entry.name.lower(),
+            max_results=limit,
+            time_budget=self.WALK_TIME_BUDGET
+        )
+        return [{"path": m["path"], "name": m["name"], "parent": m["parent"]} for m in matches]
+
     def check_folder_exists(self, folder_path: str) -> bool:
         """Verifica si una carpeta existe"""
         path = Path(folder_path)
         if not path.is_absolute():
             path = self.base_path / path
-        return path.exists() and path.is_dir()
+        return self.fs_cache.is_dir(path)
 
     def get_suggested_folders(self) -> list:
         """Retorna una lista de carpetas sugeridas comunes"""
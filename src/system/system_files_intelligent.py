@@ -1,13 +1,40 @@
 # [file name]: src/system/system_files_intelligent.py
 import os
 from pathlib import Path
+import yaml
 from .system_files import SystemFiles
+from .path_resolver import SpokenPathResolver
+from .folder_stats import get_folder_stats
 
 class IntelligentFileManager:
     """Gestor inteligente que verifica existencia y pregunta al usuario - CON SOPORTE PARA RUTAS COMPLEJAS"""
     
+    SKILLS_CONFIG = "configs/skills.yaml"
+    
     def __init__(self, base_path=None):
         self.files_manager = SystemFiles(base_path)
+        self.fs_cache = self.files_manager.fs_cache
+        self.path_resolver = SpokenPathResolver(self.files_manager.base_path)
+        self.folder_stats = get_folder_stats(self.files_manager.base_path)
+    
+    def _resolve_location(self, location: str):
+        """Convierte la ubicación dictada en una ruta, prefiriendo carpetas que ya existen"""
+        location_path = Path(location)
+        if location_path.is_absolute():
+            return location_path, None
+        
+        resolution = self.path_resolver.resolve(location)
+        if resolution is None:
+            # Nada coincide: se crea tal cual se dijo
+            return self.files_manager.base_path / location_path, None
+        
+        resolved = Path(resolution["path"])
+        literal = self.files_manager.base_path / location_path
+        note = None
+        if resolved != literal:
+            note = f"   🧭 Interpreté '{location}' como: {resolved} (confianza {resolution['score']:.0%})"
+            print(f"[IntelligentFileManager] Ubicación '{location}' resuelta a {resolved} ({resolution})")
+        return resolved, note
     
     def smart_create_folder(self, folder_name: str, location: str = None) -> dict:
         """Crea carpeta inteligentemente verificando existencia - SOPORTA RUTAS COMPLEJAS"""
@@ -22,11 +49,10 @@ class IntelligentFileManager:
         print(f"[IntelligentFileManager] Creando carpeta: '{folder_name}' en ubicación: '{location}'")
         
         # Construir ruta completa - usar los nombres originales con mayúsculas
+        location_note = None
         if location:
-            # location puede ser una ruta compleja como "Documentos/Proyectos/MiApp"
-            location_path = Path(location)  # Preservar mayúsculas y estructura de rutas
-            if not location_path.is_absolute():
-                location_path = self.files_manager.base_path / location_path
+            # location puede ser una ruta compleja como "Documentos/Proyectos/MiApp" o algo dictado
+            location_path, location_note = self._resolve_location(location)
             full_path = location_path / folder_name  # Preservar mayúsculas del folder_name
         else:
             full_path = Path(folder_name)  # Preservar mayúsculas del folder_name
@@ -36,10 +62,13 @@ class IntelligentFileManager:
         result["path"] = str(full_path)
         
         # Verificar si ya existe
-        if full_path.exists():
-            if full_path.is_dir():
+        metadata = self.fs_cache.stat(full_path)
+        if metadata["exists"]:
+            if metadata["is_dir"]:
                 result["already_exists"] = True
                 result["message"] = f"✅ La carpeta '{folder_name}' ya existe en: {full_path}"  # Usar folder_name original
+                if location_note:
+                    result["message"] += f"\n{location_note}"
                 return result
             else:
                 result["message"] = f"❌ Ya existe un archivo con ese nombre: {full_path}"
@@ -48,17 +77,15 @@ class IntelligentFileManager:
         # Si no existe, crear - parents=True crea todos los directorios padres necesarios
         try:
             full_path.mkdir(parents=True, exist_ok=True)
+            self.fs_cache.invalidate(full_path, ancestors=True)
+            self.path_resolver.invalidate(full_path.parent)
             result["success"] = True
             
-            # Registrar todas las rutas creadas (útil para rutas complejas)
-            current_path = full_path
-            while current_path != self.files_manager.base_path and not current_path.exists():
-                # En realidad, mkdir(parents=True) crea todo de una vez, pero podemos registrar la ruta completa
-                current_path = current_path.parent
-            
             result["message"] = f"✅ Carpeta '{folder_name}' creada en: {full_path}"  # Usar folder_name original
             if "/" in str(location) or "\\" in str(location):
                 result["message"] += f"\n   📁 Ruta completa creada: {location}/{folder_name}"
+            if location_note:
+                result["message"] += f"\n{location_note}"
             
             return result
         except Exception as e:
@@ -77,11 +104,10 @@ class IntelligentFileManager:
         print(f"[IntelligentFileManager] Creando archivo: '{file_name}' en ubicación: '{location}'")
         
         # Construir ruta completa - usar los nombres originales con mayúsculas
+        location_note = None
         if location:
-            # location puede ser una ruta compleja como "Documentos/Proyectos/MiApp"
-            location_path = Path(location)  # Preservar mayúsculas y estructura de rutas
-            if not location_path.is_absolute():
-                location_path = self.files_manager.base_path / location_path
+            # location puede ser una ruta compleja como "Documentos/Proyectos/MiApp" o algo dictado
+            location_path, location_note = self._resolve_location(location)
             full_path = location_path / file_name  # Preservar mayúsculas del file_name
         else:
             full_path = Path(file_name)  # Preservar mayúsculas del file_name
@@ -92,22 +118,25 @@ class IntelligentFileManager:
         
         # Verificar si el directorio padre existe - parents=True crea toda la estructura necesaria
         parent_dir = full_path.parent
-        if not parent_dir.exists():
+        if not self.fs_cache.exists(parent_dir):
             try:
                 parent_dir.mkdir(parents=True, exist_ok=True)
+                self.fs_cache.invalidate(parent_dir, ancestors=True)
                 result["folder_created"] = True
             except Exception as e:
                 result["message"] = f"❌ Error al crear directorio: {str(e)}"
                 return result
         
         # Verificar si el archivo ya existe
-        if full_path.exists():
+        if self.fs_cache.exists(full_path):
             result["message"] = f"⚠️ El archivo ya existe: {full_path}"
             return result
         
         # Crear el archivo
         try:
             full_path.write_text(content, encoding="utf-8")
+            self.fs_cache.invalidate(full_path)
+            self.folder_stats.record_choice(file_name, full_path.parent)
             result["success"] = True
             folder_msg = " (se creó la carpeta contenedora)" if result["folder_created"] else ""
             result["message"] = f"✅ Archivo '{file_name}' creado en: {full_path}{folder_msg}"  # Usar file_name original
@@ -115,6 +144,8 @@ class IntelligentFileManager:
             # Si la ubicación es una ruta compleja, mostrar información adicional
             if location and ("/" in location or "\\" in location):
                 result["message"] += f"\n   📁 Ruta: {location}/{file_name}"
+            if location_note:
+                result["message"] += f"\n{location_note}"
             
             return result
         except Exception as e:
@@ -133,11 +164,9 @@ class IntelligentFileManager:
         
         # Si se especifica carpeta destino (puede ser ruta compleja)
         if target_folder:
-            folder_path = Path(target_folder)  # Preservar mayúsculas
-            if not folder_path.is_absolute():
-                folder_path = self.files_manager.base_path / folder_path
+            folder_path, _ = self._resolve_location(target_folder)  # Preservar mayúsculas
             
-            if not folder_path.exists():
+            if not self.fs_cache.exists(folder_path):
                 result["suggestion"] = f"¿Quieres crear la carpeta '{target_folder}' para guardar '{file_name}'?"  # Usar nombres originales
                 result["folder_path"] = str(folder_path)
                 return result
@@ -158,6 +187,21 @@ class IntelligentFileManager:
         return result
     
     def _suggest_folders(self, file_name: str) -> list:
+        """Sugiere carpetas según dónde se suelen guardar los archivos de ese tipo"""
+        suggestions = []
+        for folder in self.folder_stats.suggest(file_name, limit=6):
+            if self.fs_cache.is_dir(self.files_manager.base_path / folder):
+                suggestions.append(folder)
+            if len(suggestions) == 3:
+                return suggestions
+        
+        # Sin datos suficientes: completar con la tabla fija por extensión
+        for folder in self._static_folder_suggestions(file_name):
+            if folder not in suggestions and len(suggestions) < 3:
+                suggestions.append(folder)
+        return suggestions
+    
+    def _static_folder_suggestions(self, file_name: str) -> list:
         """Sugiere carpetas basadas en el tipo de archivo"""
         file_lower = file_name.lower()  # Solo para comparación interna
         common_folders = self.files_manager.get_suggested_folders()
@@ -187,4 +231,161 @@ class IntelligentFileManager:
             if folder not in suggestions and len(suggestions) < 3:
                 suggestions.append(folder)
         
-        return suggestions[:3]  # Máximo 3 sugerencias
\ No newline at end of file
+        return suggestions[:3]  # Máximo 3 sugerencias
+    
+    def bulk_create(self, location: str = None, folders: list = None, files: dict = None) -> dict:
+        """
+        Crea varias carpetas y archivos de una sola pasada.
+        Los mkdir se deduplican y, si algo falla, se deshace todo lo creado.
+        """
+        result = {
+            "success": False,
+            "message": "",
+            "path": None,
+            "created_folders": [],
+            "created_files": [],
+            "existing": []
+        }
+        
+        location_note = None
+        if location:
+            root, location_note = self._resolve_location(location)
+        else:
+            root = self.files_manager.base_path
+        result["path"] = str(root)
+        
+        print(f"[IntelligentFileManager] Creación en lote en '{root}': carpetas={folders}, archivos={list(files or {})}")
+        
+        # 1) Planificar: carpetas que faltan (sin repetir) y archivos a escribir
+        root_resolved = root.resolve()
+        missing_dirs = {}
+        file_targets = []
+        try:
+            for folder in folders or []:
+                target = self._bulk_target(root, root_resolved, folder)
+                self._plan_missing_dirs(target, missing_dirs)
+            for relative, content in (files or {}).items():
+                target = self._bulk_target(root, root_resolved, relative)
+                self._plan_missing_dirs(target.parent, missing_dirs)
+                file_targets.append((target, content))
+        except ValueError as e:
+            result["message"] = f"❌ {e}"
+            return result
+        
+        # 2) Ejecutar en orden de profundidad, registrando lo creado para poder deshacerlo
+        created_dirs, created_files = [], []
+        try:
+            for directory in sorted(missing_dirs, key=lambda p: len(p.parts)):
+                directory.mkdir()
+                created_dirs.append(directory)
+            for target, content in file_targets:
+                if self.fs_cache.exists(target):
+                    result["existing"].append(str(target))
+                    continue
+                with open(target, "x", encoding="utf-8") as f:
+                    # Anotado antes de escribir: si la escritura falla también hay que borrarlo
+                    created_files.append(target)
+                    f.write(content)
+        except Exception as e:
+            self._rollback(created_dirs, created_files)
+            result["message"] = f"❌ Error creando en lote, no se dejó nada a medias: {str(e)}"
+            return result
+        finally:
+            self.fs_cache.invalidate(root, ancestors=True)
+            for path in created_dirs + created_files:
+                self.fs_cache.invalidate(path)
+            self.path_resolver.invalidate()
+        
+        requested = set(str(self._bulk_target(root, root_resolved, folder)) for folder in folders or [])
+        result["existing"] += sorted(p for p in requested if p not in {str(d) for d in created_dirs})
+        result["created_folders"] = [str(d) for d in created_dirs]
+        result["created_files"] = [str(f) for f in created_files]
+        result["success"] = True
+        
+        details = []
+        if result["existing"]:
+            existing = sorted(set(os.path.relpath(p, root) for p in result["existing"]))
+            details.append(f"   ↪️ Ya existían: {', '.join(existing)}")
+        if location_note:
+            details.append(location_note)
+        result["details"] = details
+        result["message"] = "\n".join(
+            [f"✅ Creadas {len(created_dirs)} carpetas y {len(created_files)} archivos en: {root}"] + details
+        )
+        return result
+    
+    def _bulk_target(self, root: Path, root_resolved: Path, relative: str) -> Path:
+        """Ruta destino dentro de root (rechaza rutas que se salgan de ella)"""
+        target = root / relative.strip().strip("/")
+        if not target.resolve().is_relative_to(root_resolved):
+            raise ValueError(f"La ruta '{relative}' queda fuera de {root}")
+        return target
+    
+    def _plan_missing_dirs(self, directory: Path, missing_dirs: dict):
+        """Añade directory y los padres que falten (usando la caché de metadatos)"""
+        current = directory
+        while current not in missing_dirs:
+            metadata = self.fs_cache.stat(current)
+            if metadata["exists"]:
+                if not metadata["is_dir"]:
+                    raise ValueError(f"Ya existe un archivo con ese nombre: {current}")
+                return
+            missing_dirs[current] = True
+            if current.parent == current:
+                return
+            current = current.parent
+    
+    def _rollback(self, created_dirs: list, created_files: list):
+        """Borra lo creado en orden inverso"""
+        for path in reversed(created_files):
+            try:
+                path.unlink()
+            except OSError as e:
+                print(f"[IntelligentFileManager] No se pudo deshacer {path}: {e}")
+        for path in reversed(created_dirs):
+            try:
+                path.rmdir()
+            except OSError as e:
+                print(f"[IntelligentFileManager] No se pudo deshacer {path}: {e}")
+    
+    def bulk_create_folders(self, folder_names: list, location: str = None) -> dict:
+        """Crea varias carpetas hermanas: "crea carpetas A, B y C en Proyectos\""""
+        return self.bulk_create(location, folders=folder_names)
+    
+    def load_scaffolds(self) -> dict:
+        """Plantillas de proyecto definidas en configs/skills.yaml"""
+        config_path = Path(__file__).resolve().parent.parent.parent / self.SKILLS_CONFIG
+        try:
+            config = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+        except Exception as e:
+            print(f"[IntelligentFileManager] No se pudo cargar {config_path}: {e}")
+            return {}
+        return config.get("scaffolds", {}) or {}
+    
+    def create_scaffold(self, scaffold_name: str, project_name: str, location: str = None) -> dict:
+        """Crea un proyecto completo a partir de una plantilla de skills.yaml"""
+        scaffolds = self.load_scaffolds()
+        scaffold = scaffolds.get((scaffold_name or "").lower())
+        if not scaffold:
+            available = ", ".join(scaffolds) or "ninguna"
+            return {"success": False, "message": f"❌ No conozco la plantilla '{scaffold_name}'. Disponibles: {available}"}
+        if not project_name:
+            return {"success": False, "message": "❌ Necesito un nombre para el proyecto"}
+        
+        # Solo se sustituye {name}: otras llaves de la plantilla ({{cookiecutter}}, ${VAR}...) se dejan tal cual
+        folders = [project_name] + [f"{project_name}/{str(folder).replace('{name}', project_name)}"
+                                    for folder in scaffold.get("folders", [])]
+        files = {
+            f"{project_name}/{str(relative).replace('{name}', project_name)}": (content or "").replace("{name}", project_name)
+            for relative, content in (scaffold.get("files") or {}).items()
+        }
+        
+        result = self.bulk_create(location, folders=folders, files=files)
+        if result["success"] and not (result["created_folders"] or result["created_files"]):
+            result["message"] = f"⚠️ El proyecto '{project_name}' ya existe en: {Path(result['path']) / project_name}"
+        elif result["success"]:
+            result["message"] = "\n".join([
+                f"✅ Proyecto '{project_name}' ({scaffold_name}) creado en: {Path(result['path']) / project_name}",
+                f"   📦 {len(result['created_folders'])} carpetas y {len(result['created_files'])} archivos"
+            ] + result["details"])
+        return result
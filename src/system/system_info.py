@@ -1,5 +1,6 @@
 import platform
 import os
+import shutil
 from pathlib import Path
 
 class SystemInfo:
@@ -20,15 +21,16 @@ class SystemInfo:
         }
         return "\n".join([f"{k}: {v}" for k, v in info.items()])
 
-    def get_disk_usage(self) -> str:
+    def get_disk_usage(self, path=None) -> str:
         """Obtiene información del uso del disco"""
+        path = Path(path) if path else self.base_path
         try:
-            usage = shutil.disk_usage(self.base_path)
+            usage = shutil.disk_usage(path)
             total_gb = usage.total // (1024**3)
             used_gb = usage.used // (1024**3)
             free_gb = usage.free // (1024**3)
             
-            return (f"Uso del disco en {self.base_path}:\n"
+            return (f"Uso del disco en {path}:\n"
                    f"  Total: {total_gb} GB\n"
                    f"  Usado: {used_gb} GB\n"
                    f"  Libre: {free_gb} GB")
@@ -4,6 +4,7 @@ Utilidades del sistema - STT, TTS, VAD, etc.
 from .stt import SpeechToText
 from .tts import TextToSpeech
 from .vad_recorder import VADRecorder
+from .audio_capture import AudioCapture
 from .voice_loop import VoiceLoop
 from .translation_utils import TranslationUtils, translate_via_llm, validate_translation_semantic
 
@@ -11,6 +12,7 @@ __all__ = [
     'SpeechToText', 
     'TextToSpeech', 
     'VADRecorder', 
+    'AudioCapture',
     'VoiceLoop',
     'TranslationUtils',
     'translate_via_llm', 
@@ -0,0 +1,68 @@
+# [file name]: src/utils/audio_buffer.py
+import wave
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Buffer circular de muestras float32 reservado una sola vez.
+    Escribir copia el bloque dentro del array sin crear objetos por muestra,
+    y leer devuelve una vista sin copia siempre que el tramo pedido no dé
+    la vuelta al final del buffer.
+    Con un escritor y un lector no hace falta lock: write copia los datos
+    antes de avanzar written, y el lector solo lee hasta el written que vio.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self.data = np.zeros(self.capacity, dtype=np.float32)
+        self.written = 0        # muestras escritas desde el principio (no se reinicia al dar la vuelta)
+
+    def __len__(self) -> int:
+        return min(self.written, self.capacity)
+
+    def clear(self):
+        self.written = 0
+
+    def write(self, samples: np.ndarray):
+        """Añade un bloque; si no cabe, se quedan las muestras más recientes"""
+        samples = samples.reshape(-1)
+        if len(samples) > self.capacity:
+            self.written += len(samples) - self.capacity
+            samples = samples[-self.capacity:]
+        count = len(samples)
+        start = self.written % self.capacity
+        first = min(count, self.capacity - start)
+        self.data[start:start + first] = samples[:first]
+        if first < count:
+            self.data[:count - first] = samples[first:]
+        self.written += count
+
+    def read(self, start: int, end: int = None) -> np.ndarray:
+        """
+        Muestras entre dos posiciones absolutas (las de written).
+        Vista sin copia si el tramo es contiguo; copia si da la vuelta.
+        """
+        end = self.written if end is None else min(end, self.written)
+        start = max(start, end - self.capacity, 0)
+        if end <= start:
+            return self.data[:0]
+        first, last = start % self.capacity, end % self.capacity
+        if first < last or last == 0:
+            return self.data[first:last or self.capacity]
+        return np.concatenate((self.data[first:], self.data[:last]))
+
+    def latest(self, count: int) -> np.ndarray:
+        """Las últimas count muestras"""
+        return self.read(self.written - count)
+
+
+def save_wav(path, audio: np.ndarray, sample_rate: int = 16000):
+    """Guarda audio float32 en [-1, 1] como WAV mono de 16 bits"""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm.tobytes())
+    return str(path)
@@ -0,0 +1,113 @@
+# [file name]: src/utils/audio_capture.py
+import threading
+import time
+from .audio_buffer import AudioRingBuffer
+from .audio_sources import AudioSource, SoundDeviceSource
+from .resampler import PolyphaseResampler, downmix
+
+SAMPLE_RATE = 16000
+BLOCK_MS = 30
+HISTORY_SECONDS = 60
+
+
+class AudioCapture:
+    """
+    Captura continua de un AudioSource (el micrófono con un callback de
+    sounddevice, o un WAV/array para pruebas y réplicas sin micrófono).
+    El stream se abre una vez y no se cierra entre turnos: el callback solo
+    copia cada bloque al buffer circular y publica la nueva posición, sin
+    locks (un único escritor, el callback, y un único lector, el grabador).
+    Así no se pierde el audio mientras se transcribe o se habla, y el
+    grabador puede mirar hacia atrás para añadir el pre-roll.
+    La fuente entrega en el formato que admite (muchos micrófonos USB y
+    Bluetooth solo dan 44.1/48 kHz, a veces en estéreo); el callback mezcla
+    a mono y remuestrea a sample_rate antes de escribir en el buffer.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, device=None, block_ms: int = BLOCK_MS,
+                 history_seconds: int = HISTORY_SECONDS, source: AudioSource = None):
+        self.sample_rate = sample_rate
+        self.source = source or SoundDeviceSource(device, sample_rate, block_ms)
+        self.resampler = None
+        self.buffer = AudioRingBuffer(sample_rate * history_seconds)
+        self.open_time = 0.0
+        self.last_block_time = 0.0      # reloj monotónico del último bloque recibido
+        self._data_ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def _on_block(self, indata):
+        # Hilo de la fuente (PortAudio con micrófono): nada de prints ni esperas aquí
+        samples = downmix(indata)
+        if self.resampler is not None:
+            samples = self.resampler.process(samples)
+        self.buffer.write(samples)
+        self.last_block_time = time.monotonic()
+        self._data_ready.set()
+
+    @property
+    def running(self) -> bool:
+        return self.source.active
+
+    @property
+    def overflows(self) -> int:
+        return getattr(self.source, "overflows", 0)
+
+    def start(self):
+        """Abre el stream si no está abierto ya"""
+        with self._lock:
+            if self.running:
+                return
+            started = time.monotonic()
+            self.source.prepare()
+            self.resampler = None
+            if self.source.samplerate != self.sample_rate:
+                self.resampler = PolyphaseResampler(self.source.samplerate, self.sample_rate)
+            self.source.open(self._on_block)
+            self.open_time = time.monotonic() - started
+            conversion = ""
+            if self.resampler or self.source.channels > 1:
+                conversion = f" -> mono {self.sample_rate} Hz"
+            print(f"[AudioCapture] '{self.source.name}' abierto a {self.source.samplerate} Hz, "
+                  f"{self.source.channels} canal(es){conversion} en {self.open_time * 1000:.0f} ms")
+
+    def stop(self):
+        with self._lock:
+            if self.source.active:
+                self.source.close()
+                print(f"[AudioCapture] '{self.source.name}' cerrado")
+
+    def wait_for(self, position: int, timeout: float = 1.0) -> bool:
+        """Espera hasta que el buffer tenga audio hasta position (muestras absolutas)"""
+        # Fuentes sin hilo: se les pide audio hasta llegar (o hasta que se acabe)
+        while self.source.on_demand and self.buffer.written < position:
+            if not self.source.feed_next():
+                return False
+        deadline = time.monotonic() + timeout
+        while self.buffer.written < position:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._data_ready.wait(min(remaining, 0.1))
+            self._data_ready.clear()
+        return True
+
+    def position_time(self, position: int) -> float:
+        """Momento aproximado (time.monotonic) en que se capturó la muestra position"""
+        return self.last_block_time - (self.buffer.written - position) / self.sample_rate
+
+    def oldest_position(self) -> int:
+        """Primera muestra que sigue en el buffer"""
+        return max(0, self.buffer.written - self.buffer.capacity)
+
+
+_shared_capture = None
+_shared_lock = threading.Lock()
+
+
+def get_audio_capture(device=None) -> AudioCapture:
+    """Captura compartida (se abre en el primer start); device solo cuenta la primera vez"""
+    global _shared_capture
+    with _shared_lock:
+        if _shared_capture is None:
+            _shared_capture = AudioCapture(device=device)
+        return _shared_capture
@@ -0,0 +1,203 @@
+# [file name]: src/utils/audio_sources.py
+import threading
+import time
+import wave
+import numpy as np
+from pathlib import Path
+
+COMMON_RATES = (48000, 44100, 32000, 22050)
+
+
+class AudioSource:
+    """
+    Origen de audio para AudioCapture. prepare() fija samplerate y channels;
+    open(on_block) empieza a entregar bloques float32 (frames, canales)
+    llamando a on_block; close() para. Las fuentes on_demand no tienen hilo
+    propio: entregan el siguiente bloque cuando se les pide con feed_next
+    (réplica lo más rápida posible, sin desbordar el buffer).
+    """
+
+    name = "audio"
+    samplerate = 16000
+    channels = 1
+    on_demand = False
+
+    def prepare(self):
+        pass
+
+    def open(self, on_block):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    @property
+    def active(self) -> bool:
+        return False
+
+    @property
+    def finished(self) -> bool:
+        """No va a entregar más audio"""
+        return False
+
+    def feed_next(self) -> bool:
+        return False
+
+
+class SoundDeviceSource(AudioSource):
+    """Micrófono real vía sounddevice, en el formato que admita el dispositivo"""
+
+    def __init__(self, device=None, preferred_rate: int = 16000, block_ms: int = 30):
+        self.device = device
+        self.preferred_rate = preferred_rate
+        self.block_ms = block_ms
+        self.stream = None
+        self.overflows = 0
+
+    def prepare(self):
+        # Import aquí: sin PortAudio (máquinas sin audio) las fuentes de archivo siguen funcionando
+        import sounddevice as sd
+
+        settings = self.probe(sd)
+        self.name, self.samplerate, self.channels = settings["name"], settings["samplerate"], settings["channels"]
+
+    def probe(self, sd) -> dict:
+        """
+        Elige cómo abrir el micrófono: a preferred_rate en mono si el dispositivo
+        lo admite tal cual, y si no a su frecuencia nativa y con los canales que
+        acepte (AudioCapture mezcla a mono y remuestrea).
+        """
+        info = sd.query_devices(self.device, "input")
+        max_channels = max(1, int(info["max_input_channels"]))
+        native = int(info["default_samplerate"])
+        rates = [self.preferred_rate, native] + [rate for rate in COMMON_RATES if rate != native]
+        for rate in rates:
+            for channels in sorted({1, min(2, max_channels), max_channels}):
+                try:
+                    sd.check_input_settings(device=self.device, samplerate=rate, channels=channels, dtype="float32")
+                except Exception:
+                    continue
+                return {"name": info["name"], "samplerate": rate, "channels": channels}
+        raise RuntimeError(f"El micrófono '{info['name']}' no admite ningún formato conocido")
+
+    def open(self, on_block):
+        import sounddevice as sd
+
+        def callback(indata, frames, time_info, status):
+            # Hilo de PortAudio: nada de prints ni esperas aquí
+            if status.input_overflow:
+                self.overflows += 1
+            on_block(indata)
+
+        self.stream = sd.InputStream(
+            device=self.device,
+            channels=self.channels,
+            samplerate=self.samplerate,
+            dtype="float32",
+            blocksize=int(self.samplerate * self.block_ms / 1000),
+            callback=callback,
+        )
+        self.stream.start()
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    @property
+    def active(self) -> bool:
+        return self.stream is not None and self.stream.active
+
+
+class ArraySource(AudioSource):
+    """
+    Reproduce un array como si fuera un micrófono. En tiempo real entrega un
+    bloque cada block_ms desde un hilo; si no, bloque a bloque según lo va
+    consumiendo el grabador. Termina con trailing_silence segundos de
+    silencio para que el endpointer pueda cerrar la última frase.
+    """
+
+    on_demand = False
+
+    def __init__(self, audio: np.ndarray, samplerate: int, realtime: bool = True, block_ms: int = 30,
+                 trailing_silence: float = 2.0, name: str = "array"):
+        audio = np.asarray(audio, dtype=np.float32)
+        if audio.ndim == 1:
+            audio = audio[:, None]
+        silence = np.zeros((int(samplerate * trailing_silence), audio.shape[1]), dtype=np.float32)
+        self.audio = np.concatenate((audio, silence))
+        self.samplerate = samplerate
+        self.channels = audio.shape[1]
+        self.realtime = realtime
+        self.on_demand = not realtime
+        self.block = int(samplerate * block_ms / 1000)
+        self.name = name
+        self.position = 0
+        self._on_block = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / self.samplerate
+
+    def open(self, on_block):
+        self._on_block = on_block
+        self._stop.clear()
+        if self.realtime:
+            self._thread = threading.Thread(target=self._play, name=f"replay-{self.name}", daemon=True)
+            self._thread.start()
+
+    def _play(self):
+        started = time.monotonic()
+        while not self._stop.is_set() and self.feed_next():
+            # Al ritmo del reloj: el bloque n sale cuando "se habría grabado"
+            delay = started + self.position / self.samplerate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def feed_next(self) -> bool:
+        if self._on_block is None or self.position >= len(self.audio):
+            return False
+        block = self.audio[self.position:self.position + self.block]
+        self.position += len(block)
+        self._on_block(block)
+        return True
+
+    def close(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._on_block = None
+
+    @property
+    def active(self) -> bool:
+        return self._on_block is not None and not self.finished
+
+    @property
+    def finished(self) -> bool:
+        return self.position >= len(self.audio)
+
+
+def read_wav(path):
+    """(audio float32 (frames, canales), frecuencia) de un WAV PCM de 16 o 32 bits"""
+    with wave.open(str(path), "rb") as wf:
+        width, channels, rate = wf.getsampwidth(), wf.getnchannels(), wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+    if width == 2:
+        audio = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    elif width == 4:
+        audio = np.frombuffer(raw, dtype=np.int32).astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"{Path(path).name}: WAV de {width * 8} bits no soportado")
+    return audio.reshape(-1, channels), rate
+
+
+class FileSource(ArraySource):
+    """Un WAV grabado reproducido como micrófono (a cualquier frecuencia y canales)"""
+
+    def __init__(self, path, realtime: bool = True, block_ms: int = 30, trailing_silence: float = 2.0):
+        audio, rate = read_wav(path)
+        super().__init__(audio, rate, realtime=realtime, block_ms=block_ms,
+                         trailing_silence=trailing_silence, name=Path(path).name)
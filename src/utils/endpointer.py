@@ -0,0 +1,117 @@
+# [file name]: src/utils/endpointer.py
+import numpy as np
+
+SPEECH = "speech"
+SILENCE = "silence"
+END = "end"
+
+
+def frame_energy_db(frame: np.ndarray) -> float:
+    """Energía RMS de un frame float32 en dBFS"""
+    rms = float(np.sqrt(np.dot(frame, frame) / max(len(frame), 1)))
+    return 20.0 * np.log10(max(rms, 1e-5))
+
+
+class Endpointer:
+    """
+    Decide cuándo ha terminado una frase. Un frame cuenta como voz si el VAD
+    lo marca y además su energía supera el ruido de fondo en margin_db, así
+    el ventilador o el teclado no alargan la espera. El silencio que se
+    aguanta antes de cortar (hangover) se adapta al turno: corto para
+    órdenes breves ("abre terminal"), mayor cuanto más se lleva hablando y
+    nunca menor que las pausas que el usuario ya hizo dentro de la frase.
+    El ruido de fondo se sigue entre turnos.
+    """
+
+    def __init__(self, frame_ms: int = 30, min_hangover_ms: int = 300, max_hangover_ms: int = 1200,
+                 margin_db: float = 6.0, max_seconds: float = 30.0, min_speech_ms: int = 90):
+        self.frame_seconds = frame_ms / 1000
+        self.min_hangover = min_hangover_ms / 1000
+        self.max_hangover = max_hangover_ms / 1000
+        self.margin_db = margin_db
+        self.max_frames = int(max_seconds / self.frame_seconds)
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.noise_floor = None     # dBFS
+        self.reset()
+
+    def reset(self):
+        """Empieza un turno nuevo (el ruido de fondo se conserva)"""
+        self.frames = 0
+        self.onset = None           # índice del primer frame con voz
+        self.last_speech = None     # índice del último frame con voz
+        self.speech_frames = 0
+        self.longest_pause = 0      # frames de la pausa más larga seguida de más voz
+        self.speech_energy = 0.0
+        self.hangover = self.min_hangover
+        self.reason = None
+
+    def _track_noise(self, energy: float):
+        if self.noise_floor is None:
+            self.noise_floor = energy
+        elif energy < self.noise_floor:
+            self.noise_floor += 0.3 * (energy - self.noise_floor)     # baja rápido
+        else:
+            self.noise_floor += 0.02 * (energy - self.noise_floor)    # sube despacio
+        self.noise_floor = max(self.noise_floor, -90.0)
+
+    def _compute_hangover(self) -> float:
+        voiced = self.speech_frames * self.frame_seconds
+        # Hasta ~0.6 s de voz es una orden corta; a partir de ~2.6 s, máxima paciencia
+        growth = min(1.0, max(0.0, (voiced - 0.6) / 2.0))
+        hangover = self.min_hangover + (self.max_hangover - self.min_hangover) * growth
+        # Quien hace pausas al hablar necesita que se respeten
+        hangover = max(hangover, self.longest_pause * self.frame_seconds * 1.25)
+        # Con poca relación señal/ruido el VAD duda más: algo más de margen
+        if self.speech_frames and self.mean_snr < 15.0:
+            hangover += 0.1
+        return min(max(hangover, self.min_hangover), self.max_hangover)
+
+    def update(self, frame: np.ndarray, vad_speech: bool) -> str:
+        """Procesa un frame; devuelve SPEECH, SILENCE o END (frase terminada)"""
+        energy = frame_energy_db(frame)
+        floor = self.noise_floor if self.noise_floor is not None else energy
+        is_speech = vad_speech and energy > floor + self.margin_db
+        index = self.frames
+        self.frames += 1
+
+        if not is_speech:
+            self._track_noise(energy)
+            if self.onset is None:
+                return SILENCE
+            silence = (index - self.last_speech) * self.frame_seconds
+            if silence >= self.hangover:
+                self.reason = "silence"
+                return END
+            return SILENCE
+
+        if self.onset is None:
+            self.onset = index
+        elif index - self.last_speech > 1:
+            self.longest_pause = max(self.longest_pause, index - self.last_speech - 1)
+        self.last_speech = index
+        self.speech_frames += 1
+        self.speech_energy += energy
+        self.hangover = self._compute_hangover()
+        if index - self.onset >= self.max_frames:
+            self.reason = "max_duration"
+            return END
+        return SPEECH
+
+    @property
+    def mean_snr(self) -> float:
+        """dB medios de los frames con voz sobre el ruido de fondo"""
+        if not self.speech_frames or self.noise_floor is None:
+            return 0.0
+        return self.speech_energy / self.speech_frames - self.noise_floor
+
+    @property
+    def voiced_density(self) -> float:
+        """Fracción de frames con voz entre el primero y el último (los tecleos dan poca)"""
+        if self.onset is None:
+            return 0.0
+        return self.speech_frames / (self.last_speech - self.onset + 1)
+
+    @property
+    def has_speech(self) -> bool:
+        """Hubo voz suficiente para no ser un golpe o un clic"""
+        return self.speech_frames >= self.min_speech_frames
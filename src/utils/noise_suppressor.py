@@ -0,0 +1,56 @@
+# [file name]: src/utils/noise_suppressor.py
+import numpy as np
+
+
+class NoiseSuppressor:
+    """
+    Puerta espectral con perfil de ruido en marcha. Procesa bloques de
+    frames de una vez (una rfft por fila): cada bin se atenúa según cuánto
+    supera al perfil de ruido, y el perfil se actualiza con los frames cuyo
+    nivel está cerca del ruido. La salida es para el VAD y el endpointer;
+    a Whisper le llega el audio original, que tolera mejor el ruido que los
+    artefactos del filtrado.
+    """
+
+    def __init__(self, frame_size: int = 480, sample_rate: int = 16000, over_subtraction: float = 1.5,
+                 min_gain: float = 0.1, adapt_rate: float = 0.05, noise_margin: float = 2.0,
+                 speech_band=(300, 3400)):
+        self.frame_size = frame_size
+        self.over_subtraction = over_subtraction
+        self.min_gain = min_gain
+        self.adapt_rate = adapt_rate
+        self.noise_margin = noise_margin        # nivel (lineal) hasta el que un frame se considera ruido
+        freqs = np.fft.rfftfreq(frame_size, 1.0 / sample_rate)
+        self.speech_bins = (freqs >= speech_band[0]) & (freqs <= speech_band[1])
+        self.noise = None                       # magnitud media del ruido por bin
+        self.frames_processed = 0
+        self.noise_frames = 0
+
+    def process(self, frames: np.ndarray) -> np.ndarray:
+        """frames: (n, frame_size) float32 -> mismos frames con el ruido atenuado"""
+        spectrum = np.fft.rfft(frames, axis=1)
+        magnitude = np.abs(spectrum)
+        if self.noise is None:
+            self.noise = magnitude.min(axis=0)
+
+        # Actualizar el perfil con los frames que suenan a ruido
+        levels = magnitude.sum(axis=1)
+        quiet = levels < self.noise.sum() * self.noise_margin
+        if quiet.any():
+            observed = magnitude[quiet].mean(axis=0)
+            rate = self.adapt_rate if observed.sum() >= self.noise.sum() else 0.3   # baja rápido
+            self.noise += rate * (observed - self.noise)
+            self.noise_frames += int(quiet.sum())
+
+        gain = 1.0 - self.over_subtraction * self.noise / np.maximum(magnitude, 1e-9)
+        np.clip(gain, self.min_gain, 1.0, out=gain)
+        self.frames_processed += len(frames)
+        return np.fft.irfft(spectrum * gain, n=self.frame_size, axis=1).astype(np.float32)
+
+    def speech_band_ratio(self, frames: np.ndarray) -> float:
+        """Fracción de la energía en la banda de voz (ventiladores y teclados caen fuera)"""
+        if len(frames) == 0:
+            return 0.0
+        power = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+        total = power.sum()
+        return float(power[:, self.speech_bins].sum() / total) if total > 0 else 0.0
@@ -0,0 +1,175 @@
+# [file name]: src/utils/replay.py
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from .audio_capture import AudioCapture
+from .audio_sources import FileSource
+from .vad_recorder import VADRecorder
+
+STAGES = ("vad", "endpoint_latency", "stt", "router", "tts", "total")
+
+
+class ReplayHarness:
+    """
+    Pasa WAVs grabados por el mismo camino que la voz en vivo
+    (captura -> VAD -> STT -> Router -> TTS) sin micrófono ni altavoces,
+    y mide cada etapa. En tiempo real el audio llega al ritmo del reloj
+    (latencias como las de un usuario); en modo rápido se consume tan
+    deprisa como lo procesa el VAD.
+    Los componentes se pasan ya creados: el mismo STT sirve para todos los
+    archivos y un componente a None se salta.
+    """
+
+    def __init__(self, stt=None, router=None, tts=None, realtime: bool = True,
+                 noise_suppression: bool = False, wake_word=None, streaming=None):
+        self.stt = stt
+        self.router = router
+        self.tts = tts
+        self.realtime = realtime
+        self.noise_suppression = noise_suppression
+        self.wake_word = wake_word
+        self.streaming = streaming          # StreamingTranscriber que sustituye al STT por lotes
+        self.results = []
+
+    def run_file(self, path) -> list:
+        """Todas las frases de un WAV; devuelve un registro de tiempos por frase"""
+        source = FileSource(path, realtime=self.realtime)
+        capture = AudioCapture(source=source)
+        recorder = VADRecorder(capture=capture, noise_suppression=self.noise_suppression)
+        turns = []
+        print(f"[Replay] {source.name}: {source.duration:.1f}s de audio "
+              f"({'tiempo real' if self.realtime else 'lo más rápido posible'})")
+        try:
+            while True:
+                turn = self._run_turn(recorder, source.name, len(turns) + 1)
+                if turn:
+                    turns.append(turn)
+                elif source.finished:
+                    break
+        finally:
+            capture.stop()
+        self.results.extend(turns)
+        return turns
+
+    def _run_turn(self, recorder: VADRecorder, name: str, number: int):
+        started = time.perf_counter()
+        if self.streaming:
+            self.streaming.start()
+        audio = recorder.record(timeout=5, on_audio=self.streaming.feed if self.streaming else None)
+        vad_done = time.perf_counter()
+        if self.wake_word and audio is not None and len(audio):
+            audio = self.wake_word.gate(audio)
+        if audio is None or len(audio) == 0:
+            if self.streaming:
+                self.streaming.cancel()
+            return None
+
+        turn = {"file": name, "turn": number, "audio_seconds": round(len(audio) / 16000, 3),
+                "vad": vad_done - started, "endpoint_latency": recorder.mark_stt_start()}
+        text = response = ""
+        if self.streaming:
+            # Solo cuenta lo que queda tras el fin de la frase: la pasada final
+            stage = time.perf_counter()
+            text = self.streaming.finish()
+            turn["stt"] = time.perf_counter() - stage
+        elif self.stt:
+            stage = time.perf_counter()
+            text = self.stt.transcribe(audio, lang="es")
+            turn["stt"] = time.perf_counter() - stage
+        if self.router and text:
+            stage = time.perf_counter()
+            response = self.router.auto_send(text)
+            turn["router"] = time.perf_counter() - stage
+        if self.tts and response:
+            stage = time.perf_counter()
+            fd, out_wav = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                self.tts.speak(response, output=out_wav)
+            finally:
+                os.remove(out_wav)
+            turn["tts"] = time.perf_counter() - stage
+        turn["total"] = time.perf_counter() - started
+        turn["text"], turn["response"] = text, response
+        print(f"[Replay] {name} #{number}: " + ", ".join(
+            f"{stage} {turn[stage] * 1000:.0f} ms" for stage in STAGES if stage in turn) + f" -> '{text}'")
+        return turn
+
+    def summary(self) -> dict:
+        """Media, p50, p95 y máximo por etapa (en ms)"""
+        result = {}
+        for stage in STAGES:
+            values = sorted(turn[stage] * 1000 for turn in self.results if stage in turn)
+            if not values:
+                continue
+            result[stage] = {
+                "turns": len(values),
+                "mean": round(statistics.fmean(values), 1),
+                "p50": round(values[len(values) // 2], 1),
+                "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 1),
+                "max": round(values[-1], 1),
+            }
+        return result
+
+    def write(self, output):
+        """Guarda turnos y resumen en JSON"""
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        data = {"realtime": self.realtime, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "turns": self.results, "summary": self.summary()}
+        output.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[Replay] Tiempos guardados en {output}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reproduce WAVs por el camino de voz y mide cada etapa")
+    parser.add_argument("wavs", nargs="+", help="Archivos WAV (o carpetas con WAVs)")
+    parser.add_argument("--fast", action="store_true", help="No esperar al reloj: lo más rápido posible")
+    parser.add_argument("--output", default="replay_timings.json", help="JSON con los tiempos")
+    parser.add_argument("--model", help="Modelo de Whisper (sustituye al del perfil)")
+    parser.add_argument("--stt-profile", help="Perfil de configs/stt.yaml (por defecto el de la configuración)")
+    parser.add_argument("--no-stt", action="store_true", help="Solo captura y VAD")
+    parser.add_argument("--no-router", action="store_true", help="No enviar el texto al Router")
+    parser.add_argument("--no-tts", action="store_true", help="No sintetizar la respuesta")
+    parser.add_argument("--suppress-noise", action="store_true", help="Activar la supresión de ruido")
+    parser.add_argument("--streaming-stt", action="store_true", help="Transcribir mientras llega el audio")
+    args = parser.parse_args()
+
+    paths = []
+    for item in map(Path, args.wavs):
+        paths.extend(sorted(item.glob("*.wav")) if item.is_dir() else [item])
+
+    # Imports aquí: solo se cargan los modelos de las etapas que se usan
+    stt = router = tts = None
+    if not args.no_stt:
+        from .stt import SpeechToText
+        stt = SpeechToText(model_size=args.model, device="cpu", profile=args.stt_profile)
+    if not args.no_router:
+        from src.routes.router import Router
+        router = Router()
+    if not args.no_tts:
+        from .tts import TextToSpeech
+        tts = TextToSpeech()
+
+    streaming = None
+    if stt and args.streaming_stt:
+        from .streaming_stt import StreamingTranscriber
+        streaming = StreamingTranscriber(stt, lang="es")
+
+    harness = ReplayHarness(stt, router, tts, realtime=not args.fast, noise_suppression=args.suppress_noise,
+                            streaming=streaming)
+    for path in paths:
+        harness.run_file(path)
+    harness.write(args.output)
+    for stage, values in harness.summary().items():
+        print(f"  {stage:<17} media {values['mean']:>8.1f} ms   p95 {values['p95']:>8.1f} ms   "
+              f"máx {values['max']:>8.1f} ms   ({values['turns']} turnos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# [file name]: src/utils/resampler.py
+from math import gcd, ceil
+import numpy as np
+
+
+def design_lowpass(up: int, down: int, taps_per_phase: int, beta: float = 8.0):
+    """
+    FIR paso bajo (sinc con ventana de Kaiser) para remuestrear por up/down.
+    El centro cae en un múltiplo de down: el retardo es un número entero de
+    muestras de salida. Devuelve (coeficientes, retardo en muestras de salida).
+    """
+    length = up * taps_per_phase
+    center = down * int(((length - 1) / 2) // down)
+    cutoff = 0.9 / max(up, down)           # por debajo de la nueva Nyquist
+    n = np.arange(length) - center
+    window = np.kaiser(2 * max(center, length - 1 - center) + 1, beta)
+    offset = max(center, length - 1 - center) - center
+    taps = cutoff * np.sinc(cutoff * n) * window[offset:offset + length]
+    return taps * up / taps.sum(), center // down    # ganancia unidad tras intercalar ceros
+
+
+class PolyphaseResampler:
+    """
+    Remuestreo racional up/down en streaming (48000 -> 16000 es 1/3,
+    44100 -> 16000 es 160/441). Cada muestra de salida usa una sola fase
+    del filtro, así que el coste es taps_per_phase multiplicaciones por
+    muestra de salida, calculadas para todo el bloque con una gather y un
+    einsum. Conserva la historia entre bloques: se puede llamar con
+    bloques de cualquier tamaño sin saltos en las costuras.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int, taps_per_phase: int = 16):
+        divisor = gcd(int(in_rate), int(out_rate))
+        self.up = int(out_rate) // divisor
+        self.down = int(in_rate) // divisor
+        # Al diezmar el filtro tiene que ser más largo para cortar igual de bien
+        self.taps = taps_per_phase * max(1, ceil(self.down / self.up))
+        taps, self.delay = design_lowpass(self.up, self.down, self.taps)
+        # phases[p, j] = h[p + up * j]
+        self.phases = taps.reshape(self.taps, self.up).T.astype(np.float32)
+        self.reset()
+
+    def reset(self):
+        # Antes del primer bloque se supone silencio
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._history_start = -(self.taps - 1)     # índice global de _history[0]
+        self._consumed = 0                          # muestras de entrada recibidas
+        self._produced = 0                          # muestras de salida entregadas
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Bloque de entrada -> todas las muestras de salida que ya se pueden calcular"""
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        if self.up == self.down:
+            return samples
+        data = np.concatenate((self._history, samples))
+        self._consumed += len(samples)
+
+        # Salida k usa las entradas (k * down) // up - j, j = 0 .. taps-1
+        last = (self._consumed * self.up - 1) // self.down
+        outputs = np.arange(self._produced, last + 1, dtype=np.int64)
+        if len(outputs):
+            position = outputs * self.down
+            base = position // self.up - self._history_start
+            window = data[base[:, None] - np.arange(self.taps)[None, :]]
+            result = np.einsum("ij,ij->i", window, self.phases[position % self.up])
+            self._produced = last + 1
+        else:
+            result = np.zeros(0, dtype=np.float32)
+
+        # Solo hace falta guardar lo que usará la siguiente muestra de salida
+        keep_from = (self._produced * self.down) // self.up - (self.taps - 1)
+        self._history = data[keep_from - self._history_start:].copy()
+        self._history_start = keep_from
+        return result.astype(np.float32, copy=False)
+
+
+def downmix(block: np.ndarray) -> np.ndarray:
+    """(frames, canales) -> mono"""
+    if block.ndim == 1:
+        return block
+    if block.shape[1] == 1:
+        return block[:, 0]
+    return block.mean(axis=1, dtype=np.float32)
+
+
+def resample(audio: np.ndarray, in_rate: int, out_rate: int) -> np.ndarray:
+    """Remuestrea un array completo (compensando el retardo del filtro)"""
+    if in_rate == out_rate:
+        return audio.astype(np.float32, copy=False)
+    resampler = PolyphaseResampler(in_rate, out_rate)
+    expected = int(round(len(audio) * out_rate / in_rate))
+    padding = np.zeros(resampler.taps, dtype=np.float32)
+    result = resampler.process(np.concatenate((audio.astype(np.float32), padding)))
+    return result[resampler.delay:resampler.delay + expected]
@@ -0,0 +1,182 @@
+# [file name]: src/utils/streaming_stt.py
+import re
+import threading
+import time
+import numpy as np
+from .stt import SpeechToText
+
+SAMPLE_RATE = 16000
+
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+class StreamingTranscriber:
+    """
+    Transcribe mientras el usuario sigue hablando. Un hilo vuelve a decodificar
+    la ventana de audio cada min_chunk segundos nuevos; las palabras en las que
+    coinciden dos decodificaciones seguidas quedan confirmadas (no cambian más)
+    y el audio que ya cubren sale de la ventana, así cada pasada solo decodifica
+    la cola. Al terminar la frase, finish() hace una pasada final corta sobre
+    lo que falta por confirmar.
+    on_partial(confirmado, provisional) recibe los parciales según llegan.
+    """
+
+    def __init__(self, stt: SpeechToText, lang: str = "es", min_chunk: float = 1.0, max_window: float = 15.0,
+                 partial_beam: int = 1, final_beam: int = None, on_partial=None):
+        self.stt = stt
+        self.lang = lang
+        self.min_chunk = int(min_chunk * SAMPLE_RATE)
+        self.max_window = int(max_window * SAMPLE_RATE)
+        self.partial_beam = partial_beam
+        self.final_beam = final_beam        # None: el beam del perfil de STT activo
+        self.on_partial = on_partial
+        self._lock = threading.Lock()
+        self._new_audio = threading.Event()
+        self._thread = None
+        self._reset()
+
+    def _reset(self):
+        self._chunks = []               # audio recibido que aún no se ha pasado a la ventana
+        self.window = np.zeros(0, dtype=np.float32)
+        self.window_start = 0.0         # segundos desde el inicio de la frase
+        self.committed = []             # [(inicio, fin, palabra)] confirmadas, tiempos absolutos
+        self.hypothesis = []            # última decodificación sin confirmar
+        self.decoded_samples = 0        # tamaño de la ventana en la última decodificación
+        self.passes = 0
+        self.decode_time = 0.0
+        self._stop = False
+
+    # ---------------------------------------------------------------- entrada
+    def start(self):
+        """Empieza una frase nueva"""
+        self.cancel()
+        self._reset()
+        self._thread = threading.Thread(target=self._run, name="streaming-stt", daemon=True)
+        self._thread.start()
+
+    @property
+    def active(self) -> bool:
+        """Hay una frase en curso (start() sin finish() ni cancel())"""
+        return self._thread is not None
+
+    def feed(self, samples: np.ndarray):
+        """Audio nuevo de la frase en curso (float32, 16 kHz)"""
+        with self._lock:
+            self._chunks.append(samples)
+        self._new_audio.set()
+
+    def _take_audio(self):
+        with self._lock:
+            chunks, self._chunks = self._chunks, []
+        if chunks:
+            self.window = np.concatenate([self.window] + chunks)
+
+    # ---------------------------------------------------------- decodificación
+    def _run(self):
+        while not self._stop:
+            self._new_audio.wait(0.1)
+            self._new_audio.clear()
+            if self._stop:
+                break
+            self._take_audio()
+            if len(self.window) - self.decoded_samples < self.min_chunk:
+                continue
+            try:
+                self._partial_pass()
+            except Exception as e:
+                print(f"[StreamingSTT] Error en una pasada parcial: {e}")
+
+    def _prompt(self) -> str:
+        """Lo ya confirmado como contexto (los últimos ~200 caracteres)"""
+        return "".join(word for _, _, word in self.committed)[-200:] or None
+
+    def _decode(self, beam_size: int) -> list:
+        started = time.perf_counter()
+        words = self.stt.transcribe_words(self.window, self.lang, beam_size=beam_size, initial_prompt=self._prompt())
+        self.decode_time += time.perf_counter() - started
+        self.passes += 1
+        self.decoded_samples = len(self.window)
+        words = [(start + self.window_start, end + self.window_start, word) for start, end, word in words]
+        return self._drop_overlap(words)
+
+    def _drop_overlap(self, words: list) -> list:
+        """Quita del principio lo que ya está confirmado (por tiempo y por n-gramas repetidos)"""
+        if not self.committed:
+            return words
+        committed_end = self.committed[-1][1]
+        words = [w for w in words if w[1] > committed_end - 0.05]
+        tail = [_normalize(w[2]) for w in self.committed[-5:]]
+        for size in range(min(5, len(words), len(tail)), 0, -1):
+            head = [_normalize(w[2]) for w in words[:size]]
+            if head == tail[-size:] and words[0][0] < committed_end + 1.0:
+                return words[size:]
+        return words
+
+    def _partial_pass(self):
+        words = self._decode(self.partial_beam)
+        # Acuerdo local: se confirma el prefijo común con la decodificación anterior
+        agreed = 0
+        while (agreed < len(words) and agreed < len(self.hypothesis)
+               and _normalize(words[agreed][2]) == _normalize(self.hypothesis[agreed][2])):
+            agreed += 1
+        self.committed.extend(words[:agreed])
+        self.hypothesis = words[agreed:]
+
+        if len(self.window) > self.max_window and not agreed and self.hypothesis:
+            # Ventana demasiado larga sin acuerdos: se confirma lo que hay
+            self.committed.extend(self.hypothesis)
+            self.hypothesis = []
+        self._trim_window()
+        if self.on_partial:
+            self.on_partial(self.committed_text, self.text_from(self.hypothesis))
+
+    def _trim_window(self):
+        """El audio cubierto por palabras confirmadas no se vuelve a decodificar"""
+        if not self.committed:
+            return
+        cut = int((self.committed[-1][1] - self.window_start) * SAMPLE_RATE)
+        if cut <= 0:
+            return
+        cut = min(cut, len(self.window))
+        self.window = self.window[cut:]
+        self.window_start += cut / SAMPLE_RATE
+        self.decoded_samples = max(0, self.decoded_samples - cut)
+
+    # ------------------------------------------------------------------ salida
+    @staticmethod
+    def text_from(words: list) -> str:
+        return "".join(word for _, _, word in words).strip()
+
+    @property
+    def committed_text(self) -> str:
+        return self.text_from(self.committed)
+
+    def _stop_worker(self):
+        self._stop = True
+        self._new_audio.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def finish(self) -> str:
+        """Fin de la frase: pasada final sobre la cola sin confirmar; devuelve el texto completo"""
+        self._stop_worker()
+        self._take_audio()
+        self._trim_window()
+        started = time.perf_counter()
+        tail_seconds = len(self.window) / SAMPLE_RATE
+        beam = self.final_beam or self.stt.settings["beam_size"]
+        tail = self._decode(beam) if len(self.window) else []
+        text = self.text_from(self.committed + tail)
+        print(f"[StreamingSTT] Pasada final de {tail_seconds:.1f}s en {(time.perf_counter() - started) * 1000:.0f} ms "
+              f"({len(self.committed)} palabras ya confirmadas, {self.passes} pasadas, "
+              f"{self.decode_time:.1f}s decodificando)")
+        return text
+
+    def cancel(self):
+        """Descarta la frase en curso (era ruido o no iba dirigida a Margarita)"""
+        self._stop_worker()
+        with self._lock:
+            self._chunks = []
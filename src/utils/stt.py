@@ -1,21 +1,194 @@
 # src/stt.py
-from faster_whisper import WhisperModel
+import os
+from pathlib import Path
+from typing import Union
+import numpy as np
+import yaml
+from faster_whisper import WhisperModel, decode_audio
+try:
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:     # faster-whisper < 1.0: sin inferencia por lotes
+    BatchedInferencePipeline = None
+
+DEFAULT_CONFIG = "configs/stt.yaml"
+SAMPLE_RATE = 16000
+
+# Si falta configs/stt.yaml: el comportamiento de siempre (small, decodificación por defecto)
+FALLBACK_PROFILE = {"model": "small", "compute_type": "default", "cpu_threads": "auto", "beam_size": 5,
+                    "vad_filter": False, "without_timestamps": False, "aliases": []}
+
+
+def load_stt_config(config_file: str = DEFAULT_CONFIG) -> dict:
+    """configs/stt.yaml tal cual (vacío si no se puede leer)"""
+    config_path = Path(__file__).resolve().parent.parent.parent / config_file
+    try:
+        return yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+    except Exception as e:
+        print(f"[SpeechToText] No se pudo cargar {config_path}: {e}")
+        return {}
+
+
+def resolve_cpu_threads(value) -> int:
+    """cpu_threads de un perfil: "auto" = núcleos disponibles para este proceso; 0 = lo que elija CTranslate2"""
+    if value in (None, "auto"):
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:      # macOS / Windows
+            return os.cpu_count() or 4
+    return int(value)
+
+
+def load_stt_profiles(config_file: str = DEFAULT_CONFIG):
+    """(perfiles, nombre del perfil por defecto) de configs/stt.yaml"""
+    config = load_stt_config(config_file)
+    profiles = {name: {**FALLBACK_PROFILE, **(settings or {})}
+                for name, settings in (config.get("profiles") or {}).items()}
+    if not profiles:
+        profiles = {"default": dict(FALLBACK_PROFILE)}
+    default = config.get("default")
+    return profiles, default if default in profiles else next(iter(profiles))
+
 
 class SpeechToText:
-    def __init__(self, model_size="small", device="cpu"):
-        self.model = WhisperModel(model_size, device=device)
+    """
+    Whisper con perfiles de latencia/precisión (configs/stt.yaml). Cada perfil
+    fija modelo, tipo de cómputo, hilos y opciones de decodificación; se puede
+    cambiar en marcha con set_profile y los modelos ya cargados se reutilizan.
+    model_size, si se pasa, sustituye al modelo del perfil.
+    """
+
+    def __init__(self, model_size=None, device="cpu", profile=None):
+        self.device = device
+        self.model_size = model_size
+        self.profiles, self.default_profile = load_stt_profiles()
+        self._models = {}
+        self._pipelines = {}
+        self.profile = None
+        self.set_profile(profile or self.default_profile)
+
+    def resolve_profile(self, name: str):
+        """Nombre o alias de un perfil ("preciso" -> "accurate"); None si no existe"""
+        name = (name or "").strip().lower()
+        for profile, settings in self.profiles.items():
+            if name == profile or name in [alias.lower() for alias in settings["aliases"]]:
+                return profile
+        return None
+
+    def set_profile(self, name: str) -> str:
+        """Activa un perfil (cargando su modelo si hace falta); devuelve su nombre"""
+        profile = self.resolve_profile(name)
+        if profile is None:
+            raise ValueError(f"Perfil de STT desconocido: '{name}' (disponibles: {', '.join(self.profiles)})")
+        settings = dict(self.profiles[profile])
+        if self.model_size:
+            settings["model"] = self.model_size
+        settings["cpu_threads"] = resolve_cpu_threads(settings["cpu_threads"])
+        key = (settings["model"], self.device, settings["compute_type"], settings["cpu_threads"])
+        if key not in self._models:
+            print(f"[SpeechToText] Cargando Whisper '{settings['model']}' ({settings['compute_type']}, "
+                  f"{settings['cpu_threads'] or 'por defecto de CTranslate2: 4'} hilos)...")
+            self._models[key] = WhisperModel(settings["model"], device=self.device,
+                                             compute_type=settings["compute_type"],
+                                             cpu_threads=settings["cpu_threads"])
+        self.model, self._model_key = self._models[key], key
+        self.profile, self.settings = profile, settings
+        print(f"[SpeechToText] Perfil '{profile}': modelo {settings['model']}, beam {settings['beam_size']}")
+        return profile
 
-    def transcribe(self, audio_path: str, lang="es") -> str:
+    def transcribe(self, audio: Union[str, np.ndarray], lang="es") -> str:
         """
-        Transcribe un archivo de audio a texto.
+        Transcribe audio a texto: ruta a un archivo o array float32 mono a 16 kHz
+        (lo que devuelve VADRecorder.record, sin pasar por disco).
         """
-        segments, info = self.model.transcribe(audio_path, language=lang)
+        if isinstance(audio, np.ndarray):
+            if len(audio) == 0:
+                return ""
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+        segments, info = self.model.transcribe(
+            audio, language=lang, beam_size=self.settings["beam_size"],
+            vad_filter=self.settings["vad_filter"], without_timestamps=self.settings["without_timestamps"],
+        )
         text = " ".join([seg.text for seg in segments])
         return text.strip()
 
+    def load_audio(self, path) -> np.ndarray:
+        """Cualquier formato que lea PyAV (wav, mp3, m4a, ogg...) -> float32 mono a 16 kHz"""
+        return decode_audio(str(path), sampling_rate=16000)
+
+    def transcribe_batched(self, audio: np.ndarray, lang="es", batch_size=8) -> str:
+        """
+        Grabaciones largas: faster-whisper las trocea por silencios y decodifica
+        los trozos de batch_size en batch_size (una grabación de menos de 30 s
+        es un solo trozo: para esas, transcribe_clips). Sin
+        BatchedInferencePipeline (versiones antiguas) se transcribe de la forma normal.
+        """
+        if len(audio) == 0:
+            return ""
+        if BatchedInferencePipeline is None:
+            return self.transcribe(audio, lang)
+        segments, info = self._batched_pipeline().transcribe(
+            np.ascontiguousarray(audio, dtype=np.float32), language=lang, batch_size=batch_size,
+            beam_size=self.settings["beam_size"], without_timestamps=self.settings["without_timestamps"],
+        )
+        return " ".join(seg.text.strip() for seg in segments).strip()
+
+    def _batched_pipeline(self):
+        pipeline = self._pipelines.get(self._model_key)
+        if pipeline is None:
+            pipeline = self._pipelines[self._model_key] = BatchedInferencePipeline(model=self.model)
+        return pipeline
+
+    def transcribe_clips(self, clips: list, lang="es", batch_size=8) -> list:
+        """
+        Varias grabaciones cortas (hasta 30 s cada una) decodificadas juntas:
+        se ponen una tras otra separadas por silencio y cada una es un trozo
+        del mismo lote. Devuelve un texto por grabación.
+        """
+        if BatchedInferencePipeline is None:
+            return [self.transcribe(clip, lang) for clip in clips]
+        gap = np.zeros(SAMPLE_RATE // 2, dtype=np.float32)
+        parts, starts, spans, position = [], [], [], 0
+        for clip in clips:
+            if len(clip):
+                starts.append(position / SAMPLE_RATE)
+                spans.append({"start": position / SAMPLE_RATE, "end": (position + len(clip)) / SAMPLE_RATE})
+            else:
+                starts.append(None)
+            parts += [np.asarray(clip, dtype=np.float32), gap]
+            position += len(clip) + len(gap)
+        texts = [[] for _ in clips]
+        if not spans:
+            return ["" for _ in clips]
+        segments, info = self._batched_pipeline().transcribe(
+            np.concatenate(parts), language=lang, batch_size=batch_size, beam_size=self.settings["beam_size"],
+            without_timestamps=self.settings["without_timestamps"], vad_filter=False, clip_timestamps=spans,
+        )
+        # Cada segmento pertenece a la última grabación que empieza antes que él
+        valid = [(start, index) for index, start in enumerate(starts) if start is not None]
+        for segment in segments:
+            owner = valid[0][1]
+            for start, index in valid:
+                if start <= segment.start + 0.01:
+                    owner = index
+            texts[owner].append(segment.text.strip())
+        return [" ".join(parts).strip() for parts in texts]
+
+    def transcribe_words(self, audio: np.ndarray, lang="es", beam_size=1, initial_prompt=None) -> list:
+        """
+        Palabras con tiempos [(inicio, fin, palabra)] en segundos desde el
+        comienzo del array. Para la transcripción en streaming.
+        """
+        if len(audio) == 0:
+            return []
+        segments, info = self.model.transcribe(
+            np.ascontiguousarray(audio, dtype=np.float32), language=lang, beam_size=beam_size,
+            word_timestamps=True, initial_prompt=initial_prompt, condition_on_previous_text=False,
+        )
+        return [(word.start, word.end, word.word) for segment in segments for word in (segment.words or [])]
+
 
 # --- Ejemplo de uso ---
 if __name__ == "__main__":
-    stt = SpeechToText(model_size="small", device="cpu")
+    stt = SpeechToText(device="cpu")
     text = stt.transcribe("src/test/test.wav", lang="es")
     print("Reconocido:", text)
@@ -0,0 +1,110 @@
+# [file name]: src/utils/stt_benchmark.py
+import json
+import re
+import time
+import unicodedata
+from pathlib import Path
+from .audio_sources import read_wav
+from .resampler import downmix, resample
+
+
+def normalize_words(text: str) -> list:
+    """Minúsculas, sin puntuación ni tildes: 'Abre Firefox.' y 'abre firefox' cuentan igual"""
+    text = unicodedata.normalize("NFD", text.lower())
+    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+    return re.findall(r"\w+", text)
+
+
+def word_errors(reference: list, hypothesis: list) -> int:
+    """Sustituciones + inserciones + borrados (distancia de edición por palabras)"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def load_samples(folder) -> list:
+    """
+    [(nombre, audio 16 kHz, texto de referencia)]: cada WAV de la carpeta con
+    un .txt del mismo nombre al lado con lo que se dice en él.
+    """
+    samples = []
+    for wav in sorted(Path(folder).glob("*.wav")):
+        reference = wav.with_suffix(".txt")
+        if not reference.exists():
+            print(f"[STTBenchmark] {wav.name} sin {reference.name}, se omite")
+            continue
+        audio, rate = read_wav(wav)
+        samples.append((wav.name, resample(downmix(audio), rate, 16000), reference.read_text(encoding="utf-8")))
+    return samples
+
+
+def benchmark_profile(stt, profile: str, samples: list, lang: str = "es") -> dict:
+    """RTF (tiempo de cómputo / duración del audio) y WER de un perfil sobre las muestras"""
+    started = time.perf_counter()
+    stt.set_profile(profile)
+    load_seconds = time.perf_counter() - started
+    # Una pasada de calentamiento: la primera llamada paga inicializaciones de CTranslate2
+    stt.transcribe(samples[0][1][:16000], lang=lang)
+
+    audio_seconds = compute_seconds = 0.0
+    errors = reference_words = 0
+    for name, audio, reference in samples:
+        started = time.perf_counter()
+        text = stt.transcribe(audio, lang=lang)
+        elapsed = time.perf_counter() - started
+        ref, hyp = normalize_words(reference), normalize_words(text)
+        sample_errors = word_errors(ref, hyp)
+        audio_seconds += len(audio) / 16000
+        compute_seconds += elapsed
+        errors += sample_errors
+        reference_words += len(ref)
+        if sample_errors:
+            print(f"  {name}: '{text}' (esperado '{reference.strip()}')")
+    return {
+        "profile": profile,
+        "model": stt.settings["model"],
+        "beam_size": stt.settings["beam_size"],
+        "load_seconds": round(load_seconds, 2),
+        "audio_seconds": round(audio_seconds, 2),
+        "rtf": round(compute_seconds / audio_seconds, 3) if audio_seconds else None,
+        "wer": round(errors / reference_words, 4) if reference_words else None,
+    }
+
+
+def main():
+    import argparse
+    from .stt import SpeechToText
+
+    parser = argparse.ArgumentParser(description="Compara los perfiles de STT: velocidad (RTF) y errores (WER)")
+    parser.add_argument("samples", help="Carpeta con WAVs y su transcripción en un .txt del mismo nombre")
+    parser.add_argument("--profiles", nargs="+", help="Perfiles a medir (por defecto todos)")
+    parser.add_argument("--output", help="Guardar los resultados en JSON")
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples)
+    if not samples:
+        print(f"❌ No hay muestras en {args.samples} (WAV + .txt con la transcripción)")
+        return
+    print(f"[STTBenchmark] {len(samples)} muestras, {sum(len(a) for _, a, _ in samples) / 16000:.1f}s de audio")
+
+    stt = SpeechToText(device="cpu")
+    results = []
+    for profile in args.profiles or list(stt.profiles):
+        print(f"\n⏱️ Perfil '{profile}'")
+        results.append(benchmark_profile(stt, profile, samples))
+
+    print(f"\n{'perfil':<12}{'modelo':<10}{'beam':>5}{'RTF':>8}{'WER':>8}{'carga':>8}")
+    for result in results:
+        print(f"{result['profile']:<12}{result['model']:<10}{result['beam_size']:>5}{result['rtf']:>8.3f}"
+              f"{result['wer'] * 100:>7.1f}%{result['load_seconds']:>7.1f}s")
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[STTBenchmark] Resultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,208 @@
 # src/vad_recorder.py
-import collections
 import sys
-import wave
+import time
 import webrtcvad
-import sounddevice as sd
 import numpy as np
-import tempfile
+from pathlib import Path
+from .audio_buffer import save_wav
+from .audio_capture import AudioCapture, get_audio_capture
+from .endpointer import Endpointer, END
+from .noise_suppressor import NoiseSuppressor
 
 SAMPLE_RATE = 16000
 CHANNELS = 1
 FRAME_DURATION = 30  # ms
 FRAME_SIZE = int(SAMPLE_RATE * FRAME_DURATION / 1000)
+PRE_ROLL_MS = 300
+TAIL = int(SAMPLE_RATE * 0.15)   # silencio que se deja tras la última voz
+MAX_BLOCK_FRAMES = 32
+# Umbrales para descartar un turno como ruido (solo con supresión de ruido)
+NOISE_GATE = {"min_snr_db": 8.0, "min_voiced_density": 0.35, "min_speech_band": 0.5}
 
 
 class VADRecorder:
-    def __init__(self, aggressiveness=2):
+    """
+    Graba una frase cortando por silencio. Lee de la captura continua del
+    micrófono (AudioCapture), así que el audio anterior a la llamada sigue
+    disponible: cada frase incluye pre_roll_ms de audio antes del primer
+    frame con voz y no se pierden las primeras sílabas. El final de la
+    frase lo decide un Endpointer adaptativo. Con noise_suppression el VAD
+    ve el audio tras una puerta espectral y los turnos que no parecen voz
+    se descartan antes de llegar a Whisper.
+    Devuelve un array float32 a 16 kHz listo para SpeechToText.transcribe.
+    """
+
+    def __init__(self, aggressiveness=2, debug_wav_dir=None, pre_roll_ms=PRE_ROLL_MS,
+                 capture: AudioCapture = None, endpointer: Endpointer = None,
+                 noise_suppression: bool = False, device=None):
         self.vad = webrtcvad.Vad(aggressiveness)
+        self.endpointer = endpointer or Endpointer(frame_ms=FRAME_DURATION)
+        self.suppressor = NoiseSuppressor(FRAME_SIZE, SAMPLE_RATE) if noise_suppression else None
+        self.last_turn = None
+        self.pre_roll = int(SAMPLE_RATE * pre_roll_ms / 1000)
+        self.capture = capture
+        self.device = device            # índice o nombre del micrófono (None: el predeterminado)
+        self._last_end = 0      # no se vuelve a analizar audio de la frase anterior
+        # Opcional: copia WAV de cada grabación para depurar
+        self.debug_wav_dir = Path(debug_wav_dir) if debug_wav_dir else None
+        self.stats = {"turns": 0, "clipped_onsets": 0, "start_latency_total": 0.0,
+                      "start_latency_max": 0.0, "reader_overruns": 0,
+                      "stt_latency_total": 0.0, "stt_latency_turns": 0, "suppressed_turns": 0}
 
     def _frame_generator(self, audio):
         for i in range(0, len(audio), FRAME_SIZE):
             yield audio[i:i + FRAME_SIZE]
 
-    def record(self, timeout=10):
+    def record(self, timeout=10, on_audio=None) -> np.ndarray:
+        """
+        Audio float32 a 16 kHz de la frase (vacío si no hubo voz).
+        timeout es lo que se espera a que empiece a hablar; la duración de
+        la frase la limita el endpointer (max_seconds).
+        on_audio(samples) recibe el audio de la frase según llega, desde el
+        pre-roll del inicio (para transcribir en streaming).
+        """
         print("🎤 Habla (Margarita detectará silencio para cortar)...")
+        requested = time.monotonic()
+        if self.capture is None:
+            self.capture = get_audio_capture(self.device)
+        self.capture.start()
+        buffer = self.capture.buffer
 
-        recording = []
-        with sd.InputStream(
-            channels=CHANNELS,
-            samplerate=SAMPLE_RATE,
-            dtype="int16",
-            blocksize=FRAME_SIZE
-        ) as stream:
-            silence_frames = 0
-            while True:
-                frame, _ = stream.read(FRAME_SIZE)
-                frame = frame.flatten()
-                recording.extend(frame)
-
-                is_speech = self.vad.is_speech(frame.tobytes(), SAMPLE_RATE)
-                if not is_speech:
-                    silence_frames += 1
-                else:
-                    silence_frames = 0
-
-                if silence_frames > int(0.8 * SAMPLE_RATE / FRAME_SIZE):  # ~0.8s de silencio
-                    break
+        now = buffer.written
+        # Se empieza a analizar un poco antes de la llamada por si ya se estaba hablando
+        start = max(now - self.pre_roll, self._last_end, self.capture.oldest_position())
+        position = start
+        onset_deadline = now + int(SAMPLE_RATE * timeout)
+        first_frame_at = None
+        fed = None
+        self.endpointer.reset()
 
-                if len(recording) > SAMPLE_RATE * timeout:  # seguridad
+        done = False
+        while not done:
+            if not self.capture.wait_for(position + FRAME_SIZE):
+                print("⚠️ El micrófono no está entregando audio")
+                break
+            if first_frame_at is None:
+                first_frame_at = time.monotonic()
+            if position < self.capture.oldest_position():
+                # El lector se quedó atrás más que todo el historial: el turno empieza de nuevo
+                self.stats["reader_overruns"] += 1
+                start = position = self.capture.oldest_position()
+                self.endpointer.reset()
+            # Los frames completos ya disponibles se procesan como un bloque
+            count = min((buffer.written - position) // FRAME_SIZE, MAX_BLOCK_FRAMES)
+            block = buffer.read(position, position + count * FRAME_SIZE).reshape(count, FRAME_SIZE)
+            if self.suppressor:
+                block = self.suppressor.process(block)
+            pcm = (block * 32767).astype(np.int16)
+            for frame, frame_pcm in zip(block, pcm):
+                state = self.endpointer.update(frame, self.vad.is_speech(frame_pcm.tobytes(), SAMPLE_RATE))
+                position += FRAME_SIZE
+                if state == END or (self.endpointer.onset is None and position >= onset_deadline):
+                    done = True
                     break
+            if on_audio is not None and self.endpointer.onset is not None:
+                if fed is None:
+                    fed = max(start + self.endpointer.onset * FRAME_SIZE - self.pre_roll,
+                              self.capture.oldest_position())
+                if position > fed:
+                    on_audio(buffer.read(fed, position).copy())
+                    fed = position
+
+        self._last_end = position
+        if not self.endpointer.has_speech:
+            return np.zeros(0, dtype=np.float32)
+
+        onset = start + self.endpointer.onset * FRAME_SIZE
+        speech_end = start + (self.endpointer.last_speech + 1) * FRAME_SIZE
+        if self.suppressor:
+            reason = self._noise_reason(buffer.read(onset, speech_end))
+            if reason:
+                self.stats["suppressed_turns"] += 1
+                print(f"[VADRecorder] Turno descartado como ruido ({reason}); "
+                      f"{self.stats['suppressed_turns']} descartados en total")
+                return np.zeros(0, dtype=np.float32)
+        # Copia: el callback sigue escribiendo en el buffer
+        audio_start = max(onset - self.pre_roll, self.capture.oldest_position())
+        audio_end = min(position, speech_end + TAIL)
+        audio = buffer.read(audio_start, audio_end).copy()
+        # Inicio recortado: ya había voz en el primer frame analizado o no queda pre-roll completo
+        clipped = onset == start or onset - audio_start < self.pre_roll
+        self._record_turn((first_frame_at or requested) - requested, clipped)
+        self.last_turn = {
+            "speech_end": self.capture.position_time(speech_end),
+            "hangover": self.endpointer.hangover,
+            "reason": self.endpointer.reason or "timeout",
+            "duration": len(audio) / SAMPLE_RATE,
+        }
+        if self.debug_wav_dir:
+            self._save_debug(audio)
+        return audio
+
+    def _noise_reason(self, speech: np.ndarray) -> str:
+        """Motivo para descartar el turno como ruido (None si parece voz)"""
+        if self.endpointer.mean_snr < NOISE_GATE["min_snr_db"]:
+            return f"demasiado débil: {self.endpointer.mean_snr:.0f} dB sobre el fondo"
+        if self.endpointer.voiced_density < NOISE_GATE["min_voiced_density"]:
+            return f"golpes sueltos: {self.endpointer.voiced_density:.0%} de frames con voz"
+        frames = speech[:len(speech) // FRAME_SIZE * FRAME_SIZE].reshape(-1, FRAME_SIZE)
+        ratio = self.suppressor.speech_band_ratio(frames)
+        if ratio < NOISE_GATE["min_speech_band"]:
+            return f"fuera de la banda de voz: {ratio:.0%}"
+        return None
+
+    def mark_stt_start(self) -> float:
+        """Llamar justo antes de transcribir: registra la latencia fin de voz -> STT"""
+        if not self.last_turn:
+            return 0.0
+        latency = time.monotonic() - self.last_turn["speech_end"]
+        self.stats["stt_latency_total"] += latency
+        self.stats["stt_latency_turns"] += 1
+        average = self.stats["stt_latency_total"] / self.stats["stt_latency_turns"]
+        print(f"[VADRecorder] Fin de voz -> STT: {latency * 1000:.0f} ms "
+              f"(espera {self.last_turn['hangover'] * 1000:.0f} ms, corte por {self.last_turn['reason']}, "
+              f"{self.last_turn['duration']:.1f}s de audio, media {average * 1000:.0f} ms)")
+        self.last_turn = None
+        return latency
+
+    def _record_turn(self, start_latency: float, clipped: bool):
+        self.stats["turns"] += 1
+        self.stats["start_latency_total"] += start_latency
+        self.stats["start_latency_max"] = max(self.stats["start_latency_max"], start_latency)
+        if clipped:
+            self.stats["clipped_onsets"] += 1
+            print(f"[VADRecorder] ⚠️ Inicio de frase posiblemente recortado ({self.describe_stats()})")
+
+    def describe_stats(self) -> str:
+        turns = self.stats["turns"]
+        if not turns:
+            return f"sin turnos grabados, descartados como ruido {self.stats['suppressed_turns']}"
+        average = self.stats["start_latency_total"] / turns * 1000
+        clipped = self.stats["clipped_onsets"]
+        return (f"{turns} turnos, inicio medio {average:.0f} ms "
+                f"(máx {self.stats['start_latency_max'] * 1000:.0f} ms), "
+                f"inicios recortados {clipped} ({clipped / turns:.0%}), "
+                f"descartados como ruido {self.stats['suppressed_turns']}, "
+                f"desbordes {self.capture.overflows if self.capture else 0}")
 
-        # Guardar a WAV temporal
-        wav_path = tempfile.mktemp(suffix=".wav")
-        with wave.open(wav_path, "wb") as wf:
-            wf.setnchannels(CHANNELS)
-            wf.setsampwidth(2)  # int16
-            wf.setframerate(SAMPLE_RATE)
-            wf.writeframes(np.array(recording, dtype=np.int16).tobytes())
+    def close(self):
+        """Cierra el micrófono (la captura se reabre en el siguiente record)"""
+        if self.capture is not None:
+            self.capture.stop()
 
-        return wav_path
+    def _save_debug(self, audio: np.ndarray):
+        try:
+            self.debug_wav_dir.mkdir(parents=True, exist_ok=True)
+            path = self.debug_wav_dir / time.strftime("grabacion_%Y%m%d_%H%M%S.wav")
+            save_wav(path, audio, SAMPLE_RATE)
+            print(f"[VADRecorder] Copia de depuración: {path}")
+        except OSError as e:
+            print(f"[VADRecorder] No se pudo guardar el WAV de depuración: {e}")
 
 
 # --- Ejemplo ---
 if __name__ == "__main__":
-    vad = VADRecorder()
-    wav = vad.record()
-    print("Archivo guardado:", wav)
+    vad = VADRecorder(debug_wav_dir=sys.argv[1] if len(sys.argv) > 1 else None)
+    audio = vad.record()
+    print(f"Grabados {len(audio) / SAMPLE_RATE:.1f}s de audio ({vad.describe_stats()})")
+    vad.close()
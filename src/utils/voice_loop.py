@@ -15,12 +15,12 @@ class VoiceLoop:
     Maneja la grabación, transcripción y respuesta por voz
     """
     
-    def __init__(self, model_size="small", device="cpu"):
+    def __init__(self, model_size=None, device="cpu", profile=None):
         print("🎤 Inicializando VoiceLoop...")
         
         # Inicializar componentes de voz
         self.vad = VADRecorder()
-        self.stt = SpeechToText(model_size=model_size, device=device)
+        self.stt = SpeechToText(model_size=model_size, device=device, profile=profile)
         self.tts = TextToSpeech()
         
         # Inicializar procesamiento de texto
@@ -33,14 +33,14 @@ class VoiceLoop:
         
         print("✅ VoiceLoop inicializado correctamente")
     
-    def process_audio_input(self, audio_file: str) -> str:
+    def process_audio_input(self, audio) -> str:
         """
-        Procesa un archivo de audio: transcribe y genera respuesta
+        Procesa audio (array float32 o ruta a un archivo): transcribe y genera respuesta
         """
         try:
             # Transcribir audio a texto
             print("👂 Transcribiendo audio...")
-            text = self.stt.transcribe(audio_file, lang="es")
+            text = self.stt.transcribe(audio, lang="es")
             
             if not text or text.strip() == "":
                 return "No escuché nada. ¿Podrías repetirlo?"
@@ -101,14 +101,15 @@ class VoiceLoop:
             try:
                 # Grabación con VAD
                 print("\n🎤 Escuchando... (habla ahora)")
-                audio_file = self.vad.record()
+                audio = self.vad.record()
                 
-                if not audio_file:
+                if audio is None or len(audio) == 0:
                     print("⚠️ No se grabó audio, reintentando...")
                     continue
                 
                 # Procesar audio
-                response_audio = self.process_audio_input(audio_file)
+                self.vad.mark_stt_start()
+                response_audio = self.process_audio_input(audio)
                 
                 # Reproducir respuesta si existe
                 if response_audio and os.path.exists(response_audio):
@@ -137,6 +138,7 @@ class VoiceLoop:
         Detiene el bucle de voz
         """
         self.is_running = False
+        self.vad.close()
         print("\n🛑 Bucle de voz detenido")
     
     def start_async(self):
@@ -0,0 +1,238 @@
+# [file name]: src/utils/wake_word.py
+import re
+import time
+import numpy as np
+from pathlib import Path
+from src.system.storage_paths import get_data_dir
+from .audio_buffer import save_wav
+from .audio_sources import read_wav
+from .resampler import downmix, resample
+
+SAMPLE_RATE = 16000
+WIN = int(SAMPLE_RATE * 0.025)      # ventanas de 25 ms
+HOP = int(SAMPLE_RATE * 0.010)      # cada 10 ms
+N_FFT = 512
+N_MELS = 26
+N_MFCC = 13
+
+
+def _mel_filterbank(n_mels: int = N_MELS, n_fft: int = N_FFT, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    def to_mel(f):
+        return 2595.0 * np.log10(1.0 + f / 700.0)
+
+    def to_hz(m):
+        return 700.0 * (10 ** (m / 2595.0) - 1.0)
+
+    points = to_hz(np.linspace(to_mel(60.0), to_mel(sample_rate / 2), n_mels + 2))
+    bins = np.floor((n_fft + 1) * points / sample_rate).astype(int)
+    bank = np.zeros((n_mels, n_fft // 2 + 1))
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            bank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return bank
+
+
+_MEL_BANK = _mel_filterbank()
+# DCT-II como matriz: se aplica con un solo producto
+_DCT = np.cos(np.pi / N_MELS * (np.arange(N_MELS) + 0.5)[None, :] * np.arange(N_MFCC)[:, None])
+_WINDOW = np.hamming(WIN)
+
+
+def mfcc(audio: np.ndarray) -> np.ndarray:
+    """MFCC (frames, N_MFCC - 1) sin c0 (el volumen no cuenta)"""
+    audio = np.append(audio[:1], audio[1:] - 0.97 * audio[:-1])    # pre-énfasis
+    if len(audio) < WIN:
+        return np.zeros((0, N_MFCC - 1))
+    count = 1 + (len(audio) - WIN) // HOP
+    index = np.arange(WIN)[None, :] + HOP * np.arange(count)[:, None]
+    frames = audio[index] * _WINDOW
+    power = np.abs(np.fft.rfft(frames, N_FFT, axis=1)) ** 2 / N_FFT
+    energies = np.log(np.maximum(power @ _MEL_BANK.T, 1e-10))
+    # Sin normalizar por la media: lo que sigue a la palabra la desplazaría
+    return (energies @ _DCT.T)[:, 1:]
+
+
+def dtw_prefix(template: np.ndarray, features: np.ndarray):
+    """
+    DTW de la plantilla contra el comienzo de features (final abierto).
+    Devuelve (distancia media por paso, frame de features donde acaba la palabra).
+    """
+    n, m = len(template), len(features)
+    if n == 0 or m == 0:
+        return float("inf"), 0
+    # Distancias euclídeas de todos contra todos de una vez
+    cost = np.sqrt(((template[:, None, :] - features[None, :, :]) ** 2).sum(axis=2))
+    steps = np.zeros((n, m))
+    acc = np.full((n, m), np.inf)
+    acc[0] = np.cumsum(cost[0])
+    steps[0] = np.arange(1, m + 1)
+    for i in range(1, n):
+        # Diagonal y vertical en bloque; la horizontal es secuencial
+        diag = np.concatenate(([np.inf], acc[i - 1, :-1]))
+        diag_steps = np.concatenate(([0], steps[i - 1, :-1]))
+        use_diag = diag <= acc[i - 1]
+        best = np.where(use_diag, diag, acc[i - 1])
+        best_steps = np.where(use_diag, diag_steps, steps[i - 1])
+        row, row_steps = acc[i], steps[i]
+        for j in range(m):
+            if j and row[j - 1] < best[j]:
+                row[j], row_steps[j] = row[j - 1] + cost[i, j], row_steps[j - 1] + 1
+            else:
+                row[j], row_steps[j] = best[j] + cost[i, j], best_steps[j] + 1
+    # La palabra puede acabar en cualquier punto razonable del comienzo
+    lo, hi = n // 2, min(m, n * 2)
+    if lo >= hi:
+        return float("inf"), 0
+    normalized = acc[n - 1, lo:hi] / steps[n - 1, lo:hi]
+    end = int(np.argmin(normalized))
+    return float(normalized[end]), lo + end + 1
+
+
+def voiced_span(audio: np.ndarray, range_db: float = 25.0):
+    """(inicio, fin) en muestras de la parte con sonido: fuera pre-roll y cola de silencio"""
+    count = len(audio) // HOP
+    if count == 0:
+        return 0, len(audio)
+    energy = 10 * np.log10(np.maximum((audio[:count * HOP].reshape(count, HOP) ** 2).mean(axis=1), 1e-12))
+    loud = np.flatnonzero(energy > energy.max() - range_db)
+    return int(loud[0]) * HOP, int(loud[-1] + 1) * HOP
+
+
+def strip_wake_word(text: str) -> str:
+    """Quita "Margarita" del comienzo de una transcripción"""
+    return re.sub(r"^\s*margarita[\s,.:;!?¡¿]*", "", text, flags=re.IGNORECASE)
+
+
+def load_wav(path) -> np.ndarray:
+    """WAV como float32 mono a 16 kHz (mezcla canales y remuestrea si hace falta)"""
+    audio, rate = read_wav(path)
+    return resample(downmix(audio), rate, SAMPLE_RATE)
+
+
+class WakeWordDetector:
+    """
+    Palabra de activación ("Margarita") por plantillas: MFCC + DTW en NumPy,
+    sin modelos. Solo mira el comienzo de cada frase que entrega el VAD,
+    así Whisper no se ejecuta con la tele o una conversación de fondo.
+    Una frase que empieza por la palabra pasa recortada; si la palabra va
+    sola, la siguiente frase dentro de follow_seconds pasa entera.
+    Las plantillas son WAVs en templates_dir (se graban con enroll).
+    """
+
+    def __init__(self, templates_dir=None, follow_seconds: float = 8.0, threshold: float = None):
+        self.templates_dir = Path(templates_dir) if templates_dir else get_data_dir() / "wake_word"
+        self.follow_seconds = follow_seconds
+        self.fixed_threshold = threshold
+        self.threshold = threshold
+        self.templates = []
+        self.armed_until = 0.0
+        self.stats = {"checked": 0, "accepted": 0, "rejected": 0, "follow_ups": 0, "check_time": 0.0}
+        self.load_templates()
+
+    def load_templates(self):
+        self.templates = []
+        for path in sorted(self.templates_dir.glob("*.wav")):
+            try:
+                audio = load_wav(path)
+                start, end = voiced_span(audio)
+                features = mfcc(audio[start:end])
+            except (OSError, ValueError, EOFError) as e:
+                print(f"[WakeWord] Plantilla ignorada: {e}")
+                continue
+            if len(features):
+                self.templates.append(features)
+        self._calibrate()
+        print(f"[WakeWord] {len(self.templates)} plantillas cargadas de {self.templates_dir}")
+
+    def _calibrate(self):
+        """Umbral a partir de lo que se parecen las plantillas entre sí"""
+        if self.fixed_threshold is not None:
+            return
+        distances = [dtw_prefix(a, b)[0] for i, a in enumerate(self.templates)
+                     for j, b in enumerate(self.templates) if i != j]
+        distances = [d for d in distances if np.isfinite(d)]
+        self.threshold = max(distances) * 1.3 if distances else 25.0
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.templates)
+
+    def enroll(self, audio: np.ndarray) -> Path:
+        """Guarda una grabación de la palabra sola como plantilla nueva"""
+        self.templates_dir.mkdir(parents=True, exist_ok=True)
+        number = len(list(self.templates_dir.glob("*.wav"))) + 1
+        path = self.templates_dir / time.strftime(f"margarita_%Y%m%d_%H%M%S_{number}.wav")
+        save_wav(path, audio, SAMPLE_RATE)
+        start, end = voiced_span(audio)
+        self.templates.append(mfcc(audio[start:end]))
+        self._calibrate()
+        return path
+
+    def match(self, audio: np.ndarray):
+        """(distancia, muestra donde acaba la palabra) de la mejor plantilla"""
+        longest = max(len(t) for t in self.templates)
+        # Desde que empieza a sonar, y solo lo que podría durar la palabra dicha despacio
+        offset = voiced_span(audio[:SAMPLE_RATE])[0]
+        features = mfcc(audio[offset:offset + longest * 2 * HOP + WIN])
+        best = (float("inf"), 0)
+        for template in self.templates:
+            distance, end = dtw_prefix(template, features)
+            if distance < best[0]:
+                best = (distance, end)
+        return best[0], offset + best[1] * HOP
+
+    @property
+    def armed(self) -> bool:
+        """Se dijo la palabra sola hace poco: la siguiente frase pasa sin comprobarla"""
+        return time.monotonic() < self.armed_until
+
+    def check_prefix(self, audio: np.ndarray):
+        """
+        Comprobación sobre el principio de una frase que aún no ha terminado:
+        None si todavía no hay audio suficiente para decidir, y si no, si empieza
+        por la palabra. No toca estadísticas ni estado; gate() decide al final.
+        """
+        longest = max(len(t) for t in self.templates)
+        offset = voiced_span(audio[:SAMPLE_RATE])[0]
+        if len(audio) < offset + longest * 2 * HOP + WIN:
+            return None
+        distance, _ = self.match(audio)
+        return distance <= self.threshold
+
+    def gate(self, audio: np.ndarray):
+        """
+        None si la frase no va dirigida a Margarita; si sí, el audio que debe
+        transcribirse (vacío si solo se dijo la palabra y ahora se espera la orden).
+        """
+        if not self.ready or audio is None or len(audio) == 0:
+            return audio
+        if time.monotonic() < self.armed_until:
+            self.armed_until = 0.0
+            self.stats["follow_ups"] += 1
+            return audio
+
+        started = time.perf_counter()
+        distance, end = self.match(audio)
+        self.stats["check_time"] += time.perf_counter() - started
+        self.stats["checked"] += 1
+        if distance > self.threshold:
+            self.stats["rejected"] += 1
+            print(f"[WakeWord] Ignorado (distancia {distance:.1f} > {self.threshold:.1f})")
+            return None
+
+        self.stats["accepted"] += 1
+        rest = audio[end:]
+        if len(rest) < SAMPLE_RATE * 0.4:
+            self.armed_until = time.monotonic() + self.follow_seconds
+            return rest[:0]
+        return rest
+
+    def describe_stats(self) -> str:
+        checked = self.stats["checked"]
+        average = self.stats["check_time"] / checked * 1000 if checked else 0.0
+        return (f"{checked} frases comprobadas, {self.stats['accepted']} aceptadas, "
+                f"{self.stats['rejected']} ignoradas, {self.stats['follow_ups']} tras la palabra sola, "
+                f"{average:.1f} ms por comprobación")
@@ -4,8 +4,9 @@ import re
 import json
 import subprocess
 import platform
-import shutil
 from pathlib import Path
+from src.system.path_index import get_path_index
+from src.system.dir_walker import DirectoryWalker
 
 class SystemCommandExecutor:
     """
@@ -24,6 +25,8 @@ class SystemCommandExecutor:
         self.config_file.parent.mkdir(exist_ok=True)
         
         self.applications = self._load_application_mappings()
+        self.path_index = get_path_index()
+        self.walker = DirectoryWalker()
         print(f"[SystemCommandExecutor] Sistema detectado: {self.system}")
         print(f"[SystemCommandExecutor] Configuración cargada desde: {self.config_file}")
         print(f"[SystemCommandExecutor] Aplicaciones cargadas: {list(self.applications.keys())}")
@@ -109,16 +112,14 @@ class SystemCommandExecutor:
             if re.search(rf"\b{re.escape(key)}\b", app_name_lower):
                 return command, key
         
-        # Estrategia 2: Buscar directamente en el PATH
-        if shutil.which(app_name):
+        # Estrategia 2: Buscar directamente en el índice del PATH
+        # (en Windows el índice ya prueba las extensiones de PATHEXT)
+        full_path = self.path_index.which(app_name)
+        if full_path:
+            if self.system == "Windows":
+                return os.path.basename(full_path), app_name
             return app_name, app_name
         
-        # Estrategia 3: Para Windows, probar con extensiones comunes
-        if self.system == "Windows":
-            for ext in ['.exe', '.com', '.bat', '.cmd']:
-                if shutil.which(app_name + ext):
-                    return app_name + ext, app_name
-        
         return None, app_name
 
     def open_application(self, app_name: str) -> str:
@@ -140,7 +141,7 @@ class SystemCommandExecutor:
             else:  # Linux
                 # Verificar si el comando existe en el PATH
                 executable = command.split()[0] if ' ' in command else command
-                if shutil.which(executable) is None:
+                if not self.path_index.exists(executable):
                     return f"No encontré el ejecutable '{executable}' para '{found_name}'"
                 
                 # Ejecutar en segundo plano
@@ -231,13 +232,16 @@ class SystemCommandExecutor:
         # Si no hay auto_create, retornar información para que el llamador decida
         return result
 
-    def search_folder(self, folder_name: str, search_path: str = None) -> dict:
+    def search_folder(self, folder_name: str, search_path: str = None,
+                      max_results: int = 50, time_budget: float = 5.0) -> dict:
         """
         Busca una carpeta en el sistema.
         
         Args:
             folder_name: Nombre de la carpeta a buscar
             search_path: Ruta donde buscar (por defecto base_path)
+            max_results: Número de coincidencias tras el que se detiene la búsqueda
+            time_budget: Segundos máximos de búsqueda
             
         Returns:
             dict: Resultados de la búsqueda
@@ -253,14 +257,15 @@ class SystemCommandExecutor:
         }
         
         try:
-            # Buscar recursivamente
-            for path in search_dir.rglob("*"):
-                if path.is_dir() and folder_name in path.name.lower():
-                    results["matches"].append({
-                        "path": str(path),
-                        "name": path.name,
-                        "parent": str(path.parent)
-                    })
+            # Buscar recursivamente en paralelo, omitiendo carpetas ignoradas
+            for match in self.walker.walk(search_dir, lambda entry: folder_name in entry.name.lower(),
+                                          max_results=max_results, time_budget=time_budget):
+                results["matches"].append({
+                    "path": match["path"],
+                    "name": match["name"],
+                    "parent": match["parent"]
+                })
+            results["stats"] = dict(self.walker.last_stats)
             
             if results["matches"]:
                 results["found"] = True
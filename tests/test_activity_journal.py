@@ -0,0 +1,44 @@
+# [file name]: tests/test_activity_journal.py
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.system.activity_journal import ActivityJournal, CREATED, MODIFIED
+from src.system.ignore_rules import IgnoreRules
+
+
+def make_journal(tmp_path, capacity=3):
+    return ActivityJournal(tmp_path, folders=[], capacity=capacity, journal_file=tmp_path / "test.journal",
+                           rules=IgnoreRules())
+
+
+def test_ring_evicts_oldest(tmp_path):
+    journal = make_journal(tmp_path)
+    for i, name in enumerate(["a.pdf", "b.txt", "c.pdf", "d.txt"]):
+        journal.record(str(tmp_path / name), CREATED, timestamp=1000.0 + i * 10)
+
+    assert len(journal) == 3
+    assert [r["path"] for r in journal.query()] == [str(tmp_path / n) for n in ("d.txt", "c.pdf", "b.txt")]
+    # El índice por extensión también olvida lo desalojado
+    assert [r["path"] for r in journal.query(extensions={".pdf"})] == [str(tmp_path / "c.pdf")]
+
+
+def test_reopen_recovers_last_capacity_records(tmp_path):
+    journal = make_journal(tmp_path)
+    for i in range(5):
+        journal.record(str(tmp_path / f"{i}.md"), MODIFIED, timestamp=1000.0 + i * 10)
+
+    reopened = make_journal(tmp_path)
+    assert [r["path"] for r in reopened.query()] == [str(tmp_path / f"{i}.md") for i in (4, 3, 2)]
+
+
+def test_repeated_writes_are_coalesced(tmp_path):
+    journal = make_journal(tmp_path, capacity=10)
+    path = str(tmp_path / "notas.txt")
+    journal.record(path, CREATED, timestamp=1000.0)
+    journal.record(path, MODIFIED, timestamp=1000.5)
+    journal.record(path, MODIFIED, timestamp=1010.0)
+
+    assert len(journal) == 2
+    assert journal.latest()["kind"] == MODIFIED
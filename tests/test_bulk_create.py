@@ -0,0 +1,43 @@
+# [file name]: tests/test_bulk_create.py
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.system.system_files_intelligent import IntelligentFileManager
+
+
+def test_failed_bulk_create_rolls_back(tmp_path):
+    manager = IntelligentFileManager(tmp_path)
+    # El segundo archivo falla al escribirse: ya hay carpetas y un archivo creados
+    result = manager.bulk_create(str(tmp_path), folders=["app/src", "app/tests"],
+                                 files={"app/README.md": "# App\n", "app/src/main.py": None})
+
+    assert not result["success"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_bulk_create_keeps_existing(tmp_path):
+    (tmp_path / "app").mkdir()
+    manager = IntelligentFileManager(tmp_path)
+    result = manager.bulk_create(str(tmp_path), folders=["app", "app/docs"], files={"app/docs/index.md": "hola"})
+
+    assert result["success"]
+    assert result["created_folders"] == [str(tmp_path / "app" / "docs")]
+    assert (tmp_path / "app" / "docs" / "index.md").read_text(encoding="utf-8") == "hola"
+
+
+def test_scaffold_only_substitutes_name(tmp_path, monkeypatch):
+    manager = IntelligentFileManager(tmp_path)
+    monkeypatch.setattr(manager, "load_scaffolds", lambda: {"web": {
+        "folders": ["{name}_static", "templates/{% block %}"],
+        "files": {"src/{name}.py": "APP = '{name}'\n", "{{cookiecutter.slug}}.txt": "${HOME}\n"},
+    }})
+    result = manager.create_scaffold("web", "tienda", str(tmp_path))
+
+    assert result["success"], result["message"]
+    project = tmp_path / "tienda"
+    assert (project / "tienda_static").is_dir()
+    assert (project / "templates" / "{% block %}").is_dir()
+    assert (project / "src" / "tienda.py").read_text(encoding="utf-8") == "APP = 'tienda'\n"
+    assert (project / "{{cookiecutter.slug}}.txt").read_text(encoding="utf-8") == "${HOME}\n"
@@ -0,0 +1,31 @@
+# [file name]: tests/test_disk_usage.py
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.system.disk_usage import DiskUsageAnalyzer
+
+
+def test_cache_round_trip_through_disk(tmp_path, monkeypatch):
+    """Una carpeta modificada tras reiniciar mezcla entradas de la caché en disco y recién escaneadas"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    root = tmp_path / "datos"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.bin").write_bytes(b"x" * 100)
+    (root / "sub" / "b.bin").write_bytes(b"x" * 300)
+
+    first = DiskUsageAnalyzer().analyze(root)
+    assert first["total"] == 400
+
+    # Cambia el mtime de la raíz; "sub" se reutiliza desde la caché en disco
+    time.sleep(0.01)
+    (root / "c.bin").write_bytes(b"x" * 200)
+    os.utime(root, None)
+
+    second = DiskUsageAnalyzer().analyze(root)
+    assert second["total"] == 600
+    assert second["dirs_reused"] == 1
+    assert [size for size, _ in second["largest_files"]] == [300, 200, 100]
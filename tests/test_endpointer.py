@@ -0,0 +1,71 @@
+# [file name]: tests/test_endpointer.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+endpointer = pytest.importorskip("src.utils.endpointer")
+
+FRAME = 480     # 30 ms a 16 kHz
+NOISE = np.full(FRAME, 0.001, dtype=np.float32)     # -60 dBFS
+VOICE = np.full(FRAME, 0.1, dtype=np.float32)       # -20 dBFS
+
+
+def feed(ep, frame, vad_speech, count):
+    return [ep.update(frame, vad_speech) for _ in range(count)]
+
+
+def silence_until_end(ep, limit=200):
+    """Frames de silencio hasta que se da la frase por terminada"""
+    for count in range(1, limit + 1):
+        if ep.update(NOISE, False) == endpointer.END:
+            return count
+    raise AssertionError("la frase no terminó")
+
+
+def test_short_command_uses_min_hangover():
+    ep = endpointer.Endpointer()
+    feed(ep, NOISE, False, 10)
+    feed(ep, VOICE, True, 15)                       # 0.45 s: "abre terminal"
+    assert ep.hangover == pytest.approx(ep.min_hangover)
+    assert silence_until_end(ep) == 10              # 300 ms
+    assert ep.reason == "silence"
+
+
+def test_long_speech_waits_longer():
+    ep = endpointer.Endpointer()
+    feed(ep, NOISE, False, 10)
+    feed(ep, VOICE, True, 100)                      # 3 s hablando
+    assert ep.hangover == pytest.approx(ep.max_hangover)
+    assert silence_until_end(ep) == 40              # 1.2 s
+
+
+def test_pauses_inside_the_phrase_are_respected():
+    ep = endpointer.Endpointer()
+    feed(ep, NOISE, False, 10)
+    feed(ep, VOICE, True, 10)
+    feed(ep, NOISE, False, 9)                       # pausa de 270 ms, por debajo del corte
+    feed(ep, VOICE, True, 10)
+    assert ep.longest_pause == 9
+    assert ep.hangover >= 9 * ep.frame_seconds * 1.25
+
+
+def test_loud_background_is_not_speech():
+    """Con el VAD activado por un ruido al nivel del fondo no empieza la frase"""
+    ep = endpointer.Endpointer()
+    feed(ep, VOICE, False, 50)                      # el fondo sube hasta -20 dBFS
+    assert feed(ep, VOICE, True, 5) == [endpointer.SILENCE] * 5
+    assert not ep.has_speech
+
+
+def test_reset_keeps_noise_floor():
+    ep = endpointer.Endpointer()
+    feed(ep, NOISE, False, 10)
+    floor = ep.noise_floor
+    feed(ep, VOICE, True, 5)
+    ep.reset()
+    assert ep.onset is None and ep.speech_frames == 0
+    assert ep.noise_floor == floor
@@ -0,0 +1,62 @@
+# [file name]: tests/test_path_resolver.py
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.system.ignore_rules import IgnoreRules
+from src.system.path_resolver import SpokenPathResolver
+
+
+def make_resolver(tmp_path):
+    for folder in ("Documentos/Proyectos/Margarita", "Música", "Descargas"):
+        (tmp_path / folder).mkdir(parents=True)
+    return SpokenPathResolver(tmp_path, rules=IgnoreRules())
+
+
+def test_dictated_words_match_existing_folders(tmp_path):
+    resolver = make_resolver(tmp_path)
+    resolution = resolver.resolve("documentos proyectos margarita")
+    assert resolution["exact"]
+    assert resolution["path"] == str(tmp_path / "Documentos" / "Proyectos" / "Margarita")
+
+
+def test_accents_and_case_are_ignored(tmp_path):
+    resolver = make_resolver(tmp_path)
+    assert resolver.resolve("musica")["existing"] == str(tmp_path / "Música")
+
+
+def test_one_level_can_be_skipped(tmp_path):
+    resolver = make_resolver(tmp_path)
+    resolution = resolver.resolve("proyectos")
+    assert resolution["exact"]
+    assert resolution["path"] == str(tmp_path / "Documentos" / "Proyectos")
+
+
+def test_missing_tail_is_not_exact(tmp_path):
+    """'Música/Notas' sin Notas: quien busca no debe caer en Música"""
+    resolver = make_resolver(tmp_path)
+    resolution = resolver.resolve("Música/Notas")
+    assert resolution["existing"] == str(tmp_path / "Música")
+    assert resolution["missing"] == ["Notas"]
+    assert not resolution["exact"]
+    assert resolution["path"] == str(tmp_path / "Música" / "Notas")
+
+
+def test_low_confidence_match_is_rejected(tmp_path):
+    """Una palabra de cuatro saltando un nivel no basta para redirigir a Documentos/Proyectos"""
+    resolver = make_resolver(tmp_path)
+    assert resolver.resolve("proyectos viejos universidad verano") is None
+
+
+def test_literal_prefix_is_kept_below_min_score(tmp_path):
+    resolver = make_resolver(tmp_path)
+    resolution = resolver.resolve("documentos facturas viejas trabajo")
+    assert resolution["score"] < SpokenPathResolver.MIN_SCORE
+    assert resolution["existing"] == str(tmp_path / "Documentos")
+    assert not resolution["exact"]
+
+
+def test_nothing_similar_returns_none(tmp_path):
+    resolver = make_resolver(tmp_path)
+    assert resolver.resolve("vacaciones") is None
@@ -0,0 +1,58 @@
+# [file name]: tests/test_resampler.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# src.utils importa Whisper, TTS y demás al cargarse el paquete
+resampler = pytest.importorskip("src.utils.resampler")
+
+
+@pytest.mark.parametrize("in_rate", [48000, 44100, 8000])
+def test_streaming_matches_one_shot(in_rate):
+    """Bloques de cualquier tamaño dan exactamente lo mismo que el array entero"""
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal(in_rate // 2).astype(np.float32)
+
+    whole = resampler.PolyphaseResampler(in_rate, 16000).process(audio)
+
+    streaming = resampler.PolyphaseResampler(in_rate, 16000)
+    blocks, position = [], 0
+    for size in rng.integers(1, 2000, size=1000):
+        if position >= len(audio):
+            break
+        blocks.append(streaming.process(audio[position:position + size]))
+        position += size
+    streamed = np.concatenate(blocks)
+
+    assert len(streamed) == len(whole)
+    np.testing.assert_allclose(streamed, whole, atol=1e-5)
+
+
+def test_resample_keeps_tone_and_length():
+    seconds, tone = 1.0, 440.0
+    t = np.arange(int(44100 * seconds)) / 44100
+    audio = np.sin(2 * np.pi * tone * t).astype(np.float32)
+
+    result = resampler.resample(audio, 44100, 16000)
+
+    assert len(result) == 16000
+    expected = np.sin(2 * np.pi * tone * np.arange(16000) / 16000)
+    # Sin los bordes, donde el filtro ve el silencio supuesto antes y después
+    np.testing.assert_allclose(result[200:-200], expected[200:-200], atol=0.02)
+
+
+def test_reset_forgets_history():
+    converter = resampler.PolyphaseResampler(48000, 16000)
+    first = converter.process(np.ones(4800, dtype=np.float32))
+    converter.reset()
+    again = converter.process(np.ones(4800, dtype=np.float32))
+    np.testing.assert_array_equal(first, again)
+
+
+def test_downmix_averages_channels():
+    stereo = np.array([[1.0, 0.0], [0.5, 0.5]], dtype=np.float32)
+    np.testing.assert_allclose(resampler.downmix(stereo), [0.5, 0.5])
@@ -0,0 +1,40 @@
+# [file name]: tests/test_streaming_stt.py
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+streaming_stt = pytest.importorskip("src.utils.streaming_stt")
+
+
+def make_streamer(committed):
+    streamer = streaming_stt.StreamingTranscriber(stt=None)
+    streamer.committed = list(committed)
+    return streamer
+
+
+def test_nothing_committed_keeps_everything():
+    words = [(0.0, 0.4, "abre"), (0.5, 0.9, "firefox")]
+    assert make_streamer([])._drop_overlap(words) == words
+
+
+def test_words_before_committed_end_are_dropped():
+    streamer = make_streamer([(0.0, 0.4, "abre"), (0.5, 0.9, "la")])
+    words = [(0.0, 0.4, "abre"), (0.5, 0.9, "la"), (1.0, 1.5, "terminal")]
+    assert streamer._drop_overlap(words) == [(1.0, 1.5, "terminal")]
+
+
+def test_repeated_ngram_with_shifted_times_is_dropped():
+    """Whisper repite lo ya confirmado con tiempos algo desplazados"""
+    streamer = make_streamer([(0.0, 0.4, "copia"), (0.5, 1.0, "informe.pdf")])
+    words = [(0.98, 1.3, "Copia"), (1.35, 1.9, "informe pdf"), (2.0, 2.4, "a")]
+    assert streamer._drop_overlap(words) == [(2.0, 2.4, "a")]
+
+
+def test_far_repetition_is_kept():
+    """La misma palabra dicha otra vez mucho después es nueva"""
+    streamer = make_streamer([(0.0, 0.4, "hola")])
+    words = [(3.0, 3.4, "hola")]
+    assert streamer._drop_overlap(words) == words